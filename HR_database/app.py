@@ -1,12 +1,39 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends, Query, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-from typing import List, Optional
-import pandas as pd
+from typing import Dict, List, Optional
 from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import os
 
+from stats import StatsCache, headcount, hiring, parse_percentiles, salary_stats
+from queries import EmployeeQuery, MAX_LIMIT, parse_fields, query_employees
+from storage import CachedEmployeeStore, EmployeeStore, WriteOp, open_store
+from writer import EmployeeWriter
+
 app = FastAPI(title="Galaxium Travels HR API")
 
+# Storage configuration: "sqlite" (default) or the legacy "markdown" backend
+STORAGE_BACKEND = os.getenv("HR_STORAGE_BACKEND", "sqlite")
+MARKDOWN_PATH = os.getenv("HR_MARKDOWN_PATH", "data/employees.md")
+SQLITE_PATH = os.getenv("HR_SQLITE_PATH", "data/employees.db")
+# Maximum number of queued writes persisted together
+WRITE_BATCH_SIZE = int(os.getenv("HR_WRITE_BATCH_SIZE", "100"))
+# Threads for blocking storage work; 0 runs it directly on the event loop
+IO_WORKERS = int(os.getenv("HR_IO_WORKERS", "4"))
+# Compress responses of at least HR_GZIP_MINIMUM_SIZE bytes; HR_GZIP_COMPRESSLEVEL=0 disables compression
+GZIP_MINIMUM_SIZE = int(os.getenv("HR_GZIP_MINIMUM_SIZE", "1000"))
+GZIP_COMPRESSLEVEL = int(os.getenv("HR_GZIP_COMPRESSLEVEL", "6"))
+if GZIP_COMPRESSLEVEL > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESSLEVEL)
+
+_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="hr-io") if IO_WORKERS > 0 else None
+
+_store: Optional[EmployeeStore] = None
+_writer: Optional[EmployeeWriter] = None
+_stats_cache = StatsCache()
+
 class Employee(BaseModel):
     id: str = None
     first_name: str
@@ -16,91 +43,200 @@ class Employee(BaseModel):
     hire_date: str
     salary: str
 
-def read_employees():
+class EmployeeProjection(BaseModel):
+    """An employee restricted to the fields requested with ``fields``."""
+    id: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    department: Optional[str] = None
+    position: Optional[str] = None
+    hire_date: Optional[str] = None
+    salary: Optional[str] = None
+
+class HeadcountGroup(BaseModel):
+    group: str
+    headcount: int
+
+class HeadcountStats(BaseModel):
+    by: str
+    total: int
+    groups: List[HeadcountGroup]
+
+class SalaryGroup(BaseModel):
+    group: str
+    count: int
+    mean: float
+    min: float
+    max: float
+    percentiles: Dict[str, float]
+
+class SalaryStats(BaseModel):
+    by: Optional[str]
+    groups: List[SalaryGroup]
+
+class HiringPeriod(BaseModel):
+    period: str
+    group: Optional[str]
+    hires: int
+
+class HiringStats(BaseModel):
+    freq: str
+    by: Optional[str]
+    periods: List[HiringPeriod]
+
+def get_store() -> EmployeeStore:
+    global _store
+    if _store is None:
+        try:
+            _store = CachedEmployeeStore(open_store(STORAGE_BACKEND, MARKDOWN_PATH, SQLITE_PATH))
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error opening employee database: {str(e)}. Please check that HR_STORAGE_BACKEND is 'sqlite' or 'markdown' and that the data directory exists and is writable."
+            )
+    return _store
+
+def get_writer(store: EmployeeStore = Depends(get_store)) -> EmployeeWriter:
+    global _writer
+    if _writer is None or _writer.store is not store or _writer.executor is not _executor:
+        _writer = EmployeeWriter(store, max_batch=WRITE_BATCH_SIZE, executor=_executor)
+    return _writer
+
+async def run_blocking(fn, *args):
+    """Run blocking storage work on the bounded I/O executor instead of the event loop."""
+    if _executor is None:
+        return fn(*args)
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+def read_error(e: Exception) -> HTTPException:
+    return HTTPException(
+        status_code=500,
+        detail=f"Error reading employee database: {str(e)}. The database file may be corrupted or missing. Please check if the data/employees.md file exists and has the correct format."
+    )
+
+def write_error(e: Exception) -> HTTPException:
+    return HTTPException(
+        status_code=500,
+        detail=f"Error writing to employee database: {str(e)}. The system may not have write permissions to the data directory, or the data/employees.md file may be locked by another process."
+    )
+
+def search_employees(store: EmployeeStore, query: EmployeeQuery):
+    return query_employees(store.frame(), query)
+
+@app.get("/employees", response_model=List[EmployeeProjection], response_model_exclude_unset=True)
+async def get_employees(
+    response: Response,
+    department: Optional[List[str]] = Query(None, description="Only employees in these departments (repeatable)"),
+    position: Optional[List[str]] = Query(None, description="Only employees with these positions (repeatable)"),
+    hired_from: Optional[date] = Query(None, description="Earliest hire date (inclusive, YYYY-MM-DD)"),
+    hired_to: Optional[date] = Query(None, description="Latest hire date (inclusive, YYYY-MM-DD)"),
+    salary_min: Optional[float] = Query(None, description="Minimum salary (inclusive)"),
+    salary_max: Optional[float] = Query(None, description="Maximum salary (inclusive)"),
+    sort: str = Query("id", description="Field to sort by; prefix with '-' for descending order"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,first_name,department"),
+    limit: Optional[int] = Query(None, description=f"Page size (1-{MAX_LIMIT}); omit to return all matches"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    store: EmployeeStore = Depends(get_store),
+):
     try:
-        df = pd.read_csv('data/employees.md', sep='|', skiprows=3)
-        df = df.iloc[:, 1:-1]  # Remove first and last empty columns
-        df.columns = [col.strip() for col in df.columns]
-        print(f"Local: {df}")
-        return df
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Error reading employee database: {str(e)}. The database file may be corrupted or missing. Please check if the data/employees.md file exists and has the correct format."
+        query = EmployeeQuery(
+            department=department, position=position, hired_from=hired_from, hired_to=hired_to,
+            salary_min=salary_min, salary_max=salary_max, sort=sort, fields=parse_fields(fields),
+            limit=limit, cursor=cursor,
         )
+        rows, next_cursor = await run_blocking(search_employees, store, query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid employee query: {str(e)}")
+    except Exception as e:
+        raise read_error(e)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
 
-def write_employees(df):
+def cached_stats(store: EmployeeStore, key, compute):
+    return _stats_cache.get(store.frame(), key, compute)
+
+async def run_stats(store: EmployeeStore, key, compute):
     try:
-        # Create the markdown header
-        header = "# Galaxium Travels HR Database\n\n## Employees\n\n"
-        # Convert DataFrame to markdown table
-        markdown_table = df.to_markdown(index=False)
-        # Write to file
-        with open('data/employees.md', 'w') as f:
-            f.write(header + markdown_table)
+        return await run_blocking(cached_stats, store, key, compute)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid statistics request: {str(e)}")
     except Exception as e:
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Error writing to employee database: {str(e)}. The system may not have write permissions to the data directory, or the data/employees.md file may be locked by another process."
-        )
+        raise read_error(e)
+
+@app.get("/employees/stats/headcount", response_model=HeadcountStats)
+async def get_headcount_stats(
+    by: str = Query("department", description="Group by 'department' or 'position'"),
+    store: EmployeeStore = Depends(get_store),
+):
+    return await run_stats(store, ("headcount", by), lambda df: headcount(df, by))
+
+@app.get("/employees/stats/salary", response_model=SalaryStats)
+async def get_salary_stats(
+    by: Optional[str] = Query(None, description="Group by 'department' or 'position'; omit for company-wide stats"),
+    percentiles: Optional[str] = Query(None, description="Comma-separated percentiles, default 25,50,75,90"),
+    store: EmployeeStore = Depends(get_store),
+):
+    try:
+        points = parse_percentiles(percentiles)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid statistics request: {str(e)}")
+    return await run_stats(store, ("salary", by, tuple(points)), lambda df: salary_stats(df, by, points))
 
-@app.get("/employees", response_model=List[Employee])
-async def get_employees():
-    df = read_employees()
-    print(f"Server before cleaning:\n{df}")
-    df = df.iloc[1:]
-    print(f"Server:\n{df.to_dict('records')}")
-    return df.to_dict('records')
+@app.get("/employees/stats/hiring", response_model=HiringStats)
+async def get_hiring_stats(
+    freq: str = Query("month", description="Bucket size: 'month', 'quarter' or 'year'"),
+    by: Optional[str] = Query(None, description="Also split by 'department' or 'position'"),
+    store: EmployeeStore = Depends(get_store),
+):
+    return await run_stats(store, ("hiring", freq, by), lambda df: hiring(df, freq, by))
 
 @app.get("/employees/{employee_id}", response_model=Employee)
-async def get_employee(employee_id: str):
-    df = read_employees()
-    employee = df[df['id'] == str(employee_id)]
-    if employee.empty:
+async def get_employee(employee_id: str, store: EmployeeStore = Depends(get_store)):
+    try:
+        employee = await run_blocking(store.get_employee, employee_id)
+    except Exception as e:
+        raise read_error(e)
+    if employee is None:
         raise HTTPException(
-            status_code=404, 
+            status_code=404,
             detail=f"Employee with ID {employee_id} not found. The employee may have been deleted or the employee_id may be incorrect. Please verify the employee_id or use the /employees endpoint to see all available employees."
         )
-    return employee.iloc[0].to_dict()
+    return employee
 
 @app.post("/employees", response_model=Employee)
-async def create_employee(employee: Employee):
-    df = read_employees()
-    new_id = df['id'].max() + 1 if not df.empty else 1
-    employee_dict = employee.dict()
-    employee_dict['id'] = str(new_id)
-    df = pd.concat([df, pd.DataFrame([employee_dict])], ignore_index=True)
-    write_employees(df)
-    return employee_dict
+async def create_employee(employee: Employee, writer: EmployeeWriter = Depends(get_writer)):
+    try:
+        return await writer.submit(WriteOp("create", data=employee.dict()))
+    except Exception as e:
+        raise write_error(e)
 
 @app.put("/employees/{employee_id}", response_model=Employee)
-async def update_employee(employee_id: str, employee: Employee):
-    df = read_employees()
-    if employee_id not in df['id'].values:
+async def update_employee(employee_id: str, employee: Employee, writer: EmployeeWriter = Depends(get_writer)):
+    try:
+        updated = await writer.submit(WriteOp("update", employee_id, employee.dict()))
+    except Exception as e:
+        raise write_error(e)
+    if updated is None:
         raise HTTPException(
-            status_code=404, 
+            status_code=404,
             detail=f"Employee with ID {employee_id} not found. Cannot update a non-existent employee. Please verify the employee_id or use the /employees endpoint to see all available employees."
         )
-    
-    employee_dict = employee.dict()
-    employee_dict['id'] = employee_id
-    df.loc[df['id'] == employee_id] = employee_dict
-    write_employees(df)
-    return employee_dict
+    return updated
 
 @app.delete("/employees/{employee_id}")
-async def delete_employee(employee_id: str):
-    df = read_employees()
-    if employee_id not in df['id'].values:
+async def delete_employee(employee_id: str, writer: EmployeeWriter = Depends(get_writer)):
+    try:
+        deleted = await writer.submit(WriteOp("delete", employee_id))
+    except Exception as e:
+        raise write_error(e)
+    if not deleted:
         raise HTTPException(
-            status_code=404, 
+            status_code=404,
             detail=f"Employee with ID {employee_id} not found. Cannot delete a non-existent employee. Please verify the employee_id or use the /employees endpoint to see all available employees."
         )
-    
-    df = df[df['id'] != employee_id]
-    write_employees(df)
     return {"message": "Employee deleted successfully"}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8081) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8081)
\ No newline at end of file
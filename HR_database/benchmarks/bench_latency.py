@@ -0,0 +1,106 @@
+"""
+Measure HR API read latency while writes are in flight.
+
+Concurrent readers hit GET /employees/{id} in two phases: reads only, then
+reads while a writer keeps POSTing new employees. With blocking storage work
+on the I/O executor the read p99 should stay flat; ``--inline`` runs the
+storage work directly on the event loop (HR_IO_WORKERS=0) for comparison.
+
+Usage (from HR_database/):
+    python benchmarks/bench_latency.py --backend markdown --employees 20000
+    python benchmarks/bench_latency.py --backend markdown --employees 20000 --inline
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+import app as hr_app  # noqa: E402
+from benchmarks.bench_storage import generate_employees  # noqa: E402
+from storage import CachedEmployeeStore, MarkdownEmployeeStore, SQLiteEmployeeStore, write_markdown  # noqa: E402
+
+NEW_EMPLOYEE = {
+    "first_name": "Bench", "last_name": "Mark", "department": "Engineering",
+    "position": "Engineer", "hire_date": "2025-01-01", "salary": "100000",
+}
+
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+async def reader(client, count, latencies, stop):
+    rng = random.Random()
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get(f"/employees/{rng.randint(1, count)}")
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+
+
+async def writer(client, stop, writes):
+    while not stop.is_set():
+        response = await client.post("/employees", json=NEW_EMPLOYEE)
+        assert response.status_code == 200
+        writes.append(response.json()["id"])
+
+
+async def run_phase(client, count, readers, duration, with_writes):
+    stop = asyncio.Event()
+    latencies, writes = [], []
+    tasks = [asyncio.create_task(reader(client, count, latencies, stop)) for _ in range(readers)]
+    if with_writes:
+        tasks.append(asyncio.create_task(writer(client, stop, writes)))
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return latencies, writes
+
+
+async def main_async(args, store):
+    hr_app.app.dependency_overrides[hr_app.get_store] = lambda: store
+    transport = httpx.ASGITransport(app=hr_app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, with_writes in (("reads only", False), ("reads + writes", True)):
+            latencies, writes = await run_phase(client, args.employees, args.readers, args.duration, with_writes)
+            print(f"{label:<16} reads={len(latencies):>6}  p50={percentile(latencies, 50):8.2f} ms  "
+                  f"p99={percentile(latencies, 99):8.2f} ms  max={max(latencies):8.2f} ms  writes={len(writes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["sqlite", "markdown"], default="markdown")
+    parser.add_argument("--employees", type=int, default=20_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per phase")
+    parser.add_argument("--inline", action="store_true", help="Run storage work on the event loop")
+    args = parser.parse_args()
+
+    hr_app._executor = None if args.inline else ThreadPoolExecutor(max_workers=4, thread_name_prefix="hr-io")
+    with tempfile.TemporaryDirectory() as tmp:
+        employees = generate_employees(args.employees)
+        if args.backend == "markdown":
+            path = os.path.join(tmp, "employees.md")
+            write_markdown(path, employees)
+            backing = MarkdownEmployeeStore(path)
+        else:
+            backing = SQLiteEmployeeStore(os.path.join(tmp, "employees.db"))
+            backing.replace_all(employees)
+        store = CachedEmployeeStore(backing)
+        mode = "inline" if args.inline else "executor"
+        print(f"HR read latency: backend={args.backend} employees={args.employees} readers={args.readers} mode={mode}")
+        asyncio.run(main_async(args, store))
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark the HR storage backends at 100k employees.
+
+Compares the original approach (parse data/employees.md with pandas on every
+request and rewrite the whole file on every write) with the SQLite backend.
+
+Usage (from HR_database/):
+    python benchmarks/bench_storage.py
+    python benchmarks/bench_storage.py --employees 20000 --repeat 3
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import MarkdownEmployeeStore, SQLiteEmployeeStore, import_markdown, write_markdown  # noqa: E402
+
+DEPARTMENTS = ["Engineering", "Marketing", "Sales", "HR", "Finance", "Operations", "Flight Crew", "Support"]
+POSITIONS = ["Engineer", "Manager", "Specialist", "Analyst", "Pilot", "Representative"]
+
+
+def generate_employees(count, seed=42):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(i),
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "department": rng.choice(DEPARTMENTS),
+            "position": rng.choice(POSITIONS),
+            "hire_date": f"20{rng.randint(10, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "salary": str(rng.randint(40, 200) * 1000),
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def timed(fn, repeat):
+    """Run ``fn`` ``repeat`` times and return the mean duration in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def run_operations(store, count, repeat):
+    rng = random.Random(7)
+    new_employee = {
+        "first_name": "Bench", "last_name": "Mark", "department": "Engineering",
+        "position": "Engineer", "hire_date": "2025-01-01", "salary": "100000",
+    }
+    return {
+        "get_employee": timed(lambda: store.get_employee(str(rng.randint(1, count))), repeat),
+        "list_by_department": timed(lambda: store.list_by_department("Finance"), repeat),
+        "list_employees": timed(store.list_employees, repeat),
+        "create_employee": timed(lambda: store.create_employee(new_employee), repeat),
+        "update_employee": timed(lambda: store.update_employee(str(rng.randint(1, count)), new_employee), repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    employees = generate_employees(args.employees)
+    with tempfile.TemporaryDirectory() as tmp:
+        markdown_path = os.path.join(tmp, "employees.md")
+        write_markdown(markdown_path, employees)
+
+        sqlite_store = SQLiteEmployeeStore(os.path.join(tmp, "employees.db"))
+        start = time.perf_counter()
+        import_markdown(sqlite_store, markdown_path)
+        import_ms = (time.perf_counter() - start) * 1000
+
+        results = {
+            "markdown": run_operations(MarkdownEmployeeStore(markdown_path), args.employees, args.repeat),
+            "sqlite": run_operations(sqlite_store, args.employees, args.repeat),
+        }
+        sqlite_store.close()
+
+    print(f"HR storage benchmark: {args.employees} employees, mean of {args.repeat} runs (ms)")
+    print(f"markdown -> sqlite import: {import_ms:.1f} ms")
+    print(f"{'operation':<22}{'markdown':>12}{'sqlite':>12}{'speedup':>10}")
+    for operation in results["markdown"]:
+        md, sq = results["markdown"][operation], results["sqlite"][operation]
+        print(f"{operation:<22}{md:>12.2f}{sq:>12.3f}{md / sq:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
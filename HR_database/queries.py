@@ -0,0 +1,160 @@
+"""
+Filtering, sorting, projection and cursor pagination for GET /employees.
+
+Queries run against the typed employee DataFrame (``EmployeeStore.frame``),
+so every filter is a vectorized boolean mask rather than a Python loop over
+rows. Pagination is keyset-based: the cursor carries the sort value and id of
+the last row returned, so later pages stay correct when rows are inserted.
+"""
+import base64
+import json
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from storage import FIELDS
+
+MAX_LIMIT = 1000
+INVALID_CURSOR = "Invalid cursor. Use the X-Next-Cursor header value from the previous page unchanged."
+
+# Sortable fields and the typed column each one sorts by
+SORT_COLUMNS = {
+    "id": "_id",
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "department": "department",
+    "position": "position",
+    "hire_date": "_hire_date",
+    "salary": "_salary",
+}
+
+
+class EmployeeQuery(NamedTuple):
+    department: Optional[List[str]] = None
+    position: Optional[List[str]] = None
+    hired_from: Optional[date] = None
+    hired_to: Optional[date] = None
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    sort: str = "id"
+    fields: Optional[List[str]] = None
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated ``fields`` parameter into a validated list."""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s) {', '.join(unknown)}. Valid fields are: {', '.join(FIELDS)}.")
+    return names
+
+
+def _parse_sort(sort: str) -> Tuple[str, bool]:
+    descending = sort.startswith("-")
+    name = sort.lstrip("-")
+    if name not in SORT_COLUMNS:
+        raise ValueError(
+            f"Cannot sort by '{name}'. Valid sort fields are: {', '.join(SORT_COLUMNS)}; prefix with '-' for descending order."
+        )
+    return name, descending
+
+
+def _sort_key(df: pd.DataFrame, name: str) -> pd.Series:
+    # Unparseable salaries and dates sort first instead of breaking comparisons
+    key = df[SORT_COLUMNS[name]]
+    if name == "hire_date":
+        return key.fillna(pd.Timestamp.min)
+    if name in ("id", "salary"):
+        return key.fillna(-np.inf)
+    return key
+
+
+def encode_cursor(sort: str, value: Any, last_id: float) -> str:
+    if isinstance(value, pd.Timestamp):
+        value = value.isoformat()
+    elif isinstance(value, (np.integer, np.floating)):
+        value = value.item()
+    payload = json.dumps([sort, value, float(last_id)]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, float]:
+    try:
+        cursor_sort, value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError(INVALID_CURSOR)
+    if cursor_sort != sort:
+        raise ValueError(
+            f"The cursor was created for sort '{cursor_sort}' but this request sorts by '{sort}'. Repeat the original query parameters when requesting the next page."
+        )
+    # A cursor that decodes but holds values of the wrong type would break the comparisons
+    name = sort.lstrip("-")
+    numeric = name in ("id", "salary")
+    if not _is_number(last_id) or not (_is_number(value) if numeric else isinstance(value, str)):
+        raise ValueError(INVALID_CURSOR)
+    if name == "hire_date":
+        try:
+            value = pd.Timestamp(value)
+        except ValueError:
+            raise ValueError(INVALID_CURSOR)
+    return value, last_id
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def query_employees(df: pd.DataFrame, query: EmployeeQuery) -> Tuple[List[Dict[str, str]], Optional[str]]:
+    """Evaluate ``query`` against the typed employee frame.
+
+    Returns the (projected) rows of the requested page and the cursor for the
+    next page, or None when there are no more rows.
+    """
+    if query.limit is not None and not 1 <= query.limit <= MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_LIMIT}.")
+    sort_name, descending = _parse_sort(query.sort)
+
+    mask = np.ones(len(df), dtype=bool)
+    if query.department:
+        mask &= df['department'].isin(query.department).to_numpy()
+    if query.position:
+        mask &= df['position'].isin(query.position).to_numpy()
+    if query.hired_from is not None:
+        mask &= (df['_hire_date'] >= pd.Timestamp(query.hired_from)).to_numpy()
+    if query.hired_to is not None:
+        mask &= (df['_hire_date'] <= pd.Timestamp(query.hired_to)).to_numpy()
+    if query.salary_min is not None:
+        mask &= (df['_salary'] >= query.salary_min).to_numpy()
+    if query.salary_max is not None:
+        mask &= (df['_salary'] <= query.salary_max).to_numpy()
+    matches = df[mask]
+
+    key = _sort_key(matches, sort_name)
+    ids = matches['_id'].fillna(-np.inf)
+    if query.cursor:
+        value, last_id = decode_cursor(query.cursor, query.sort)
+        after = (key < value) if descending else (key > value)
+        matches = matches[after | ((key == value) & (ids > last_id))]
+        key, ids = key[matches.index], ids[matches.index]
+
+    order = pd.DataFrame({'key': key, 'id': ids}).sort_values(
+        ['key', 'id'], ascending=[not descending, True], kind='mergesort'
+    )
+    if query.limit is not None:
+        order = order.head(query.limit + 1)
+    has_more = query.limit is not None and len(order) > query.limit
+    if has_more:
+        order = order.head(query.limit)
+
+    page = matches.loc[order.index, query.fields or FIELDS]
+    next_cursor = None
+    if has_more:
+        last = order.iloc[-1]
+        next_cursor = encode_cursor(query.sort, last['key'], last['id'])
+    return page.to_dict('records'), next_cursor
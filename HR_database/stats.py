@@ -0,0 +1,118 @@
+"""
+Aggregate HR analytics computed from the typed employee DataFrame.
+
+Every statistic is a vectorized pandas group-by over the numeric ``_salary``
+and datetime ``_hire_date`` columns built by ``employee_frame``. Results are
+memoised in a ``StatsCache`` that is tied to the frame they were computed
+from: the cached store hands out the same frame object until the next write,
+so a new frame is what invalidates the cache.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import pandas as pd
+
+GROUP_FIELDS = ["department", "position"]
+HIRING_FREQUENCIES = {"month": "M", "quarter": "Q", "year": "Y"}
+DEFAULT_PERCENTILES = [25, 50, 75, 90]
+
+
+def _check_group(by: Optional[str]):
+    if by is not None and by not in GROUP_FIELDS:
+        raise ValueError(f"Cannot group by '{by}'. Valid values are: {', '.join(GROUP_FIELDS)}.")
+
+
+def parse_percentiles(percentiles: Optional[str]) -> List[float]:
+    """Parse a comma-separated list of percentiles between 0 and 100 (repeated values are kept once)."""
+    if not percentiles:
+        return DEFAULT_PERCENTILES
+    try:
+        values = [float(p) for p in percentiles.split(",") if p.strip()]
+    except ValueError:
+        raise ValueError("percentiles must be a comma-separated list of numbers, e.g. 25,50,75.")
+    if not values or any(not 0 <= p <= 100 for p in values):
+        raise ValueError("percentiles must be between 0 and 100.")
+    return list(dict.fromkeys(values))
+
+
+def _percentile_name(p: float) -> str:
+    return f"p{p:g}"
+
+
+def headcount(df: pd.DataFrame, by: str = "department") -> Dict[str, Any]:
+    _check_group(by)
+    counts = df.groupby(by, sort=True).size()
+    return {
+        "by": by,
+        "total": int(len(df)),
+        "groups": [{"group": group, "headcount": int(count)} for group, count in counts.items()],
+    }
+
+
+def salary_stats(df: pd.DataFrame, by: Optional[str] = None, percentiles: List[float] = DEFAULT_PERCENTILES) -> Dict[str, Any]:
+    _check_group(by)
+    salaries = df[df['_salary'].notna()]
+    keys = salaries[by] if by else pd.Series("all", index=salaries.index)
+    grouped = salaries['_salary'].groupby(keys, sort=True)
+    summary = grouped.agg(['count', 'mean', 'min', 'max'])
+    quantiles = grouped.quantile([p / 100 for p in percentiles]).unstack() if len(salaries) else None
+    groups = []
+    for group, row in summary.iterrows():
+        groups.append({
+            "group": group,
+            "count": int(row['count']),
+            "mean": float(row['mean']),
+            "min": float(row['min']),
+            "max": float(row['max']),
+            "percentiles": {
+                _percentile_name(p): float(quantiles.loc[group, p / 100]) for p in percentiles
+            },
+        })
+    return {"by": by, "groups": groups}
+
+
+def hiring(df: pd.DataFrame, freq: str = "month", by: Optional[str] = None) -> Dict[str, Any]:
+    if freq not in HIRING_FREQUENCIES:
+        raise ValueError(f"Unknown frequency '{freq}'. Valid values are: {', '.join(HIRING_FREQUENCIES)}.")
+    _check_group(by)
+    hired = df[df['_hire_date'].notna()]
+    period = hired['_hire_date'].dt.to_period(HIRING_FREQUENCIES[freq]).rename('period')
+    keys = [period, hired[by]] if by else [period]
+    counts = hired.groupby(keys, sort=True).size()
+    periods = []
+    for key, count in counts.items():
+        if by:
+            periods.append({"period": str(key[0]), "group": key[1], "hires": int(count)})
+        else:
+            periods.append({"period": str(key), "group": None, "hires": int(count)})
+    return {"freq": freq, "by": by, "periods": periods}
+
+
+class StatsCache:
+    """Memoises statistics for one employee frame at a time.
+
+    The cache keeps a reference to the frame its results were computed from;
+    when a different frame is passed in (the table changed), it starts over.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+        self._results: Dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, df: pd.DataFrame, key: Hashable, compute: Callable[[pd.DataFrame], Any]) -> Any:
+        with self._lock:
+            if df is not self._frame:
+                self._frame = df
+                self._results = {}
+            if key in self._results:
+                self.hits += 1
+                return self._results[key]
+        result = compute(df)
+        with self._lock:
+            if df is self._frame:
+                self._results[key] = result
+            self.misses += 1
+        return result
@@ -0,0 +1,516 @@
+"""
+Storage backends for the Galaxium Travels HR employee table.
+
+The API talks to an ``EmployeeStore``. Two implementations are provided:
+
+- ``SQLiteEmployeeStore``: the production backend. An embedded SQLite
+  database with an integer primary key and an index on ``department``, so
+  lookups and writes no longer touch the whole table.
+- ``MarkdownEmployeeStore``: the original storage format, a markdown table in
+  ``data/employees.md`` that is parsed and rewritten on every call.
+
+``CachedEmployeeStore`` wraps either backend with an in-memory table indexed by
+id and department. It reloads only when the backend reports that its data
+changed, so reads never parse the file or hit the database.
+
+All writes are expressed as ``WriteOp`` values and applied with
+``apply_batch``, so a queue of pending writes can be persisted in one
+transaction (SQLite) or one atomic file replacement (markdown).
+
+``import_markdown`` and ``export_markdown`` move rows between any store and
+the markdown format, so the human-readable file can still be used as seed
+data and as an export.
+"""
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import pandas as pd
+
+FIELDS = ["id", "first_name", "last_name", "department", "position", "hire_date", "salary"]
+DATA_FIELDS = FIELDS[1:]
+
+MARKDOWN_HEADER = "# Galaxium Travels HR Database\n\n## Employees\n\n"
+
+
+class WriteOp(NamedTuple):
+    """A single mutation of the employee table.
+
+    ``kind`` is "create", "update" or "delete". ``employee_id`` is ignored for
+    creates and ``data`` is ignored for deletes.
+    """
+    kind: str
+    employee_id: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+def _parse_id(employee_id) -> Optional[int]:
+    """Return the integer form of an employee id, or None if it is not numeric."""
+    try:
+        return int(str(employee_id).strip())
+    except ValueError:
+        return None
+
+
+def read_markdown(path: str) -> List[Dict[str, str]]:
+    """Parse the markdown employee table at ``path`` into a list of row dicts."""
+    df = pd.read_csv(path, sep='|', skiprows=3, dtype=str, keep_default_na=False)
+    df = df.iloc[:, 1:-1]  # Remove first and last empty columns
+    df.columns = [col.strip() for col in df.columns]
+    df = df.apply(lambda col: col.str.strip())
+    # Drop the |----|----| separator row below the header
+    df = df[~df['id'].str.startswith('-')]
+    return df.to_dict('records')
+
+
+def render_markdown(rows: List[Dict[str, str]]) -> str:
+    """Render employee rows as the markdown document used by data/employees.md."""
+    lines = [
+        "| " + " | ".join(FIELDS) + " |",
+        "|" + "|".join("-" * (len(field) + 2) for field in FIELDS) + "|",
+    ]
+    for row in rows:
+        lines.append("|" + "|".join(str(row[field]) for field in FIELDS) + "|")
+    return MARKDOWN_HEADER + "\n".join(lines)
+
+
+def write_markdown(path: str, rows: List[Dict[str, str]]) -> None:
+    """Atomically write employee rows to ``path`` in the markdown table format.
+
+    The table is written to a temporary file in the same directory and moved
+    over ``path`` with ``os.replace``, so readers never see a half-written file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.employees-', suffix='.md.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(render_markdown(rows))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def employee_frame(rows: List[Dict[str, str]]) -> pd.DataFrame:
+    """Build a DataFrame of employee rows with typed helper columns.
+
+    The string columns in ``FIELDS`` are kept as-is for output. ``_id`` and
+    ``_salary`` are numeric and ``_hire_date`` is a datetime, so filters,
+    sorting and aggregations can run as vectorized operations. Values that do
+    not parse become NaN/NaT.
+    """
+    df = pd.DataFrame(rows, columns=FIELDS)
+    df['_id'] = pd.to_numeric(df['id'], errors='coerce')
+    df['_salary'] = pd.to_numeric(df['salary'], errors='coerce')
+    df['_hire_date'] = pd.to_datetime(df['hire_date'], errors='coerce', format='%Y-%m-%d')
+    return df
+
+
+def _employee_row(employee_id, data: Dict[str, Any]) -> Dict[str, str]:
+    row = {'id': str(employee_id)}
+    row.update((field, str(data[field])) for field in DATA_FIELDS)
+    return row
+
+
+class EmployeeStore:
+    """Interface shared by all employee storage backends.
+
+    Employees are plain dicts keyed by ``FIELDS``. Ids are exposed as strings
+    to match the API model, whatever the backend uses internally.
+    """
+
+    def list_employees(self) -> List[Dict[str, str]]:
+        raise NotImplementedError
+
+    def get_employee(self, employee_id: str) -> Optional[Dict[str, str]]:
+        raise NotImplementedError
+
+    def list_by_department(self, department: str) -> List[Dict[str, str]]:
+        return [row for row in self.list_employees() if row['department'] == department]
+
+    def frame(self) -> pd.DataFrame:
+        """Return the employee table as a typed DataFrame (see ``employee_frame``)."""
+        return employee_frame(self.list_employees())
+
+    def apply_batch(self, ops: List[WriteOp]) -> List[Any]:
+        """Apply ``ops`` in order as one unit and return one result per op.
+
+        A create returns the stored row, an update returns the row or None if
+        the id does not exist, and a delete returns whether a row was removed.
+        Ids are allocated monotonically and never reused within a store.
+        """
+        raise NotImplementedError
+
+    def create_employee(self, data: Dict[str, str]) -> Dict[str, str]:
+        """Insert a new employee, allocate its id and return the stored row."""
+        return self.apply_batch([WriteOp("create", data=data)])[0]
+
+    def update_employee(self, employee_id: str, data: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """Replace an employee's fields. Returns None if the id does not exist."""
+        return self.apply_batch([WriteOp("update", employee_id, data)])[0]
+
+    def delete_employee(self, employee_id: str) -> bool:
+        """Delete an employee. Returns False if the id does not exist."""
+        return self.apply_batch([WriteOp("delete", employee_id)])[0]
+
+    def replace_all(self, rows: List[Dict[str, str]]) -> None:
+        """Replace the whole table with ``rows``, keeping their ids."""
+        raise NotImplementedError
+
+    def fingerprint(self):
+        """Return a cheap token that changes whenever the stored data changes."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MarkdownEmployeeStore(EmployeeStore):
+    """The original backend: every call parses, and every write batch rewrites, the markdown file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._stat = None
+        self._hash = None
+        # High-water mark for id allocation, so ids of deleted employees are not reused
+        self._next_id = 1
+
+    def list_employees(self):
+        return read_markdown(self.path)
+
+    def get_employee(self, employee_id):
+        key = str(employee_id)
+        for row in read_markdown(self.path):
+            if row['id'] == key:
+                return row
+        return None
+
+    def apply_batch(self, ops):
+        rows = {row['id']: row for row in read_markdown(self.path)}
+        ids = [_parse_id(key) for key in rows]
+        self._next_id = max(self._next_id, max((i for i in ids if i is not None), default=0) + 1)
+        results = []
+        changed = False
+        for op in ops:
+            key = str(op.employee_id)
+            if op.kind == "create":
+                row = _employee_row(self._next_id, op.data)
+                self._next_id += 1
+                rows[row['id']] = row
+                results.append(row)
+                changed = True
+            elif op.kind == "update":
+                if key in rows:
+                    rows[key] = _employee_row(key, op.data)
+                    changed = True
+                results.append(rows.get(key))
+            elif op.kind == "delete":
+                deleted = rows.pop(key, None) is not None
+                changed = changed or deleted
+                results.append(deleted)
+            else:
+                raise ValueError(f"Unknown write operation '{op.kind}'")
+        if changed:
+            write_markdown(self.path, list(rows.values()))
+        return results
+
+    def replace_all(self, rows):
+        write_markdown(self.path, [{field: str(row[field]) for field in FIELDS} for row in rows])
+
+    def fingerprint(self):
+        """Content hash of the file, recomputed only when its mtime or size changes."""
+        st = os.stat(self.path)
+        stat = (st.st_mtime_ns, st.st_size)
+        if stat != self._stat:
+            with open(self.path, 'rb') as f:
+                self._hash = hashlib.sha256(f.read()).hexdigest()
+            self._stat = stat
+        return self._hash
+
+
+class SQLiteEmployeeStore(EmployeeStore):
+    """Embedded SQLite backend with an integer primary key and a department index.
+
+    A single connection is shared between threads and guarded by a lock, so the
+    store can be used from FastAPI's threadpool as well as from the event loop.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS employees (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL,
+            department TEXT NOT NULL,
+            position TEXT NOT NULL,
+            hire_date TEXT NOT NULL,
+            salary TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_employees_department ON employees(department);
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, str]:
+        return {field: str(row[field]) for field in FIELDS}
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+
+    def list_employees(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM employees ORDER BY id").fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def get_employee(self, employee_id):
+        key = _parse_id(employee_id)
+        if key is None:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM employees WHERE id = ?", (key,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list_by_department(self, department):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM employees WHERE department = ? ORDER BY id", (department,)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def apply_batch(self, ops):
+        # One transaction per batch; AUTOINCREMENT keeps ids monotonic even after deletes
+        results = []
+        with self._lock, self._conn:
+            for op in ops:
+                key = _parse_id(op.employee_id)
+                if op.kind == "create":
+                    row = _employee_row(0, op.data)
+                    cursor = self._conn.execute(
+                        f"INSERT INTO employees ({', '.join(DATA_FIELDS)}) VALUES ({', '.join('?' * len(DATA_FIELDS))})",
+                        [row[field] for field in DATA_FIELDS],
+                    )
+                    row['id'] = str(cursor.lastrowid)
+                    results.append(row)
+                elif op.kind == "update":
+                    row = _employee_row(key, op.data) if key is not None else None
+                    if row is not None:
+                        cursor = self._conn.execute(
+                            f"UPDATE employees SET {', '.join(f'{field} = ?' for field in DATA_FIELDS)} WHERE id = ?",
+                            [row[field] for field in DATA_FIELDS] + [key],
+                        )
+                        if cursor.rowcount == 0:
+                            row = None
+                    results.append(row)
+                elif op.kind == "delete":
+                    deleted = False
+                    if key is not None:
+                        cursor = self._conn.execute("DELETE FROM employees WHERE id = ?", (key,))
+                        deleted = cursor.rowcount > 0
+                    results.append(deleted)
+                else:
+                    raise ValueError(f"Unknown write operation '{op.kind}'")
+        return results
+
+    def replace_all(self, rows):
+        records = [[_parse_id(row['id'])] + [str(row[field]) for field in DATA_FIELDS] for row in rows]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM employees")
+            self._conn.executemany(
+                f"INSERT INTO employees ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+                records,
+            )
+
+    def fingerprint(self):
+        """SQLite's data_version, which changes when another connection commits."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmployeeStore(EmployeeStore):
+    """In-memory employee table in front of a backing store.
+
+    Rows are held in a dict keyed by id plus a per-department index, so single
+    lookups are O(1). Every read compares the backing store's fingerprint with
+    the one seen at the last load and reloads only when it differs, which picks
+    up edits made outside the API (e.g. someone editing data/employees.md).
+    Write batches go to the backing store first and then update memory, so
+    memory never shows data that is not on disk. The slow backing write holds
+    only ``_write_lock``; readers keep serving the in-memory table meanwhile
+    and take ``_lock`` only for the brief index update that follows.
+    """
+
+    def __init__(self, backing: EmployeeStore):
+        self.backing = backing
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._by_id: Dict[str, Dict[str, str]] = {}
+        self._by_department: Dict[str, Dict[str, Dict[str, str]]] = {}
+        self._fingerprint = None
+        self._frame = None
+        self._version = 0
+        self.loads = 0
+        with self._lock:
+            self._reload()
+
+    def _reload(self):
+        fingerprint = self.backing.fingerprint()
+        self._by_id = {}
+        self._by_department = {}
+        for row in self.backing.list_employees():
+            self._index(row)
+        self._frame = None
+        self._version += 1
+        self._fingerprint = fingerprint
+        self.loads += 1
+
+    def _refresh(self):
+        if self._write_lock.locked():
+            # Our own write is changing the backing data; memory is authoritative
+            return
+        if self.backing.fingerprint() != self._fingerprint:
+            self._reload()
+
+    def _index(self, row):
+        self._by_id[row['id']] = row
+        self._by_department.setdefault(row['department'], {})[row['id']] = row
+
+    def _unindex(self, employee_id):
+        row = self._by_id.pop(employee_id)
+        department = self._by_department[row['department']]
+        del department[employee_id]
+        if not department:
+            del self._by_department[row['department']]
+
+    def list_employees(self):
+        with self._lock:
+            self._refresh()
+            return list(self._by_id.values())
+
+    def get_employee(self, employee_id):
+        with self._lock:
+            self._refresh()
+            return self._by_id.get(str(employee_id))
+
+    def list_by_department(self, department):
+        with self._lock:
+            self._refresh()
+            return list(self._by_department.get(department, {}).values())
+
+    def frame(self):
+        """The typed DataFrame of the table, built once and reused until the next change."""
+        with self._lock:
+            self._refresh()
+            if self._frame is not None:
+                return self._frame
+            rows, version = list(self._by_id.values()), self._version
+        # Build outside the lock so other readers are not held up
+        frame = employee_frame(rows)
+        with self._lock:
+            if self._version == version:
+                self._frame = frame
+        return frame
+
+    def apply_batch(self, ops):
+        with self._write_lock:
+            with self._lock:
+                if self.backing.fingerprint() != self._fingerprint:
+                    self._reload()
+            results = self.backing.apply_batch(ops)
+            # Remember the fingerprint of our own write so the next read does
+            # not reload what is already in memory.
+            fingerprint = self.backing.fingerprint()
+            with self._lock:
+                self._apply_results(ops, results)
+                self._fingerprint = fingerprint
+            return results
+
+    def _apply_results(self, ops, results):
+        self._frame = None
+        self._version += 1
+        for op, result in zip(ops, results):
+            if op.kind == "create":
+                self._index(result)
+            elif op.kind == "update" and result is not None:
+                self._unindex(result['id'])
+                self._index(result)
+            elif op.kind == "delete" and result:
+                self._unindex(str(op.employee_id))
+
+    def replace_all(self, rows):
+        with self._write_lock:
+            self.backing.replace_all(rows)
+            with self._lock:
+                self._reload()
+
+    def fingerprint(self):
+        return self.backing.fingerprint()
+
+    def close(self):
+        self.backing.close()
+
+
+def import_markdown(store: EmployeeStore, path: str) -> int:
+    """Load the markdown table at ``path`` into ``store``. Returns the number of rows."""
+    rows = read_markdown(path)
+    store.replace_all(rows)
+    return len(rows)
+
+
+def export_markdown(store: EmployeeStore, path: str) -> int:
+    """Write every employee in ``store`` to ``path`` as a markdown table. Returns the number of rows."""
+    rows = store.list_employees()
+    write_markdown(path, rows)
+    return len(rows)
+
+
+def open_store(backend: str, markdown_path: str, sqlite_path: str) -> EmployeeStore:
+    """Open the configured backend.
+
+    A fresh SQLite database is seeded from the markdown file when one exists,
+    so the first start of the service keeps the existing employee data.
+    """
+    if backend == "markdown":
+        return MarkdownEmployeeStore(markdown_path)
+    if backend == "sqlite":
+        store = SQLiteEmployeeStore(sqlite_path)
+        if store.count() == 0 and os.path.exists(markdown_path):
+            import_markdown(store, markdown_path)
+        return store
+    raise ValueError(f"Unknown HR storage backend '{backend}'. Use 'sqlite' or 'markdown'.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import or export the HR SQLite database as markdown.")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("markdown_path", nargs="?", default="data/employees.md")
+    parser.add_argument("--db", default="data/employees.db", help="Path of the SQLite database")
+    args = parser.parse_args()
+
+    sqlite_store = SQLiteEmployeeStore(args.db)
+    if args.command == "import":
+        count = import_markdown(sqlite_store, args.markdown_path)
+        print(f"Imported {count} employees from {args.markdown_path} into {args.db}")
+    else:
+        count = export_markdown(sqlite_store, args.markdown_path)
+        print(f"Exported {count} employees from {args.db} to {args.markdown_path}")
+    sqlite_store.close()
@@ -0,0 +1,56 @@
+import pytest
+from fastapi.testclient import TestClient
+from app import app, get_store
+from storage import CachedEmployeeStore, MarkdownEmployeeStore, SQLiteEmployeeStore, write_markdown
+
+SEED_EMPLOYEES = [
+    {"id": "1", "first_name": "John", "last_name": "Smith", "department": "Engineering",
+     "position": "Senior Developer", "hire_date": "2023-01-15", "salary": "85000"},
+    {"id": "2", "first_name": "Sarah", "last_name": "Johnson", "department": "Marketing",
+     "position": "Marketing Manager", "hire_date": "2023-02-20", "salary": "78000"},
+    {"id": "3", "first_name": "David", "last_name": "Wilson", "department": "Engineering",
+     "position": "DevOps Engineer", "hire_date": "2023-05-12", "salary": "90000"},
+]
+
+@pytest.fixture
+def markdown_path(tmp_path):
+    """A markdown employee file seeded with SEED_EMPLOYEES."""
+    path = tmp_path / "employees.md"
+    write_markdown(str(path), SEED_EMPLOYEES)
+    return str(path)
+
+@pytest.fixture(params=["sqlite", "markdown"])
+def store(request, tmp_path, markdown_path):
+    """A seeded store for each storage backend."""
+    if request.param == "markdown":
+        store = MarkdownEmployeeStore(markdown_path)
+    else:
+        store = SQLiteEmployeeStore(str(tmp_path / "employees.db"))
+        store.replace_all(SEED_EMPLOYEES)
+    yield store
+    store.close()
+
+@pytest.fixture
+def cached_store(store):
+    """The seeded store behind the in-memory table, as the API uses it."""
+    return CachedEmployeeStore(store)
+
+@pytest.fixture
+def client(cached_store):
+    """A test client backed by a fresh seeded store."""
+    app.dependency_overrides[get_store] = lambda: cached_store
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def new_employee():
+    """Employee payload for create and update requests."""
+    return {
+        "first_name": "Emily",
+        "last_name": "Davis",
+        "department": "HR",
+        "position": "HR Specialist",
+        "hire_date": "2023-04-05",
+        "salary": "72000"
+    }
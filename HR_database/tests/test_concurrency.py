@@ -0,0 +1,60 @@
+import asyncio
+import httpx
+from app import app
+from storage import WriteOp
+from writer import EmployeeWriter
+
+def fire_parallel_creates(count, employee):
+    """Send ``count`` POST /employees requests concurrently and return the responses."""
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*[
+                client.post("/employees", json=dict(employee, first_name=f"Parallel{i}"))
+                for i in range(count)
+            ])
+    return asyncio.run(run())
+
+class TestConcurrentWrites:
+    """Test that concurrent mutations are serialised through the single writer."""
+
+    def test_parallel_creates_are_not_lost(self, client, cached_store, new_employee):
+        responses = fire_parallel_creates(50, new_employee)
+        assert all(r.status_code == 200 for r in responses)
+        ids = [r.json()["id"] for r in responses]
+        assert len(set(ids)) == 50
+        assert sorted(int(i) for i in ids) == list(range(4, 54))
+        # Nothing was lost in memory or on disk
+        assert len(cached_store.list_employees()) == 53
+        assert len(cached_store.backing.list_employees()) == 53
+
+    def test_queued_writes_are_batched(self, cached_store, new_employee):
+        writer = EmployeeWriter(cached_store)
+
+        async def run():
+            return await asyncio.gather(*[
+                writer.submit(WriteOp("create", data=new_employee)) for _ in range(20)
+            ])
+        rows = asyncio.run(run())
+        assert len({row["id"] for row in rows}) == 20
+        assert writer.batches < 20
+
+    def test_ids_are_not_reused_after_delete(self, cached_store, new_employee):
+        created = cached_store.create_employee(new_employee)
+        cached_store.delete_employee(created["id"])
+        assert int(cached_store.create_employee(new_employee)["id"]) > int(created["id"])
+
+    def test_failing_op_fails_only_its_own_request(self, cached_store, new_employee):
+        writer = EmployeeWriter(cached_store)
+
+        async def run():
+            return await asyncio.gather(
+                writer.submit(WriteOp("rename", "1")),
+                writer.submit(WriteOp("create", data=new_employee)),
+                return_exceptions=True,
+            )
+        bad, good = asyncio.run(run())
+        assert isinstance(bad, ValueError)
+        assert good["first_name"] == new_employee["first_name"]
+        assert cached_store.get_employee(good["id"]) == good
+        assert len(cached_store.backing.list_employees()) == 4
@@ -0,0 +1,32 @@
+from fastapi import status
+
+class TestEmployeeEndpoints:
+    """Test the employee CRUD endpoints."""
+
+    def test_get_employees(self, client):
+        response = client.get("/employees")
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["id"] for row in response.json()] == ["1", "2", "3"]
+
+    def test_get_employee_not_found(self, client):
+        response = client.get("/employees/999")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert "use the /employees endpoint" in response.json()["detail"]
+
+    def test_create_employee(self, client, new_employee):
+        response = client.post("/employees", json=new_employee)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["id"] == "4"
+        assert client.get("/employees/4").json()["first_name"] == "Emily"
+
+    def test_update_employee(self, client, new_employee):
+        response = client.put("/employees/2", json=new_employee)
+        assert response.status_code == status.HTTP_200_OK
+        assert client.get("/employees/2").json()["position"] == "HR Specialist"
+        assert client.put("/employees/999", json=new_employee).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_delete_employee(self, client):
+        response = client.delete("/employees/3")
+        assert response.status_code == status.HTTP_200_OK
+        assert client.get("/employees/3").status_code == status.HTTP_404_NOT_FOUND
+        assert client.delete("/employees/3").status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,55 @@
+import base64
+import json
+from fastapi import status
+
+class TestEmployeeQueries:
+    """Test filtering, sorting, projection and pagination of GET /employees."""
+
+    def test_filter_by_department_and_salary(self, client):
+        response = client.get("/employees", params={"department": "Engineering", "salary_min": 86000})
+        assert [row["id"] for row in response.json()] == ["3"]
+
+    def test_filter_by_several_departments(self, client):
+        response = client.get("/employees", params=[("department", "Marketing"), ("department", "Engineering")])
+        assert len(response.json()) == 3
+
+    def test_filter_by_hire_date_range(self, client):
+        response = client.get("/employees", params={"hired_from": "2023-02-01", "hired_to": "2023-03-31"})
+        assert [row["first_name"] for row in response.json()] == ["Sarah"]
+
+    def test_sort_descending_by_salary(self, client):
+        response = client.get("/employees", params={"sort": "-salary"})
+        assert [row["id"] for row in response.json()] == ["3", "1", "2"]
+
+    def test_field_projection(self, client):
+        response = client.get("/employees", params={"fields": "id,department"})
+        assert response.json()[0] == {"id": "1", "department": "Engineering"}
+
+    def test_cursor_pagination(self, client, new_employee):
+        for _ in range(4):
+            client.post("/employees", json=new_employee)
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, "sort": "-hire_date"}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/employees", params=params)
+            seen += [row["id"] for row in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert seen == ["3", "4", "5", "6", "7", "2", "1"]
+
+    def test_invalid_parameters(self, client):
+        for params in ({"fields": "id,ssn"}, {"sort": "email"}, {"limit": 0}, {"cursor": "garbage"}):
+            response = client.get("/employees", params=params)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert "Invalid employee query" in response.json()["detail"]
+
+    def test_cursor_with_wrong_value_types_is_rejected(self, client):
+        for sort, value, last_id in (("salary", "high", 1), ("-hire_date", 20200101, 1),
+                                     ("last_name", 5, 1), ("id", True, 1), ("salary", 50000, "1")):
+            cursor = base64.urlsafe_b64encode(json.dumps([sort, value, last_id]).encode()).decode()
+            response = client.get("/employees", params={"sort": sort, "limit": 2, "cursor": cursor})
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert "Invalid cursor" in response.json()["detail"]
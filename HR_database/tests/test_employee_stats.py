@@ -0,0 +1,52 @@
+from fastapi import status
+from app import _stats_cache
+
+class TestEmployeeStats:
+    """Test the aggregate statistics endpoints."""
+
+    def test_headcount_by_department(self, client):
+        data = client.get("/employees/stats/headcount").json()
+        assert data["total"] == 3
+        assert data["groups"] == [
+            {"group": "Engineering", "headcount": 2},
+            {"group": "Marketing", "headcount": 1},
+        ]
+
+    def test_repeated_percentiles_are_reported_once(self, client):
+        response = client.get("/employees/stats/salary", params={"percentiles": "75,50,50,75.0"})
+        assert response.status_code == 200
+        assert list(response.json()["groups"][0]["percentiles"]) == ["p75", "p50"]
+
+    def test_salary_percentiles(self, client):
+        data = client.get("/employees/stats/salary", params={"by": "department", "percentiles": "50"}).json()
+        engineering = data["groups"][0]
+        assert engineering["group"] == "Engineering"
+        assert engineering["mean"] == 87500
+        assert engineering["percentiles"] == {"p50": 87500}
+
+    def test_company_wide_salary(self, client):
+        data = client.get("/employees/stats/salary").json()
+        assert data["groups"][0]["group"] == "all"
+        assert data["groups"][0]["max"] == 90000
+
+    def test_hiring_by_quarter(self, client):
+        data = client.get("/employees/stats/hiring", params={"freq": "quarter"}).json()
+        assert data["periods"] == [
+            {"period": "2023Q1", "group": None, "hires": 2},
+            {"period": "2023Q2", "group": None, "hires": 1},
+        ]
+
+    def test_results_cached_until_next_write(self, client, new_employee):
+        client.get("/employees/stats/headcount")
+        hits = _stats_cache.hits
+        client.get("/employees/stats/headcount")
+        assert _stats_cache.hits == hits + 1
+        client.post("/employees", json=new_employee)
+        data = client.get("/employees/stats/headcount").json()
+        assert data["total"] == 4
+        assert _stats_cache.hits == hits + 1
+
+    def test_invalid_grouping(self, client):
+        response = client.get("/employees/stats/headcount", params={"by": "salary"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "Cannot group by" in response.json()["detail"]
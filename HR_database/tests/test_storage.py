@@ -0,0 +1,91 @@
+import pytest
+from storage import (
+    CachedEmployeeStore, MarkdownEmployeeStore, SQLiteEmployeeStore, export_markdown,
+    import_markdown, open_store, read_markdown, write_markdown
+)
+from tests.conftest import SEED_EMPLOYEES
+
+class TestMarkdownFormat:
+    """Test reading and writing the markdown employee table."""
+
+    def test_read_markdown_drops_separator_row(self, markdown_path):
+        """The |----| separator row is not returned as an employee."""
+        assert read_markdown(markdown_path) == SEED_EMPLOYEES
+
+    def test_import_export_roundtrip(self, tmp_path, markdown_path):
+        """Importing into SQLite and exporting again preserves every row."""
+        store = SQLiteEmployeeStore(str(tmp_path / "roundtrip.db"))
+        assert import_markdown(store, markdown_path) == 3
+        export_path = str(tmp_path / "export.md")
+        assert export_markdown(store, export_path) == 3
+        assert read_markdown(export_path) == SEED_EMPLOYEES
+        store.close()
+
+    def test_open_store_seeds_sqlite_from_markdown(self, tmp_path, markdown_path):
+        """A new SQLite database is seeded from the markdown file."""
+        store = open_store("sqlite", markdown_path, str(tmp_path / "seeded.db"))
+        assert store.count() == 3
+        store.close()
+
+    def test_open_store_rejects_unknown_backend(self, tmp_path, markdown_path):
+        """An unknown backend name raises a clear error."""
+        with pytest.raises(ValueError, match="Unknown HR storage backend"):
+            open_store("csv", markdown_path, str(tmp_path / "unused.db"))
+
+class TestEmployeeStore:
+    """Test CRUD behaviour shared by every backend."""
+
+    def test_get_employee(self, store):
+        assert store.get_employee("2")["first_name"] == "Sarah"
+        assert store.get_employee("999") is None
+        assert store.get_employee("not-a-number") is None
+
+    def test_list_by_department(self, store):
+        ids = [row["id"] for row in store.list_by_department("Engineering")]
+        assert ids == ["1", "3"]
+
+    def test_create_allocates_next_numeric_id(self, store, new_employee):
+        created = store.create_employee(new_employee)
+        assert created["id"] == "4"
+        assert store.get_employee("4")["last_name"] == "Davis"
+
+    def test_update_and_delete(self, store, new_employee):
+        assert store.update_employee("1", new_employee)["first_name"] == "Emily"
+        assert store.get_employee("1")["department"] == "HR"
+        assert store.update_employee("999", new_employee) is None
+        assert store.delete_employee("1") is True
+        assert store.delete_employee("1") is False
+        assert store.get_employee("1") is None
+
+class TestCachedEmployeeStore:
+    """Test the in-memory employee table and its reload behaviour."""
+
+    def test_reads_do_not_reload_unchanged_data(self, cached_store):
+        for _ in range(3):
+            cached_store.get_employee("1")
+            cached_store.list_employees()
+        assert cached_store.loads == 1
+
+    def test_writes_update_memory_and_backing_store(self, cached_store, new_employee):
+        created = cached_store.create_employee(new_employee)
+        assert cached_store.backing.get_employee(created["id"]) == created
+        assert cached_store.list_by_department("HR") == [created]
+        cached_store.update_employee(created["id"], dict(new_employee, department="Sales"))
+        assert cached_store.list_by_department("HR") == []
+        assert cached_store.delete_employee(created["id"]) is True
+        assert cached_store.get_employee(created["id"]) is None
+        assert cached_store.loads == 1
+
+    def test_reload_after_external_markdown_edit(self, markdown_path):
+        cached = CachedEmployeeStore(MarkdownEmployeeStore(markdown_path))
+        write_markdown(markdown_path, SEED_EMPLOYEES[:1])
+        assert [row["id"] for row in cached.list_employees()] == ["1"]
+        assert cached.loads == 2
+
+    def test_reload_after_external_sqlite_write(self, tmp_path):
+        path = str(tmp_path / "shared.db")
+        cached = CachedEmployeeStore(SQLiteEmployeeStore(path))
+        other = SQLiteEmployeeStore(path)
+        other.replace_all(SEED_EMPLOYEES)
+        assert cached.get_employee("3")["first_name"] == "David"
+        other.close()
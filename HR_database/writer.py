@@ -0,0 +1,88 @@
+"""
+Single-writer queue for HR employee mutations.
+
+Every create, update and delete is submitted to one ``EmployeeWriter``. A
+single background task drains the queue and applies whatever has piled up
+as one ``apply_batch`` call, so concurrent requests never interleave their
+read-modify-write cycles and a burst of writes costs one transaction or one
+file replacement instead of one per request. A batch is applied as one
+unit, so if it fails nothing was written: its ops are then retried one at a
+time and only the request that caused the failure sees the error.
+
+The batch itself is blocking storage work, so it runs on ``executor`` when
+one is given, keeping the event loop free to serve reads while it persists.
+"""
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, List, Optional, Tuple
+
+from storage import EmployeeStore, WriteOp
+
+DEFAULT_MAX_BATCH = 100
+
+
+class EmployeeWriter:
+    def __init__(self, store: EmployeeStore, max_batch: int = DEFAULT_MAX_BATCH,
+                 executor: Optional[Executor] = None):
+        self.store = store
+        self.max_batch = max_batch
+        self.executor = executor
+        self.batches = 0
+        self._queue: "asyncio.Queue[Tuple[WriteOp, asyncio.Future]]" = None
+        self._task: asyncio.Task = None
+        self._loop = None
+
+    def _ensure_started(self):
+        # The task is started lazily on the running loop, so the writer works
+        # both under uvicorn and in test clients that create their own loop.
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def submit(self, op: WriteOp) -> Any:
+        """Queue ``op`` and wait for the result of applying it."""
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((op, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._apply(batch)
+
+    async def _apply_ops(self, ops: List[WriteOp]) -> List[Any]:
+        if self.executor is None:
+            return self.store.apply_batch(ops)
+        return await self._loop.run_in_executor(self.executor, self.store.apply_batch, ops)
+
+    async def _apply(self, batch: List[Tuple[WriteOp, asyncio.Future]]):
+        try:
+            results = await self._apply_ops([op for op, _ in batch])
+        except Exception as e:
+            if len(batch) > 1:
+                # Nothing of the batch was written: find the failing op(s) one by one
+                for item in batch:
+                    await self._apply([item])
+                return
+            _, future = batch[0]
+            if not future.done():
+                future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        self.batches += 1
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,13 +1,21 @@
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.middleware.gzip import GZipMiddleware
 from sqlalchemy.orm import Session
 from models import User, Flight, Booking
 from db import get_db, init_db
 from seed import seed
 from pydantic import BaseModel
 from datetime import datetime
+import os
 
 app = FastAPI()
 
+# Compress responses of at least GZIP_MINIMUM_SIZE bytes; GZIP_COMPRESSLEVEL=0 disables compression
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
+GZIP_COMPRESSLEVEL = int(os.getenv("GZIP_COMPRESSLEVEL", "6"))
+if GZIP_COMPRESSLEVEL > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESSLEVEL)
+
 @app.on_event("startup")
 def on_startup():
     init_db()
@@ -1,12 +1,16 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from models import User as UserModel, Flight as FlightModel, Booking as BookingModel
 from db import get_db, init_db
 from seed import seed
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, TypeAdapter
 from datetime import datetime
-from typing import Optional, Union
-from fastapi.responses import JSONResponse
+from typing import Literal, Optional, Union
+from fastapi.responses import JSONResponse, Response
+from fastapi.middleware.gzip import GZipMiddleware
+import hashlib
+import os
+from singleflight import SingleFlight
 
 app = FastAPI(
     title="Galaxium Travels Booking API",
@@ -48,6 +52,9 @@ class Booking(BaseModel):
     class Config:
         from_attributes = True
 
+class DetailedBooking(Booking):
+    flight: Flight
+
 class UserRegistration(BaseModel):
     name: str
     email: EmailStr
@@ -65,10 +72,49 @@ class ErrorResponse(BaseModel):
     error_code: str
     details: Optional[str] = None
 
+flight_list = TypeAdapter(list[Flight])
+booking_list = TypeAdapter(list[Booking])
+detailed_booking_list = TypeAdapter(list[DetailedBooking])
+user_adapter = TypeAdapter(User)
+
 class SuccessResponse(BaseModel):
     success: bool = True
     data: Union[Flight, list[Flight], Booking, list[Booking], User]
 
+# Concurrent identical reads share one query and one serialization.
+# Keys: "flights" and "bookings:<user_id>"; writes forget the keys they touch.
+reads = SingleFlight()
+
+def make_etag(body: bytes) -> str:
+    # Weak: the gzip and identity encodings of a body share it
+    return 'W/"' + hashlib.sha1(body).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists ``etag`` (or is ``*``), comparing whole tags weakly."""
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in (if_none_match or "").split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
+
+def json_response(request: Request, body: bytes, etag: Optional[str] = None) -> Response:
+    """A JSON response with an ETag, or a bodiless 304 when the client already has this body.
+
+    Lets the web app proxy revalidate its cached copy instead of downloading it again.
+    """
+    etag = etag or make_etag(body)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+def read_json(request: Request, key: str, adapter: TypeAdapter, query):
+    """Run ``query`` once per burst of identical requests and return the serialized JSON response."""
+    def load():
+        body = adapter.dump_json(adapter.validate_python(query(), from_attributes=True))
+        return body, make_etag(body)
+    return json_response(request, *reads.do(key, load))
+
 def create_error_response(error: str, error_code: str, details: Optional[str] = None):
     """Create a standardized error response that returns 200 status code"""
     return JSONResponse(
@@ -88,10 +134,9 @@ def create_error_response(error: str, error_code: str, details: Optional[str] =
     summary="List all available flights",
     description="Retrieve a list of all available flights, including origin, destination, departure and arrival times, price, and the number of seats currently available for booking."
 )
-def get_flights(db: Session = Depends(get_db)):
+def get_flights(request: Request, db: Session = Depends(get_db)):
     try:
-        flights = db.query(FlightModel).all()
-        return flights
+        return read_json(request, "flights", flight_list, db.query(FlightModel).all)
     except Exception as e:
         # This is a truly fatal error - database connection issue
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -147,6 +192,8 @@ def book_flight(booking: BookingRequest, db: Session = Depends(get_db)):
         )
         db.add(new_booking)
         db.commit()
+        reads.forget("flights")
+        reads.forget(f"bookings:{booking.user_id}")
         db.refresh(new_booking)
         return new_booking
         
@@ -162,10 +209,49 @@ def book_flight(booking: BookingRequest, db: Session = Depends(get_db)):
     summary="List all bookings for a user",
     description="Retrieve all bookings for a specific user by user_id. Returns a list of bookings, including booking status and booking time, for the given user."
 )
-def get_user_bookings(user_id: int, db: Session = Depends(get_db)):
+def get_user_bookings(user_id: int, request: Request, db: Session = Depends(get_db)):
     try:
-        bookings = db.query(BookingModel).filter(BookingModel.user_id == user_id).all()
-        return bookings
+        return read_json(
+            request,
+            f"bookings:{user_id}",
+            booking_list,
+            db.query(BookingModel).filter(BookingModel.user_id == user_id).all,
+        )
+    except Exception as e:
+        # This is a truly fatal error - database connection issue
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+@app.get(
+    "/bookings/{user_id}/detailed",
+    response_model=list[DetailedBooking],
+    operation_id="getUserBookingsDetailed",
+    summary="List a user's bookings with flight details",
+    description="Retrieve the bookings of a specific user by user_id, each with the full details of its flight (origin, destination, departure and arrival times, price and seats available), in one call. Optionally filter by status ('booked' or 'cancelled'). Results are ordered by booking_id and paginated with limit and offset."
+)
+def get_user_bookings_detailed(
+    user_id: int,
+    request: Request,
+    status: Optional[Literal["booked", "cancelled"]] = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    try:
+        query = (
+            db.query(BookingModel, FlightModel)
+            .join(FlightModel, BookingModel.flight_id == FlightModel.flight_id)
+            .filter(BookingModel.user_id == user_id)
+        )
+        if status is not None:
+            query = query.filter(BookingModel.status == status)
+        rows = query.order_by(BookingModel.booking_id).offset(offset).limit(limit).all()
+        return json_response(request, detailed_booking_list.dump_json([
+            DetailedBooking(
+                **Booking.model_validate(booking).model_dump(),
+                flight=Flight.model_validate(flight),
+            )
+            for booking, flight in rows
+        ]))
     except Exception as e:
         # This is a truly fatal error - database connection issue
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -199,6 +285,8 @@ def cancel_booking(booking_id: int, db: Session = Depends(get_db)):
             flight.seats_available += 1
         booking.status = "cancelled"
         db.commit()
+        reads.forget("flights")
+        reads.forget(f"bookings:{booking.user_id}")
         db.refresh(booking)
         return booking
         
@@ -242,7 +330,7 @@ def register_user(user: UserRegistration, db: Session = Depends(get_db)):
     summary="Get user by name and email",
     description="Retrieve a user's information (including user_id) by providing both name and email. Returns error response if not found."
 )
-def get_user(name: str, email: str, db: Session = Depends(get_db)):
+def get_user(name: str, email: str, request: Request, db: Session = Depends(get_db)):
     try:
         user = db.query(UserModel).filter(UserModel.name == name, UserModel.email == email).first()
         if not user:
@@ -251,7 +339,7 @@ def get_user(name: str, email: str, db: Session = Depends(get_db)):
                 "USER_NOT_FOUND",
                 f"User not found with name '{name}' and email '{email}'. The user may not be registered in our system. Please check the spelling of both name and email, or register the user first using the /register endpoint."
             )
-        return user
+        return json_response(request, user_adapter.dump_json(User.model_validate(user)))
         
     except Exception as e:
         # This is a truly fatal error - database connection issue
@@ -267,6 +355,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses of at least GZIP_MINIMUM_SIZE bytes; GZIP_COMPRESSLEVEL=0 disables compression
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
+GZIP_COMPRESSLEVEL = int(os.getenv("GZIP_COMPRESSLEVEL", "6"))
+if GZIP_COMPRESSLEVEL > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESSLEVEL)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8082) 
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Measure what response compression saves in bytes and costs in CPU.
+
+Builds GET /flights-shaped JSON payloads of increasing size and compresses
+each with gzip at several levels (the GZIP_COMPRESSLEVEL setting of the
+services) and, when the ``brotli`` package is installed, brotli. Reports the
+compressed size, the share of bytes saved, and compression/decompression time
+per payload, so GZIP_MINIMUM_SIZE and GZIP_COMPRESSLEVEL can be chosen from
+data: below some size the saved bytes are not worth the CPU.
+
+Usage (from booking_system_rest/):
+    python benchmarks/bench_compression.py
+    python benchmarks/bench_compression.py --flights 10 100 1000 10000 --levels 1 6 9
+"""
+import argparse
+import gzip
+import json
+import time
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def flights_payload(count):
+    return json.dumps([
+        {
+            "flight_id": i,
+            "origin": ["Earth", "Mars", "Moon"][i % 3],
+            "destination": ["Mars", "Moon", "Venus", "Europa", "Titan"][i % 5],
+            "departure_time": f"2099-{1 + i % 12:02d}-{1 + i % 28:02d}T09:00:00Z",
+            "arrival_time": f"2099-{1 + i % 12:02d}-{1 + i % 28:02d}T17:00:00Z",
+            "price": 500000 + 1000 * (i % 700),
+            "seats_available": i % 40,
+        }
+        for i in range(1, count + 1)
+    ]).encode()
+
+
+def timed(fn, data, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(data)
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def codecs(levels):
+    for level in levels:
+        yield f"gzip-{level}", lambda data, level=level: gzip.compress(data, compresslevel=level), gzip.decompress
+    if brotli is not None:
+        for quality in (4, 9):
+            yield f"br-{quality}", lambda data, quality=quality: brotli.compress(data, quality=quality), brotli.decompress
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flights", type=int, nargs="+", default=[5, 50, 500, 5000])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6, 9])
+    args = parser.parse_args()
+    if brotli is None:
+        print("brotli not installed: gzip only")
+
+    print(f"{'flights':>8} {'bytes':>10} {'codec':<8} {'compressed':>10} {'saved':>7} {'comp ms':>9} {'decomp ms':>10} {'MB/s':>8}")
+    for count in args.flights:
+        payload = flights_payload(count)
+        # Repeat small payloads so their timings are above the clock resolution
+        repeat = max(1, 2_000_000 // len(payload))
+        for name, compress, decompress in codecs(args.levels):
+            compressed, compress_ms = timed(compress, payload, repeat)
+            _, decompress_ms = timed(decompress, compressed, repeat)
+            saved = 1 - len(compressed) / len(payload)
+            throughput = len(payload) / 1e6 / (compress_ms / 1000)
+            print(
+                f"{count:>8} {len(payload):>10} {name:<8} {len(compressed):>10} {saved:>6.1%} "
+                f"{compress_ms:>9.3f} {decompress_ms:>10.3f} {throughput:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Measure request coalescing on GET /flights under a burst of identical requests.
+
+A pool of client threads fires the same GET /flights at once against a
+temporary SQLite database with many flights, first with every request running
+its own query and serialization, then with concurrent identical requests
+sharing one (``app.reads``). Reports requests/s, latency and the number of
+SELECT statements the database actually executed.
+
+Usage (from booking_system_rest/):
+    python benchmarks/bench_singleflight.py --flights 5000 --requests 400 --concurrency 32
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+import app as booking_app  # noqa: E402
+from db import get_db  # noqa: E402
+from models import Base, Flight  # noqa: E402
+from singleflight import SingleFlight  # noqa: E402
+
+
+class NoCoalescing:
+    """Drop-in for SingleFlight that runs every call."""
+
+    def do(self, key, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+    def forget(self, key):
+        pass
+
+
+def create_database(path, flights):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as session:
+        session.add_all(
+            Flight(
+                origin="Earth", destination=f"Station {i}",
+                departure_time="2099-01-01T09:00:00Z", arrival_time="2099-01-01T17:00:00Z",
+                price=1000 + i, seats_available=100,
+            )
+            for i in range(flights)
+        )
+        session.commit()
+    return engine, Session
+
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+def run(client, requests, concurrency):
+    latencies = []
+
+    def call(_):
+        start = time.perf_counter()
+        response = client.get("/flights")
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(requests)))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flights", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session = create_database(os.path.join(tmp, "bench.db"), args.flights)
+        selects = []
+        lock = threading.Lock()
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                with lock:
+                    selects.append(1)
+
+        def override_get_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        booking_app.app.dependency_overrides[get_db] = override_get_db
+        # No context manager: the startup hook would seed the default database
+        client = TestClient(booking_app.app)
+        print(f"{args.flights} flights, {args.requests} requests, {args.concurrency} concurrent")
+        print(f"{'mode':<12} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'SELECTs':>8}")
+        try:
+            for mode, reads in (("independent", NoCoalescing()), ("coalesced", SingleFlight())):
+                booking_app.reads = reads
+                client.get("/flights")  # warm up
+                selects.clear()
+                elapsed, latencies = run(client, args.requests, args.concurrency)
+                print(
+                    f"{mode:<12} {args.requests / elapsed:>8.0f} {percentile(latencies, 50):>8.1f} "
+                    f"{percentile(latencies, 99):>8.1f} {len(selects):>8}"
+                )
+        finally:
+            booking_app.app.dependency_overrides.clear()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Single-flight execution for the read path.
+
+Concurrent calls with the same key share one execution: the first caller
+runs the function, callers that arrive while it is still running wait and
+receive the same result (or exception). During a burst of identical
+requests, e.g. hundreds of GET /flights at once, the query and its
+serialization then run once per burst instead of once per request.
+
+galaxium-booking-web-app/app/singleflight.py has a copy of ``SingleFlight``
+(plus an asyncio variant) for the proxy: keep the two APIs (``do``,
+``forget``, ``forget_prefixes``) and their fixes in step.
+"""
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def forget(self, key):
+        """Let the next caller for ``key`` start a new execution instead of joining the running one.
+
+        Write endpoints call this after committing, so a read that started
+        before the write is not shared with callers that must see it.
+        """
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def forget_prefixes(self, *prefixes):
+        """``forget`` every key starting with one of ``prefixes``."""
+        with self._lock:
+            for key in [key for key in self._calls if key.startswith(prefixes)]:
+                del self._calls[key]
@@ -250,6 +250,42 @@ class TestBookingRetrieval:
         data = response.json()
         assert len(data) == 0
 
+    def test_get_user_bookings_detailed(self, client, db_session, sample_user_data):
+        """Test retrieval of bookings joined with their flights."""
+        user_id = client.post("/register", json=sample_user_data).json()["user_id"]
+        flights = [
+            Flight(origin="Earth", destination="Mars", departure_time="2099-01-01T09:00:00Z",
+                   arrival_time="2099-01-01T17:00:00Z", price=1000000, seats_available=5),
+            Flight(origin="Earth", destination="Moon", departure_time="2099-01-02T10:00:00Z",
+                   arrival_time="2099-01-02T14:00:00Z", price=500000, seats_available=3),
+        ]
+        db_session.add_all(flights)
+        db_session.commit()
+        for flight, booking_status in zip(flights * 2, ["booked", "booked", "cancelled", "booked"]):
+            db_session.add(Booking(user_id=user_id, flight_id=flight.flight_id,
+                                   status=booking_status, booking_time="2099-01-01T10:00:00Z"))
+        db_session.commit()
+
+        response = client.get(f"/bookings/{user_id}/detailed")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [b["booking_id"] for b in data] == [1, 2, 3, 4]
+        assert data[1]["flight"]["destination"] == "Moon"
+        assert data[1]["flight"]["flight_id"] == data[1]["flight_id"]
+
+        booked = client.get(f"/bookings/{user_id}/detailed", params={"status": "booked"}).json()
+        assert [b["booking_id"] for b in booked] == [1, 2, 4]
+
+        page = client.get(f"/bookings/{user_id}/detailed", params={"limit": 2, "offset": 2}).json()
+        assert [b["booking_id"] for b in page] == [3, 4]
+
+    def test_get_user_bookings_detailed_invalid_parameters(self, client):
+        """Test validation of status and pagination parameters."""
+        assert client.get("/bookings/1/detailed", params={"status": "lost"}).status_code == 422
+        assert client.get("/bookings/1/detailed", params={"limit": 0}).status_code == 422
+        assert client.get("/bookings/1/detailed", params={"offset": -1}).status_code == 422
+
 class TestBookingCancellation:
     """Test booking cancellation functionality."""
     
@@ -0,0 +1,38 @@
+from fastapi import status
+from models import Flight
+
+
+class TestConditionalReads:
+    """Test ETags and If-None-Match revalidation of the read endpoints."""
+
+    def setup_user_and_flight(self, client, db_session, sample_user_data):
+        user_id = client.post("/register", json=sample_user_data).json()["user_id"]
+        db_session.add(Flight(
+            origin="Earth", destination="Mars",
+            departure_time="2099-01-01T09:00:00Z", arrival_time="2099-01-01T17:00:00Z",
+            price=1000000, seats_available=2,
+        ))
+        db_session.commit()
+        return user_id
+
+    def test_unchanged_data_gets_not_modified(self, client, db_session, sample_user_data):
+        user_id = self.setup_user_and_flight(client, db_session, sample_user_data)
+        query = f"?name={sample_user_data['name']}&email={sample_user_data['email']}"
+        for path in ("/flights", f"/bookings/{user_id}", f"/bookings/{user_id}/detailed", f"/user_id{query}"):
+            first = client.get(path)
+            etag = first.headers["ETag"]
+            assert etag.startswith('W/"')
+            revalidated = client.get(path, headers={"If-None-Match": f'"other", {etag}'})
+            assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED, path
+            assert revalidated.content == b""
+            assert revalidated.headers["ETag"] == etag
+
+    def test_booking_changes_the_etags(self, client, db_session, sample_user_data):
+        user_id = self.setup_user_and_flight(client, db_session, sample_user_data)
+        etags = {path: client.get(path).headers["ETag"] for path in ("/flights", f"/bookings/{user_id}")}
+        client.post("/book", json={"user_id": user_id, "name": sample_user_data["name"], "flight_id": 1})
+        for path, etag in etags.items():
+            response = client.get(path, headers={"If-None-Match": etag})
+            assert response.status_code == status.HTTP_200_OK
+            assert response.headers["ETag"] != etag
+        assert client.get("/flights").json()[0]["seats_available"] == 1
@@ -56,6 +56,24 @@ class TestFlightRetrieval:
             assert "flight_id" in flight
             assert flight["flight_id"] > 0
 
+    def test_large_flight_list_is_compressed(self, client, db_session):
+        """Test that responses above the size threshold are gzip-compressed when accepted."""
+        for i in range(50):
+            db_session.add(Flight(
+                origin="Earth", destination=f"Station {i}",
+                departure_time="2099-01-01T09:00:00Z", arrival_time="2099-01-01T17:00:00Z",
+                price=1000000, seats_available=5,
+            ))
+        db_session.commit()
+
+        compressed = client.get("/flights", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/flights", headers={"Accept-Encoding": "identity"})
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in plain.headers
+        assert compressed.json() == plain.json()
+        assert len(compressed.json()) == 50
+
 class TestFlightDataIntegrity:
     """Test flight data integrity and validation."""
     
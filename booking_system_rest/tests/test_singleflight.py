@@ -0,0 +1,114 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import status
+from models import Flight
+from singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent identical calls."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Callers that arrive while the first call is running get its result."""
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            leader = pool.submit(flight.do, "key", slow)
+            started.wait(5)
+            followers = [pool.submit(flight.do, "key", slow) for _ in range(4)]
+            while flight.shared < 4:
+                threading.Event().wait(0.01)
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+
+        assert results == ["result"] * 5
+        assert len(calls) == 1
+        assert flight.executions == 1
+        assert flight.shared == 4
+
+    def test_error_is_raised_to_every_caller(self):
+        """An exception in the shared call is raised to the leader and to followers."""
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def fail():
+            started.set()
+            release.wait(5)
+            raise RuntimeError("database down")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            leader = pool.submit(flight.do, "key", fail)
+            started.wait(5)
+            followers = [pool.submit(flight.do, "key", fail) for _ in range(2)]
+            while flight.shared < 2:
+                threading.Event().wait(0.01)
+            release.set()
+            for future in [leader] + followers:
+                with pytest.raises(RuntimeError, match="database down"):
+                    future.result()
+        assert flight.executions == 1
+        # The key is released after a failure
+        assert flight.do("key", lambda: "ok") == "ok"
+
+    def test_forget_starts_a_new_execution(self):
+        """After forget, new callers do not join the call that is still running."""
+        flight = SingleFlight()
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "old"
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            leader = pool.submit(flight.do, "key", slow)
+            started.wait(5)
+            flight.forget("key")
+            assert flight.do("key", lambda: "new") == "new"
+            release.set()
+            assert leader.result() == "old"
+        assert flight.executions == 2
+
+
+    def test_forget_matches_whole_keys_and_forget_prefixes_matches_prefixes(self):
+        """forget("bookings:1") leaves "bookings:10" running; forget_prefixes drops both."""
+        flight = SingleFlight()
+        flight._calls.update({"bookings:1": object(), "bookings:10": object(), "flights": object()})
+        flight.forget("bookings:1")
+        assert set(flight._calls) == {"bookings:10", "flights"}
+        flight.forget_prefixes("bookings:")
+        assert set(flight._calls) == {"flights"}
+
+class TestCoalescedReads:
+    """Test that coalesced read endpoints still reflect writes."""
+
+    def test_bookings_reflect_new_booking(self, client, db_session, sample_user_data):
+        """GET /flights and /bookings/{user_id} show a booking made right before them."""
+        user_id = client.post("/register", json=sample_user_data).json()["user_id"]
+        db_session.add(Flight(
+            origin="Earth", destination="Mars",
+            departure_time="2099-01-01T09:00:00Z", arrival_time="2099-01-01T17:00:00Z",
+            price=1000000, seats_available=2,
+        ))
+        db_session.commit()
+
+        assert client.get(f"/bookings/{user_id}").json() == []
+        assert client.get("/flights").json()[0]["seats_available"] == 2
+
+        client.post("/book", json={"user_id": user_id, "name": sample_user_data["name"], "flight_id": 1})
+
+        response = client.get(f"/bookings/{user_id}")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        assert [b["status"] for b in response.json()] == ["booked"]
+        assert client.get("/flights").json()[0]["seats_available"] == 1
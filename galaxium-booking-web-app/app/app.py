@@ -1,42 +1,224 @@
 from flask import Flask, render_template, request, Response, jsonify
 from flask_cors import CORS
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
 
+from assets import IMMUTABLE_CACHE_CONTROL, AssetManifest, RenderedPage, choose_encoding, etag_matches
+from response_cache import CachedResponse, ResponseCache, cache_key, make_etag, negotiate_body
+from singleflight import SingleFlight
+
 BACKEND_URL = os.getenv('BACKEND_URL')
 
+# Upstream connection pool, timeouts (seconds) and retries for idempotent methods
+BACKEND_POOL_SIZE = int(os.getenv('BACKEND_POOL_SIZE', '20'))
+BACKEND_CONNECT_TIMEOUT = float(os.getenv('BACKEND_CONNECT_TIMEOUT', '3.05'))
+BACKEND_READ_TIMEOUT = float(os.getenv('BACKEND_READ_TIMEOUT', '10'))
+BACKEND_RETRIES = int(os.getenv('BACKEND_RETRIES', '2'))
+# Content codings requested from the backend; compressed bodies are passed through
+# to the browser as they are ("identity" asks for uncompressed bodies)
+BACKEND_ACCEPT_ENCODING = os.getenv('BACKEND_ACCEPT_ENCODING', 'gzip')
+
+# Response cache for GET routes: TTL in seconds per backend path prefix (0 disables)
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '1000'))
+CACHE_TTLS = {
+    "/flights": float(os.getenv('CACHE_TTL_FLIGHTS', '5')),
+    "/user_id": float(os.getenv('CACHE_TTL_USER', '30')),
+    "/bookings/": float(os.getenv('CACHE_TTL_BOOKINGS', '2')),
+}
+# Cached data that a successful POST to these backend paths changes
+CACHE_INVALIDATIONS = {
+    "/register": ("/user_id",),
+    "/book": ("/flights", "/bookings/"),
+    "/cancel/": ("/flights", "/bookings/"),
+}
+# Backend response headers kept with cached entries
+CACHED_HEADERS = ("content-type", "content-encoding", "etag")
+
 app = Flask(__name__, static_folder="static", template_folder="templates")
 
 # Enable CORS for all routes and origins
 # send_wildcard True will send Access-Control-Allow-Origin: *
 CORS(app, resources={r"/*": {"origins": "*"}}, send_wildcard=True)
 
+# Hashed, precompressed static files; templates link them with asset_url('js/app.js')
+assets = AssetManifest(app.static_folder)
+app.jinja_env.globals["asset_url"] = assets.url
+# The rendered index page, built on the first request (and on every request in debug mode)
+index_page = None
+
+def create_backend_session():
+    """Create the shared HTTP session used for all backend calls.
+
+    The session keeps TCP/TLS connections to BACKEND_URL alive between
+    requests instead of doing a new handshake for every proxied call. Only
+    idempotent methods are retried; POSTs such as /book are sent once.
+    """
+    retry = Retry(
+        total=BACKEND_RETRIES,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=BACKEND_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+backend_session = create_backend_session()
+response_cache = ResponseCache(CACHE_MAX_ENTRIES)
+cache_fills = SingleFlight()
+# GET routes without a TTL are not cached, but identical in-flight calls are still shared
+backend_reads = SingleFlight()
+# Everything that coalesces backend GETs (asgi.py adds its async one); summed on /api/health
+cache_coalescers = [cache_fills, backend_reads]
+
+def cache_ttl(method, path):
+    if method != "GET":
+        return 0
+    for prefix, ttl in CACHE_TTLS.items():
+        if path.startswith(prefix):
+            return ttl
+    return 0
+
+def invalidate_after(path):
+    for prefix, cached in CACHE_INVALIDATIONS.items():
+        if path.startswith(prefix):
+            response_cache.invalidate(*cached)
+            for coalescer in cache_coalescers:
+                coalescer.forget_prefixes(*cached)
+
+def read_raw(resp):
+    """Read a streamed backend response body without decoding it, and return the connection to the pool."""
+    try:
+        return resp.raw.read(decode_content=False)
+    finally:
+        resp.raw.release_conn()
+
+def backend_response(body, status, encoding):
+    """Response for the browser from a backend body in the given content coding."""
+    body, encoding = negotiate_body(body, encoding, request.headers.get("Accept-Encoding"))
+    response = Response(body, status=status, content_type="application/json")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+def fetch_into_cache(key, path, params, ttl):
+    """Fetch a GET route from the backend and cache it, revalidating a stale entry by ETag."""
+    stale = response_cache.lookup(key)
+    # A write that invalidates the key while the backend call runs keeps its result out of the cache
+    generation = response_cache.generation(key)
+    headers = {"Content-Type": "application/json", "Accept-Encoding": BACKEND_ACCEPT_ENCODING}
+    if stale is not None and stale.backend_etag:
+        headers["If-None-Match"] = stale.backend_etag
+    resp = backend_session.get(
+        f"{BACKEND_URL}{path}", params=params, headers=headers, stream=True,
+        timeout=(BACKEND_CONNECT_TIMEOUT, BACKEND_READ_TIMEOUT),
+    )
+    body = read_raw(resp)
+    if resp.status_code == 304 and stale is not None:
+        return response_cache.renew(key, stale, ttl, generation)
+    kept = {name: resp.headers[name] for name in CACHED_HEADERS if name in resp.headers}
+    if resp.status_code == 200:
+        return response_cache.store(key, resp.status_code, kept, body, ttl, generation)
+    # Errors are passed on but not cached
+    return CachedResponse(resp.status_code, kept, body, make_etag(body), None, 0)
+
+def cached_response(entry, cache_status):
+    if entry.status == 200 and etag_matches(request.headers.get("If-None-Match"), entry.etag):
+        response = Response(status=304)
+        response.headers["Vary"] = "Accept-Encoding"
+    else:
+        response = backend_response(entry.body, entry.status, entry.headers.get("content-encoding"))
+    response.headers["ETag"] = entry.etag
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Cache"] = cache_status
+    return response
+
+def cached_get(path, params, ttl):
+    """Serve a GET route from the cache; concurrent misses for one key share a single backend call."""
+    key = cache_key(path, params)
+    entry = response_cache.lookup(key)
+    if entry is not None and entry.fresh:
+        response_cache.record(hit=True)
+        return cached_response(entry, "HIT")
+    response_cache.record(hit=False)
+    print(f"\n\n***Log: {BACKEND_URL}{path}\n\n")
+    try:
+        entry = cache_fills.do(key, fetch_into_cache, key, path, params, ttl)
+    except requests.RequestException as e:
+        payload = {"error": "backend_unreachable", "detail": str(e)}
+        return Response(json.dumps(payload), status=502, content_type="application/json")
+    return cached_response(entry, "MISS")
+
+def send_backend(method, url, params=None, json_body=None):
+    """Send a request to the backend; returns the response and its still-encoded body."""
+    #headers = {"Accept": "application/json", "Content-Type": "application/json"}
+    headers = {"Content-Type": "application/json", "Accept-Encoding": BACKEND_ACCEPT_ENCODING}
+    resp = backend_session.request(
+        method=method,
+        url=url,
+        params=params,
+        json=json_body,
+        headers=headers,
+        stream=True,
+        timeout=(BACKEND_CONNECT_TIMEOUT, BACKEND_READ_TIMEOUT),
+    )
+    return resp, read_raw(resp)
+
 # Helper to proxy to backend with JSON headers
 def proxy_request(method, path, params=None, json_body=None):
+    ttl = cache_ttl(method, path)
+    if ttl > 0:
+        return cached_get(path, params, ttl)
     url = f"{BACKEND_URL}{path}"
     print(f"\n\n***Log: {url}\n\n")
-    #headers = {"Accept": "application/json", "Content-Type": "application/json"}
-    headers = {"Content-Type": "application/json"}
     try:
-        resp = requests.request(
-            method=method,
-            url=url,
-            params=params,
-            json=json_body,
-            headers=headers,
-            #timeout=10,
-        )
-        return Response(resp.content, status=resp.status_code, content_type="application/json")
+        if method == "GET":
+            resp, body = backend_reads.do(cache_key(path, params), send_backend, method, url, params)
+        else:
+            resp, body = send_backend(method, url, params, json_body)
+        if method != "GET" and resp.ok:
+            invalidate_after(path)
+        return backend_response(body, resp.status_code, resp.headers.get("Content-Encoding"))
     except requests.RequestException as e:
         payload = {"error": "backend_unreachable", "detail": str(e)}
         print(f"\n\n***Log: {url}\n\n")
         return Response(json.dumps(payload), status=502, content_type="application/json")
 
+def send_variants(variants, etag, content_type, cache_control):
+    """Serve the precompressed variant the client accepts, or a 304 when its ETag matches."""
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        response = Response(status=304)
+    else:
+        encoding = choose_encoding(request.headers.get("Accept-Encoding"), variants)
+        response = Response(variants[encoding], content_type=content_type)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
 # --- Public UI routes ---
 @app.route("/")
 def index():
-    return render_template("index.html", backend_url=BACKEND_URL)
+    global index_page
+    if index_page is None or app.debug:
+        index_page = RenderedPage.from_html(render_template("index.html", backend_url=BACKEND_URL))
+    return send_variants(index_page.variants, index_page.etag, "text/html; charset=utf-8", "no-cache")
+
+@app.route("/assets/<path:hashed_path>")
+def hashed_asset(hashed_path):
+    asset = assets.lookup(hashed_path)
+    if asset is None:
+        return Response("Not found", status=404, content_type="text/plain")
+    return send_variants(asset.variants, asset.etag, asset.content_type, IMMUTABLE_CACHE_CONTROL)
 
 # --- API routes used by the frontend (proxying to OpenAPI backend) ---
 
@@ -66,6 +248,11 @@ def api_book():
 def api_get_bookings(user_id):
     return proxy_request("GET", f"/bookings/{user_id}")
 
+@app.route("/api/bookings/<int:user_id>/detailed", methods=["GET"])
+def api_get_bookings_detailed(user_id):
+    params = {name: request.args[name] for name in ("status", "limit", "offset") if name in request.args}
+    return proxy_request("GET", f"/bookings/{user_id}/detailed", params=params)
+
 @app.route("/api/cancel/<int:booking_id>", methods=["POST"])
 def api_cancel(booking_id):
     return proxy_request("POST", f"/cancel/{booking_id}")
@@ -73,7 +260,10 @@ def api_cancel(booking_id):
 # Simple health endpoint
 @app.route("/api/health")
 def health():
-    return jsonify({"status": "ok", "proxy_to": BACKEND_URL})
+    cache_stats = response_cache.stats()
+    cache_stats["coalesced"] = sum(coalescer.shared for coalescer in cache_coalescers)
+    return jsonify({"status": "ok", "proxy_to": BACKEND_URL, "cache": cache_stats})
     
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8083, debug=True)
\ No newline at end of file
+    # Development server only; the container serves asgi:app with uvicorn
+    app.run(host='0.0.0.0', port=8083, debug=os.getenv('FLASK_DEBUG', '0') == '1')
\ No newline at end of file
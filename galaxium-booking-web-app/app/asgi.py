@@ -0,0 +1,200 @@
+"""
+Async streaming mode of the Galaxium booking web app.
+
+The /api/* routes are served by an ASGI app that forwards each call to
+BACKEND_URL with a shared httpx.AsyncClient and streams the backend body
+back to the browser as it arrives, instead of buffering it in a worker
+thread like the Flask proxy does. One worker can therefore keep many
+backend calls in flight at once.
+
+Cacheable GET routes share the Flask proxy's response cache (TTLs, ETags,
+invalidation on POST) and coalesce concurrent misses; cached bodies are
+small and served from memory rather than streamed.
+
+Everything else (the index page, static files, /api/health) is still served
+by the Flask app in app.py, mounted below the proxy routes.
+
+Run it under a production server, e.g.:
+    uvicorn asgi:app --host 0.0.0.0 --port 8083
+
+The response cache is per process: with several --workers, a write only
+invalidates the cache of the worker that handled it, and the others serve
+their cached copy until its TTL runs out.
+"""
+import contextlib
+import json
+
+import httpx
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+from app import (
+    BACKEND_URL, BACKEND_POOL_SIZE, BACKEND_CONNECT_TIMEOUT, BACKEND_READ_TIMEOUT, BACKEND_RETRIES, BACKEND_ACCEPT_ENCODING,
+    CACHED_HEADERS, app as flask_app, cache_coalescers, cache_ttl, invalidate_after, response_cache,
+)
+from assets import etag_matches
+from response_cache import CachedResponse, cache_key, make_etag, negotiate_body
+from singleflight import AsyncSingleFlight
+
+# Response headers passed through from the backend
+PASSTHROUGH_HEADERS = ("content-type", "content-encoding", "etag", "cache-control", "last-modified")
+
+backend_client: httpx.AsyncClient = None
+cache_fills = AsyncSingleFlight()
+cache_coalescers.append(cache_fills)
+
+
+def create_backend_client():
+    """Create the shared async client: pooled keep-alive connections with the same limits as the Flask proxy.
+
+    httpx only retries failed connection attempts, which are safe for any
+    method, so POSTs are still never sent twice. The limits are given to the
+    transport: httpx ignores the client's ``limits`` when a transport is passed.
+    """
+    limits = httpx.Limits(max_connections=BACKEND_POOL_SIZE, max_keepalive_connections=BACKEND_POOL_SIZE)
+    return httpx.AsyncClient(
+        base_url=BACKEND_URL or "",
+        timeout=httpx.Timeout(BACKEND_READ_TIMEOUT, connect=BACKEND_CONNECT_TIMEOUT),
+        transport=httpx.AsyncHTTPTransport(retries=BACKEND_RETRIES, limits=limits),
+    )
+
+
+async def proxy_stream(request, method, path, params=None, body=None):
+    """Forward a request to the backend and stream its response body through unchanged.
+
+    The browser's Accept-Encoding is forwarded, so a compressed backend body
+    can be streamed through as it is.
+    """
+    print(f"\n\n***Log: {BACKEND_URL}{path}\n\n")
+    headers = {"Content-Type": "application/json", "Accept-Encoding": request.headers.get("accept-encoding", "identity")}
+    upstream_request = backend_client.build_request(method, path, params=params, content=body, headers=headers)
+    try:
+        upstream = await backend_client.send(upstream_request, stream=True)
+    except httpx.HTTPError as e:
+        payload = {"error": "backend_unreachable", "detail": str(e)}
+        return Response(json.dumps(payload), status_code=502, media_type="application/json")
+    if method != "GET" and upstream.is_success:
+        invalidate_after(path)
+    headers = {name: upstream.headers[name] for name in PASSTHROUGH_HEADERS if name in upstream.headers}
+    headers.setdefault("content-type", "application/json")
+    headers["vary"] = "Accept-Encoding"
+    return StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        headers=headers,
+        background=BackgroundTask(upstream.aclose),
+    )
+
+
+async def fetch_into_cache(key, path, params, ttl):
+    """Async counterpart of app.fetch_into_cache."""
+    stale = response_cache.lookup(key)
+    # A write that invalidates the key while the backend call runs keeps its result out of the cache
+    generation = response_cache.generation(key)
+    headers = {"Content-Type": "application/json", "Accept-Encoding": BACKEND_ACCEPT_ENCODING}
+    if stale is not None and stale.backend_etag:
+        headers["If-None-Match"] = stale.backend_etag
+    async with backend_client.stream("GET", path, params=params, headers=headers) as resp:
+        # Raw bytes: a compressed body is cached compressed
+        body = b"".join([chunk async for chunk in resp.aiter_raw()])
+    if resp.status_code == 304 and stale is not None:
+        return response_cache.renew(key, stale, ttl, generation)
+    kept = {name: resp.headers[name] for name in CACHED_HEADERS if name in resp.headers}
+    if resp.status_code == 200:
+        return response_cache.store(key, resp.status_code, kept, body, ttl, generation)
+    return CachedResponse(resp.status_code, kept, body, make_etag(body), None, 0)
+
+
+def cached_response(request, entry, cache_status):
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": cache_status, "Vary": "Accept-Encoding"}
+    if entry.status == 200 and etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    body, encoding = negotiate_body(entry.body, entry.headers.get("content-encoding"), request.headers.get("accept-encoding"))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, status_code=entry.status, headers=headers, media_type="application/json")
+
+
+async def proxy_get(request, path, params=None):
+    """GET through the response cache when the route has a TTL, otherwise stream it."""
+    ttl = cache_ttl("GET", path)
+    if ttl <= 0:
+        return await proxy_stream(request, "GET", path, params=params)
+    key = cache_key(path, params)
+    entry = response_cache.lookup(key)
+    if entry is not None and entry.fresh:
+        response_cache.record(hit=True)
+        return cached_response(request, entry, "HIT")
+    response_cache.record(hit=False)
+    print(f"\n\n***Log: {BACKEND_URL}{path}\n\n")
+    try:
+        entry = await cache_fills.do(key, fetch_into_cache, key, path, params, ttl)
+    except httpx.HTTPError as e:
+        payload = {"error": "backend_unreachable", "detail": str(e)}
+        return Response(json.dumps(payload), status_code=502, media_type="application/json")
+    return cached_response(request, entry, "MISS")
+
+
+# --- API routes used by the frontend (same paths as the Flask proxy) ---
+
+async def api_get_flights(request):
+    return await proxy_get(request, "/flights")
+
+
+async def api_register(request):
+    return await proxy_stream(request, "POST", "/register", body=await request.body())
+
+
+async def api_get_user(request):
+    params = {"name": request.query_params.get("name"), "email": request.query_params.get("email")}
+    return await proxy_get(request, "/user_id", params=params)
+
+
+async def api_book(request):
+    return await proxy_stream(request, "POST", "/book", body=await request.body())
+
+
+async def api_get_bookings(request):
+    return await proxy_get(request, f"/bookings/{request.path_params['user_id']}")
+
+
+async def api_get_bookings_detailed(request):
+    params = {name: request.query_params[name] for name in ("status", "limit", "offset") if name in request.query_params}
+    return await proxy_get(request, f"/bookings/{request.path_params['user_id']}/detailed", params=params)
+
+
+async def api_cancel(request):
+    return await proxy_stream(request, "POST", f"/cancel/{request.path_params['booking_id']}")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    global backend_client
+    backend_client = create_backend_client()
+    try:
+        yield
+    finally:
+        await backend_client.aclose()
+
+
+app = Starlette(
+    routes=[
+        Route("/api/flights", api_get_flights, methods=["GET"]),
+        Route("/api/register", api_register, methods=["POST"]),
+        Route("/api/get_user", api_get_user, methods=["GET"]),
+        Route("/api/book", api_book, methods=["POST"]),
+        Route("/api/bookings/{user_id:int}", api_get_bookings, methods=["GET"]),
+        Route("/api/bookings/{user_id:int}/detailed", api_get_bookings_detailed, methods=["GET"]),
+        Route("/api/cancel/{booking_id:int}", api_cancel, methods=["POST"]),
+        # Index page, static files and /api/health
+        Mount("/", app=WSGIMiddleware(flask_app)),
+    ],
+    # Same policy as flask_cors in app.py: any origin
+    middleware=[Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])],
+    lifespan=lifespan,
+)
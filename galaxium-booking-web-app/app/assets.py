@@ -0,0 +1,138 @@
+"""
+Static asset pipeline for the web app.
+
+At startup every file under ``static/`` is read once, given a content-hashed
+name (``js/app.js`` -> ``js/app.3f2a9c1b7d4e.js``) and compressed ahead of
+time with gzip and, when the ``brotli`` package is installed, brotli. A
+request then only picks the smallest variant the browser accepts; nothing is
+compressed per request. Because a hashed URL changes whenever the file does,
+those responses can be cached by browsers for a year without revalidation.
+
+``RenderedPage`` does the same for the index page: the template is rendered
+and compressed once, and served with an ETag so reloads get a 304.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+from typing import Dict, NamedTuple, Optional
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip variants are built
+    brotli = None
+
+# Files smaller than this are not worth compressing
+COMPRESS_MIN_SIZE = 512
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def compress_variants(body: bytes, content_type: str) -> Dict[str, bytes]:
+    """Return the body per content coding ("identity", "gzip", "br"), keeping only variants that are smaller."""
+    variants = {"identity": body}
+    if len(body) < COMPRESS_MIN_SIZE or not content_type.startswith(COMPRESSIBLE_TYPES):
+        return variants
+    # mtime=0 keeps the gzip output identical between builds
+    compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed["br"] = brotli.compress(body, quality=11)
+    for encoding, data in compressed.items():
+        if len(data) < len(body):
+            variants[encoding] = data
+    return variants
+
+
+def choose_encoding(accept_encoding: Optional[str], available) -> str:
+    """Pick the best content coding from an Accept-Encoding header (br over gzip over identity)."""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    for encoding in ("br", "gzip"):
+        if encoding in available and accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return "identity"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header lists ``etag`` (or is ``*``).
+
+    Entity tags are compared whole and weakly, as If-None-Match requires:
+    a ``W/`` prefix on either side is ignored.
+    """
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in (if_none_match or "").split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
+
+
+class Asset(NamedTuple):
+    path: str
+    hashed_path: str
+    content_type: str
+    etag: str
+    variants: Dict[str, bytes]
+
+
+def hashed_name(path: str, digest: str) -> str:
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest}{ext}"
+
+
+class AssetManifest:
+    """Hashed names and precompressed bodies of every file under ``static_dir``."""
+
+    def __init__(self, static_dir: str):
+        self.static_dir = static_dir
+        self.manifest: Dict[str, str] = {}
+        self._assets: Dict[str, Asset] = {}
+        for dirpath, _, filenames in os.walk(static_dir):
+            for filename in sorted(filenames):
+                full_path = os.path.join(dirpath, filename)
+                path = os.path.relpath(full_path, static_dir).replace(os.sep, "/")
+                with open(full_path, "rb") as f:
+                    self.add(path, f.read())
+
+    def add(self, path: str, body: bytes) -> Asset:
+        digest = hashlib.sha256(body).hexdigest()[:12]
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        asset = Asset(
+            path=path,
+            hashed_path=hashed_name(path, digest),
+            content_type=content_type,
+            etag=f'"{digest}"',
+            variants=compress_variants(body, content_type),
+        )
+        self.manifest[path] = asset.hashed_path
+        self._assets[asset.hashed_path] = asset
+        return asset
+
+    def url(self, path: str) -> str:
+        """Hashed URL for a file under static/; unknown files fall back to their plain /static/ URL."""
+        hashed = self.manifest.get(path)
+        return f"/assets/{hashed}" if hashed else f"/static/{path}"
+
+    def lookup(self, hashed_path: str) -> Optional[Asset]:
+        return self._assets.get(hashed_path)
+
+
+class RenderedPage(NamedTuple):
+    """A page rendered once and precompressed, served with an ETag."""
+
+    etag: str
+    variants: Dict[str, bytes]
+
+    @classmethod
+    def from_html(cls, html: str) -> "RenderedPage":
+        body = html.encode("utf-8")
+        return cls('"' + hashlib.sha256(body).hexdigest()[:16] + '"', compress_variants(body, "text/html"))
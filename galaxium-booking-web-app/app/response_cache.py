@@ -0,0 +1,160 @@
+"""
+Response cache for the proxied GET routes.
+
+Entries are kept in an LRU bounded by ``max_entries`` and expire after the
+TTL of their route. An expired entry that carries a backend ETag is not
+dropped: the next request revalidates it with ``If-None-Match`` and a 304
+from the backend simply renews it. Concurrent misses for the same key are
+coalesced by the caller through ``singleflight``, so only one of them
+reaches the backend.
+
+Each invalidated prefix has a generation that ``invalidate`` increments. A
+fill records the generation of its key before calling the backend and
+passes it to ``store``/``renew``, which drop the result if a write
+invalidated the key meanwhile: a read that started before a booking never
+caches the pre-booking seat counts.
+
+Every entry also gets an ETag for the browser (the backend's, or a hash of
+the body), so clients that send ``If-None-Match`` get a 304 without a body.
+
+Bodies are kept exactly as the backend sent them, compressed or not; see
+``negotiate_body`` for how they are handed to the browser.
+"""
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from assets import brotli, choose_encoding
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    etag: str
+    backend_etag: Optional[str]
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def cache_key(path: str, params: Optional[dict] = None) -> str:
+    if not params:
+        return path
+    query = "&".join(f"{name}={value}" for name, value in sorted(params.items()) if value is not None)
+    return f"{path}?{query}"
+
+
+def negotiate_body(body: bytes, encoding: Optional[str], accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Pass a backend body through in its content coding when the client accepts it, else decode it.
+
+    Returns the body to send and its Content-Encoding (None for identity).
+    Most browsers accept gzip, so the proxy almost never decompresses.
+    """
+    if not encoding or encoding == "identity":
+        return body, None
+    if choose_encoding(accept_encoding, {encoding}) == encoding:
+        return body, encoding
+    if encoding == "gzip":
+        return gzip.decompress(body), None
+    if encoding == "br" and brotli is not None:
+        return brotli.decompress(body), None
+    # Unknown coding: pass it through rather than corrupt it
+    return body, encoding
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        # Prefix -> number of times it was invalidated
+        self._generations: Dict[str, int] = {}
+
+    def generation(self, key: str) -> int:
+        """A token that changes whenever an invalidation covers ``key``."""
+        with self._lock:
+            return self._generation(key)
+
+    def _generation(self, key: str) -> int:
+        # Generations only grow, so their sum changes whenever one of them does
+        return sum(count for prefix, count in self._generations.items() if key.startswith(prefix))
+
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        """Return the entry for ``key`` (fresh or stale) and mark it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(self, key: str, status: int, headers: Dict[str, str], body: bytes, ttl: float,
+              generation: Optional[int] = None) -> CachedResponse:
+        """Cache a backend response; it is returned but not kept if ``key`` was invalidated since ``generation``."""
+        backend_etag = headers.get("etag")
+        entry = CachedResponse(
+            status=status,
+            headers=headers,
+            body=body,
+            etag=backend_etag or make_etag(body),
+            backend_etag=backend_etag,
+            expires_at=time.monotonic() + ttl,
+        )
+        with self._lock:
+            if generation is not None and generation != self._generation(key):
+                return entry
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def renew(self, key: str, entry: CachedResponse, ttl: float, generation: Optional[int] = None) -> CachedResponse:
+        """Extend a stale entry after the backend confirmed it with a 304 (unless invalidated since ``generation``)."""
+        entry = entry._replace(expires_at=time.monotonic() + ttl)
+        with self._lock:
+            if generation is not None and generation != self._generation(key):
+                return entry
+            self._entries[key] = entry
+            self.revalidations += 1
+        return entry
+
+    def invalidate(self, *prefixes: str):
+        """Drop every entry whose key starts with one of ``prefixes``, and fills already running for them."""
+        with self._lock:
+            for prefix in prefixes:
+                self._generations[prefix] = self._generations.get(prefix, 0) + 1
+            for key in [key for key in self._entries if key.startswith(prefixes)]:
+                del self._entries[key]
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+            }
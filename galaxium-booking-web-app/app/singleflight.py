@@ -0,0 +1,100 @@
+"""
+Single-flight execution: concurrent calls with the same key share one execution.
+
+The first caller for a key runs the function; callers that arrive while it is
+still running wait for it and receive the same result (or exception) instead
+of doing the work again. ``SingleFlight`` is for threads (the Flask proxy),
+``AsyncSingleFlight`` for coroutines on one event loop (the ASGI proxy).
+
+booking_system_rest/singleflight.py has a copy of ``SingleFlight`` for the
+backend's read path: keep the two APIs (``do``, ``forget``,
+``forget_prefixes``) and their fixes in step.
+"""
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    if self._calls.get(key) is call:
+                        del self._calls[key]
+                call.done.set()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def forget(self, key):
+        """Let the next caller for ``key`` start a new execution instead of joining the running one.
+
+        Call this after a write, so a read that started before the write is
+        not shared with callers that must see it.
+        """
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def forget_prefixes(self, *prefixes):
+        """``forget`` every key starting with one of ``prefixes``."""
+        with self._lock:
+            for key in [key for key in self._calls if key.startswith(prefixes)]:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self.executions = 0
+        self.shared = 0
+
+    async def do(self, key, fn, *args, **kwargs):
+        future = self._calls.get(key)
+        if future is not None:
+            self.shared += 1
+            # shield: one waiter being cancelled must not cancel the shared call
+            return await asyncio.shield(future)
+        self.executions += 1
+        future = asyncio.ensure_future(fn(*args, **kwargs))
+        self._calls[key] = future
+
+        def release(_):
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+        future.add_done_callback(release)
+        return await asyncio.shield(future)
+
+    def forget(self, key):
+        self._calls.pop(key, None)
+
+    def forget_prefixes(self, *prefixes):
+        for key in [key for key in self._calls if key.startswith(prefixes)]:
+            del self._calls[key]
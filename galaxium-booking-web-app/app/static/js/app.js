@@ -0,0 +1,131 @@
+const backend = { url: document.body.dataset.backendUrl }; // shown for reference
+document.getElementById('backendUrl').textContent = backend.url;
+
+// Helpers
+async function jsonFetch(path, opts = {}) {
+  const res = await fetch(path, Object.assign({headers: {'Accept':'application/json','Content-Type':'application/json'}}, opts));
+  const text = await res.text();
+  try { return { ok: res.ok, status: res.status, body: JSON.parse(text || '{}') }; }
+  catch(e) { return { ok: res.ok, status: res.status, body: text }; }
+}
+
+// Flights
+async function loadFlights() {
+  const el = document.querySelector("#flightsTable tbody");
+  el.innerHTML = '<tr><td colspan="8">Loading…</td></tr>';
+  const r = await jsonFetch('/api/flights');
+  if (!r.ok) {
+    document.getElementById('flightsAlert').innerHTML = `<div class="alert alert-danger">Error loading flights: ${r.status}</div>`;
+    el.innerHTML = '';
+    return;
+  }
+  const arr = Array.isArray(r.body) ? r.body : [];
+  if (arr.length === 0) {
+    el.innerHTML = '<tr><td colspan="8">No flights available</td></tr>';
+    return;
+  }
+  el.innerHTML = arr.map(f => `
+    <tr>
+      <td>${f.flight_id}</td>
+      <td>${f.origin}</td>
+      <td>${f.destination}</td>
+      <td>${f.departure_time}</td>
+      <td>${f.arrival_time}</td>
+      <td>${f.price}</td>
+      <td>${f.seats_available}</td>
+      <td><button class="btn btn-sm btn-outline-primary" onclick="fillBook(${f.flight_id})">Book</button></td>
+    </tr>
+  `).join('');
+}
+
+// Fill quick book form
+function fillBook(flightId) {
+  document.getElementById('bookFlightId').value = flightId;
+  document.getElementById('bookResult').innerHTML = '';
+  window.scrollTo({top:0, behavior:'smooth'});
+}
+
+// Register
+document.getElementById('registerForm').addEventListener('submit', async (ev)=>{
+  ev.preventDefault();
+  const name = document.getElementById('regName').value;
+  const email = document.getElementById('regEmail').value;
+  const r = await jsonFetch('/api/register', { method: 'POST', body: JSON.stringify({name, email}) });
+  const out = document.getElementById('registerResult');
+  if (!r.ok) out.innerHTML = `<div class="alert alert-danger">Error (${r.status}): ${JSON.stringify(r.body)}</div>`;
+  else out.innerHTML = `<div class="alert alert-success">Registered: ID ${r.body.user_id} — ${r.body.name} (${r.body.email})</div>`;
+});
+
+// Quick Book
+document.getElementById('bookForm').addEventListener('submit', async (ev)=>{
+  ev.preventDefault();
+  const user_id = parseInt(document.getElementById('bookUserId').value);
+  const name = document.getElementById('bookName').value;
+  const flight_id = parseInt(document.getElementById('bookFlightId').value);
+  const r = await jsonFetch('/api/book', { method: 'POST', body: JSON.stringify({user_id, name, flight_id}) });
+  const out = document.getElementById('bookResult');
+  if (!r.ok) out.innerHTML = `<div class="alert alert-danger">Failed to book: ${r.status} ${JSON.stringify(r.body)}</div>`;
+  else out.innerHTML = `<div class="alert alert-success">Booked (ID ${r.body.booking_id}) for flight ${r.body.flight_id}</div>`;
+});
+
+// List bookings
+document.getElementById('bookingsForm').addEventListener('submit', async (ev)=>{
+  ev.preventDefault();
+  const id = document.getElementById('bookingsUserId').value;
+  await loadBookings(id);
+});
+document.getElementById('refreshBookings').addEventListener('click', ()=>{}); // handled by form submit
+document.getElementById('clearBookings').addEventListener('click', ()=>{
+  document.getElementById('bookingsUserId').value = '';
+  document.querySelector("#bookingsTable tbody").innerHTML = '';
+  document.getElementById('bookingsAlert').innerHTML = '';
+});
+
+// Load bookings by user id
+async function loadBookings(userId) {
+  if (!userId) {
+    document.getElementById('bookingsAlert').innerHTML = `<div class="alert alert-warning">Please enter a numeric User ID.</div>`;
+    return;
+  }
+  document.getElementById('bookingsAlert').innerHTML = '';
+  const el = document.querySelector("#bookingsTable tbody");
+  el.innerHTML = '<tr><td colspan="5">Loading…</td></tr>';
+  // Bookings already joined with their flights: one call instead of bookings + flights
+  const r = await jsonFetch(`/api/bookings/${userId}/detailed?limit=500`);
+  if (!r.ok) {
+    document.getElementById('bookingsAlert').innerHTML = `<div class="alert alert-danger">Error: ${r.status}</div>`;
+    el.innerHTML = '';
+    return;
+  }
+  const arr = Array.isArray(r.body) ? r.body : [];
+  if (arr.length === 0) { el.innerHTML = '<tr><td colspan="5">No bookings</td></tr>'; return; }
+  el.innerHTML = arr.map(b => `
+    <tr>
+      <td>${b.booking_id}</td>
+      <td>${b.flight_id}: ${b.flight.origin} → ${b.flight.destination}<br><small class="text-muted">${b.flight.departure_time}</small></td>
+      <td class="status-${b.status.toLowerCase()}">${b.status}</td>
+      <td>${b.booking_time}</td>
+      <td><button class="btn btn-sm btn-danger" onclick="cancelBooking(${b.booking_id})">Cancel</button></td>
+    </tr>
+  `).join('');
+}
+
+// Cancel booking
+async function cancelBooking(bookingId) {
+  if (!confirm("Cancel booking " + bookingId + " ?")) return;
+  const r = await jsonFetch('/api/cancel/' + bookingId, { method: 'POST', body: '{}' });
+  if (!r.ok) {
+    alert("Failed to cancel: " + r.status);
+    return;
+  }
+  alert("Canceled booking " + bookingId);
+  // refresh bookings table if a user id is present
+  const uid = document.getElementById('bookingsUserId').value;
+  if (uid) await loadBookings(uid);
+}
+
+// Refresh flights button
+document.getElementById('refreshFlights').addEventListener('click', loadFlights);
+
+// Initial load
+loadFlights();
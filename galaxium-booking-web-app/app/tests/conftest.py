@@ -0,0 +1,101 @@
+import io
+import threading
+import httpx
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+from urllib3 import HTTPResponse
+import app as webapp
+import asgi
+from response_cache import ResponseCache
+from singleflight import AsyncSingleFlight, SingleFlight
+
+FLIGHTS_BODY = b'[{"flight_id": 1, "origin": "Earth", "destination": "Mars"}]'
+
+class FakeBackend:
+    """Stands in for the pooled backend session and records every call."""
+
+    def __init__(self):
+        self.calls = []
+        self.status = 200
+        self.body = FLIGHTS_BODY
+        self.headers = {"Content-Type": "application/json"}
+        self.delay = 0
+        # Called while a request is "in flight", e.g. to interleave a write
+        self.on_request = None
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, params=None, **kwargs):
+        with self._lock:
+            self.calls.append((method, url, dict(headers or {}), params))
+        if self.on_request is not None:
+            self.on_request()
+        if self.delay:
+            threading.Event().wait(self.delay)
+        body = b"" if self.status == 304 else self.body
+        response = requests.Response()
+        response.status_code = self.status
+        response.headers = CaseInsensitiveDict(self.headers)
+        # The proxy streams and reads the undecoded body, like from a pooled connection
+        response.raw = HTTPResponse(
+            body=io.BytesIO(body), headers=self.headers, status=self.status, preload_content=False
+        )
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+class AsyncFakeBackend:
+    """Stands in for the backend behind the async proxy's httpx client and records every call."""
+
+    def __init__(self):
+        self.calls = []
+        self.status = 200
+        self.body = FLIGHTS_BODY
+        self.headers = {"Content-Type": "application/json"}
+        self.error = None
+        self.on_request = None
+
+    def handle(self, request):
+        self.calls.append((request.method, request.url.path, dict(request.headers)))
+        if self.on_request is not None:
+            self.on_request()
+        if self.error is not None:
+            raise self.error
+        return httpx.Response(self.status, headers=self.headers, content=self._stream(self.body))
+
+    async def _stream(self, body):
+        # Sent in small chunks, like a body arriving over the network
+        for start in range(0, len(body), 16):
+            yield body[start:start + 16]
+
+@pytest.fixture
+def backend(monkeypatch):
+    """A fake backend wired into the proxy, with an empty response cache."""
+    fake = FakeBackend()
+    monkeypatch.setattr(webapp, "BACKEND_URL", "http://backend")
+    monkeypatch.setattr(webapp, "backend_session", fake)
+    monkeypatch.setattr(webapp, "response_cache", ResponseCache(max_entries=3))
+    monkeypatch.setattr(webapp, "cache_fills", SingleFlight())
+    monkeypatch.setattr(webapp, "backend_reads", SingleFlight())
+    monkeypatch.setattr(webapp, "index_page", None)
+    monkeypatch.setattr(webapp, "cache_coalescers", [webapp.cache_fills, webapp.backend_reads])
+    return fake
+
+@pytest.fixture
+def client(backend):
+    """A Flask test client for the proxy."""
+    webapp.app.config["TESTING"] = True
+    with webapp.app.test_client() as test_client:
+        yield test_client
+
+@pytest.fixture
+def async_backend(backend, monkeypatch):
+    """A fake backend wired into the async proxy, sharing the Flask proxy's (empty) response cache."""
+    fake = AsyncFakeBackend()
+    monkeypatch.setattr(asgi, "backend_client", httpx.AsyncClient(
+        transport=httpx.MockTransport(fake.handle), base_url="http://backend"))
+    monkeypatch.setattr(asgi, "response_cache", webapp.response_cache)
+    monkeypatch.setattr(asgi, "cache_fills", AsyncSingleFlight())
+    webapp.cache_coalescers.append(asgi.cache_fills)
+    return fake
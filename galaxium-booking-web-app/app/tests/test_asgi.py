@@ -0,0 +1,72 @@
+import asyncio
+import gzip
+import httpx
+import app as webapp
+import asgi
+from tests.conftest import FLIGHTS_BODY
+
+def asgi_request(method, url, **kwargs):
+    """Send one request to the ASGI app (without running its lifespan)."""
+    async def run():
+        transport = httpx.ASGITransport(app=asgi.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.request(method, url, **kwargs)
+    return asyncio.run(run())
+
+class TestAsyncProxy:
+    """Test the async streaming proxy served by uvicorn."""
+
+    def test_uncached_route_streams_backend_body_through(self, async_backend, monkeypatch):
+        monkeypatch.setitem(webapp.CACHE_TTLS, "/flights", 0)
+        async_backend.body = gzip.compress(FLIGHTS_BODY)
+        async_backend.headers["Content-Encoding"] = "gzip"
+        response = asgi_request("GET", "/api/flights", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == FLIGHTS_BODY
+        # The browser's Accept-Encoding is forwarded and the compressed body is not re-encoded
+        assert async_backend.calls[0][2]["accept-encoding"] == "gzip"
+        assert "x-cache" not in response.headers
+
+    def test_cached_route_calls_backend_once(self, async_backend):
+        first = asgi_request("GET", "/api/flights")
+        second = asgi_request("GET", "/api/flights")
+        assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+        assert second.content == FLIGHTS_BODY
+        assert len(async_backend.calls) == 1
+
+    def test_booking_invalidates_cached_flights(self, async_backend):
+        asgi_request("GET", "/api/flights")
+        async_backend.body = b'{"booking_id": 1}'
+        assert asgi_request("POST", "/api/book", json={"user_id": 1, "flight_id": 1}).status_code == 200
+        async_backend.body = FLIGHTS_BODY
+        assert asgi_request("GET", "/api/flights").headers["x-cache"] == "MISS"
+        assert [call[:2] for call in async_backend.calls] == [("GET", "/flights"), ("POST", "/book"), ("GET", "/flights")]
+
+    def test_fill_overtaken_by_a_booking_is_not_cached(self, async_backend):
+        async_backend.on_request = lambda: webapp.invalidate_after("/book")
+        asgi_request("GET", "/api/flights")
+        async_backend.on_request = None
+        assert asgi_request("GET", "/api/flights").headers["x-cache"] == "MISS"
+        assert len(async_backend.calls) == 2
+
+    def test_unreachable_backend_returns_502(self, async_backend):
+        async_backend.error = httpx.ConnectError("connection refused")
+        for method, url in [("GET", "/api/flights"), ("GET", "/api/bookings/1/detailed"), ("POST", "/api/cancel/1")]:
+            response = asgi_request(method, url)
+            assert response.status_code == 502
+            assert response.json()["error"] == "backend_unreachable"
+
+    def test_flask_routes_are_mounted(self, async_backend):
+        health = asgi_request("GET", "/api/health")
+        assert health.status_code == 200
+        assert health.json()["status"] == "ok"
+        index = asgi_request("GET", "/")
+        assert index.status_code == 200
+        assert index.headers["content-type"].startswith("text/html")
+        assert async_backend.calls == []
+
+    def test_backend_pool_uses_configured_size(self, monkeypatch):
+        monkeypatch.setattr(asgi, "BACKEND_POOL_SIZE", 7)
+        pool = asgi.create_backend_client()._transport._pool
+        assert (pool._max_connections, pool._max_keepalive_connections) == (7, 7)
@@ -0,0 +1,107 @@
+import gzip
+import re
+import pytest
+import assets
+import app as webapp
+from assets import AssetManifest, choose_encoding, etag_matches
+
+class TestEncodingNegotiation:
+    """Test picking a precompressed variant from Accept-Encoding."""
+
+    @pytest.mark.parametrize("header, expected", [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br"),
+        ("identity", "identity"),
+        (None, "identity"),
+    ])
+    def test_choose_encoding(self, header, expected):
+        assert choose_encoding(header, {"identity", "gzip", "br"}) == expected
+
+    def test_missing_variant_falls_back(self):
+        assert choose_encoding("br", {"identity", "gzip"}) == "identity"
+
+class TestEtagMatching:
+    """Test comparing If-None-Match entity tags with an ETag."""
+
+    @pytest.mark.parametrize("header, expected", [
+        ('"abc"', True),
+        ('"x", "abc"', True),
+        ('W/"abc"', True),
+        ("*", True),
+        ('"abcd"', False),
+        ('"ab"', False),
+        ("", False),
+        (None, False),
+    ])
+    def test_etag_matches(self, header, expected):
+        assert etag_matches(header, '"abc"') is expected
+
+    def test_weak_etag_matches_strong_tag(self):
+        assert etag_matches('"abc"', 'W/"abc"')
+
+    def test_routes_compare_whole_tags(self, client, backend):
+        etag = client.get("/api/flights").headers["ETag"]
+        assert client.get("/api/flights", headers={"If-None-Match": f'"v2", W/{etag}'}).status_code == 304
+        assert client.get("/api/flights", headers={"If-None-Match": "*"}).status_code == 304
+        assert client.get("/api/flights", headers={"If-None-Match": f'"{etag}"'}).status_code == 200
+
+class TestAssetManifest:
+    """Test hashed names and precompressed variants."""
+
+    def test_hashed_name_changes_with_content(self, tmp_path):
+        (tmp_path / "js").mkdir()
+        (tmp_path / "js" / "app.js").write_text("console.log(1);\n" * 100)
+        first = AssetManifest(str(tmp_path)).url("js/app.js")
+        (tmp_path / "js" / "app.js").write_text("console.log(2);\n" * 100)
+        second = AssetManifest(str(tmp_path)).url("js/app.js")
+        assert re.fullmatch(r"/assets/js/app\.[0-9a-f]{12}\.js", first)
+        assert first != second
+
+    def test_small_files_are_not_compressed(self, tmp_path):
+        (tmp_path / "tiny.css").write_text("a{}")
+        manifest = AssetManifest(str(tmp_path))
+        asset = manifest.lookup(manifest.manifest["tiny.css"])
+        assert list(asset.variants) == ["identity"]
+
+    def test_unknown_file_keeps_static_url(self, tmp_path):
+        assert AssetManifest(str(tmp_path)).url("missing.js") == "/static/missing.js"
+
+class TestStaticRoutes:
+    """Test serving the index page and hashed assets."""
+
+    def test_index_links_hashed_assets(self, client):
+        html = client.get("/").data.decode()
+        assert webapp.assets.url("js/app.js") in html
+        assert webapp.assets.url("css/app.css") in html
+
+    def test_hashed_asset_is_immutable_and_compressed(self, client):
+        url = webapp.assets.url("js/app.js")
+        response = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert "immutable" in response.headers["Cache-Control"]
+        plain = client.get(url)
+        assert "Content-Encoding" not in plain.headers
+        assert gzip.decompress(response.data) == plain.data
+
+    @pytest.mark.skipif(assets.brotli is None, reason="brotli not installed")
+    def test_brotli_is_preferred(self, client):
+        response = client.get(webapp.assets.url("js/app.js"), headers={"Accept-Encoding": "gzip, br"})
+        assert response.headers["Content-Encoding"] == "br"
+        assert assets.brotli.decompress(response.data) == client.get(webapp.assets.url("js/app.js")).data
+
+    def test_unknown_hashed_asset_is_404(self, client):
+        assert client.get("/assets/js/app.000000000000.js").status_code == 404
+
+    def test_index_is_rendered_once_and_revalidated(self, client, monkeypatch):
+        renders = []
+        render = webapp.render_template
+        monkeypatch.setattr(webapp, "render_template", lambda *a, **kw: renders.append(1) or render(*a, **kw))
+        first = client.get("/")
+        second = client.get("/", headers={"If-None-Match": first.headers["ETag"]})
+        assert first.headers["Cache-Control"] == "no-cache"
+        assert second.status_code == 304
+        assert len(renders) == 1
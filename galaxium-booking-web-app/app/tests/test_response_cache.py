@@ -0,0 +1,142 @@
+import gzip
+from concurrent.futures import ThreadPoolExecutor
+import app as webapp
+from tests.conftest import FLIGHTS_BODY
+
+class TestResponseCache:
+    """Test caching of proxied GET routes."""
+
+    def test_second_request_is_served_from_cache(self, client, backend):
+        first = client.get("/api/flights")
+        second = client.get("/api/flights")
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.data == first.data
+        assert len(backend.calls) == 1
+
+    def test_query_parameters_are_part_of_the_key(self, client, backend):
+        client.get("/api/get_user?name=Alice&email=alice@example.com")
+        client.get("/api/get_user?name=Bob&email=bob@example.com")
+        client.get("/api/get_user?name=Alice&email=alice@example.com")
+        assert len(backend.calls) == 2
+
+    def test_expired_entry_is_revalidated_with_backend_etag(self, client, backend, monkeypatch):
+        monkeypatch.setitem(webapp.CACHE_TTLS, "/flights", 0.0001)
+        backend.headers["ETag"] = '"v1"'
+        client.get("/api/flights")
+        backend.status = 304
+        response = client.get("/api/flights")
+        assert response.status_code == 200
+        assert response.data == backend.body
+        assert backend.calls[-1][2]["If-None-Match"] == '"v1"'
+        assert webapp.response_cache.stats()["revalidations"] == 1
+
+    def test_client_etag_gets_not_modified(self, client, backend):
+        etag = client.get("/api/flights").headers["ETag"]
+        response = client.get("/api/flights", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_errors_are_not_cached(self, client, backend):
+        backend.status = 500
+        client.get("/api/flights")
+        client.get("/api/flights")
+        assert len(backend.calls) == 2
+
+    def test_booking_invalidates_flights_and_bookings(self, client, backend):
+        client.get("/api/flights")
+        client.get("/api/bookings/1")
+        client.post("/api/book", json={"user_id": 1, "name": "Alice", "flight_id": 1})
+        client.get("/api/flights")
+        client.get("/api/bookings/1")
+        assert [call[1] for call in backend.calls] == [
+            "http://backend/flights", "http://backend/bookings/1", "http://backend/book",
+            "http://backend/flights", "http://backend/bookings/1",
+        ]
+
+    def test_fill_overtaken_by_a_booking_is_not_cached(self, client, backend):
+        # The booking lands while the flight list is being fetched
+        backend.on_request = lambda: webapp.invalidate_after("/book")
+        assert client.get("/api/flights").headers["X-Cache"] == "MISS"
+        backend.on_request = None
+        assert client.get("/api/flights").headers["X-Cache"] == "MISS"
+        assert client.get("/api/flights").headers["X-Cache"] == "HIT"
+        assert len(backend.calls) == 2
+
+    def test_revalidation_overtaken_by_a_booking_is_not_renewed(self, client, backend, monkeypatch):
+        monkeypatch.setitem(webapp.CACHE_TTLS, "/flights", 0.0001)
+        backend.headers["ETag"] = '"v1"'
+        client.get("/api/flights")
+        backend.status = 304
+        backend.on_request = lambda: webapp.invalidate_after("/cancel/1")
+        client.get("/api/flights")
+        assert webapp.response_cache.lookup("/flights") is None
+
+    def test_lru_eviction(self, client, backend):
+        for user_id in range(1, 5):
+            client.get(f"/api/bookings/{user_id}")
+        stats = webapp.response_cache.stats()
+        assert stats["entries"] == 3
+        assert stats["evictions"] == 1
+
+    def test_concurrent_misses_share_one_backend_call(self, client, backend):
+        backend.delay = 0.2
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(lambda _: webapp.app.test_client().get("/api/flights"), range(8)))
+        assert all(response.status_code == 200 for response in responses)
+        assert len(backend.calls) == 1
+
+    def test_uncached_routes_still_coalesce(self, client, backend, monkeypatch):
+        monkeypatch.setitem(webapp.CACHE_TTLS, "/flights", 0)
+        backend.delay = 0.2
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(lambda _: webapp.app.test_client().get("/api/flights"), range(8)))
+        assert all(response.data == backend.body for response in responses)
+        assert len(backend.calls) == 1
+        client.get("/api/flights")
+        assert len(backend.calls) == 2
+
+    def test_health_reports_counters(self, client, backend):
+        client.get("/api/flights")
+        client.get("/api/flights")
+        cache = client.get("/api/health").get_json()["cache"]
+        assert cache["hits"] == 1
+        assert cache["misses"] == 1
+
+    def test_detailed_bookings_forward_query_and_are_invalidated(self, client, backend):
+        client.get("/api/bookings/1/detailed?status=booked&limit=10")
+        client.get("/api/bookings/1/detailed?status=booked&limit=10")
+        client.post("/api/cancel/1")
+        client.get("/api/bookings/1/detailed?status=booked&limit=10")
+        urls = [call[1] for call in backend.calls]
+        assert urls == ["http://backend/bookings/1/detailed", "http://backend/cancel/1", "http://backend/bookings/1/detailed"]
+        assert backend.calls[0][3] == {"status": "booked", "limit": "10"}
+
+class TestCompressionPassthrough:
+    """Test that compressed backend bodies reach the browser without recompression."""
+
+    def test_gzip_body_is_passed_through(self, client, backend):
+        backend.body = gzip.compress(FLIGHTS_BODY)
+        backend.headers["Content-Encoding"] = "gzip"
+        response = client.get("/api/flights", headers={"Accept-Encoding": "gzip, br"})
+        assert backend.calls[0][2]["Accept-Encoding"] == "gzip"
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.data == backend.body
+
+    def test_body_is_decoded_for_clients_without_gzip(self, client, backend):
+        backend.body = gzip.compress(FLIGHTS_BODY)
+        backend.headers["Content-Encoding"] = "gzip"
+        client.get("/api/flights", headers={"Accept-Encoding": "gzip"})
+        response = client.get("/api/flights", headers={"Accept-Encoding": "identity"})
+        assert response.headers["X-Cache"] == "HIT"
+        assert "Content-Encoding" not in response.headers
+        assert response.data == FLIGHTS_BODY
+
+    def test_uncached_routes_pass_through(self, client, backend):
+        backend.body = gzip.compress(b'{"booking_id": 1}')
+        backend.headers["Content-Encoding"] = "gzip"
+        response = client.post("/api/book", json={"user_id": 1, "name": "Alice", "flight_id": 1},
+                               headers={"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.data) == b'{"booking_id": 1}'
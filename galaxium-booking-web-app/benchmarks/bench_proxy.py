@@ -0,0 +1,85 @@
+"""
+Benchmark proxied requests/sec through the web app against a local stub backend.
+
+"before" sends every backend call with a bare requests.request (a new TCP
+connection per call, as the proxy used to). "after" uses the shared pooled
+keep-alive session.
+
+The response cache is switched off and every call asks for a different user,
+so no call is answered from the cache or shares another one's backend call:
+both runs send every request to the backend and only the connection
+handling differs.
+
+Usage (from galaxium-booking-web-app/):
+    python benchmarks/bench_proxy.py --requests 2000 --threads 8
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "app"))
+
+import requests  # noqa: E402
+
+from stub_backend import StubBackend  # noqa: E402
+
+
+class UnpooledSession:
+    """Stands in for the old behaviour: one module-level requests.request per call."""
+
+    def request(self, method, url, **kwargs):
+        # requests.request honours stream=True like a session does
+        return requests.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+
+def run(webapp, session, total, threads):
+    webapp.backend_session = session
+    client = webapp.app.test_client()
+
+    def call(i):
+        assert client.get(f"/api/get_user?name=bench&email=user{i}@example.com").status_code == 200
+
+    start = time.perf_counter()
+    # The proxy logs every call to stdout; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(call, range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    backend = StubBackend().start()
+    os.environ["BACKEND_URL"] = backend.url
+    import app as webapp
+    for prefix in webapp.CACHE_TTLS:
+        webapp.CACHE_TTLS[prefix] = 0
+
+    results = {}
+    for label, session in (("before (new connection per call)", UnpooledSession()),
+                           ("after (pooled keep-alive session)", webapp.create_backend_session())):
+        connections = backend.connections
+        rps = run(webapp, session, args.requests, args.threads)
+        results[label] = (rps, backend.connections - connections)
+    backend.stop()
+
+    print(f"Proxy throughput: {args.requests} uncached GET /api/get_user, {args.threads} threads")
+    for label, (rps, connections) in results.items():
+        print(f"  {label:<36} {rps:8.0f} req/s  {connections:>6} backend connections")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Minimal stand-in for the booking backend, used by the proxy benchmarks.
+
+Serves a fixed JSON flight list on every GET with HTTP/1.1 keep-alive, and
+counts requests and accepted TCP connections so a benchmark can report how
+many reached the "backend". With ``compress=True`` it gzips the body for
+clients that accept it, like the backends' GZipMiddleware.
+"""
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def flight_list(count=50):
+    return [
+        {
+            "flight_id": i,
+            "origin": "Earth",
+            "destination": ["Mars", "Moon", "Venus", "Europa"][i % 4],
+            "departure_time": "2099-01-01T09:00:00Z",
+            "arrival_time": "2099-01-01T17:00:00Z",
+            "price": 1000000 + i,
+            "seats_available": 5,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+class StubBackend(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, payload=None, delay=0.0, compress=False):
+        self.body = json.dumps(payload if payload is not None else flight_list()).encode()
+        self.gzip_body = gzip.compress(self.body) if compress else None
+        self.delay = delay
+        self.requests = 0
+        self.connections = 0
+        self._counter_lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+
+    def get_request(self):
+        with self._counter_lock:
+            self.connections += 1
+        return super().get_request()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        with self.server._counter_lock:
+            self.server.requests += 1
+        if self.server.delay:
+            threading.Event().wait(self.server.delay)
+        body = self.server.body
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if self.server.gzip_body and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = self.server.gzip_body
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
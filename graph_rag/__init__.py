@@ -0,0 +1,52 @@
+"""
+Graph RAG over the Galaxium Travels knowledge base.
+
+Markdown files are split into chunks, embedded and stored in a vector store
+(AstraDB or the in-process ``LocalVectorStore``); the links between files
+form a ``LinkGraph`` that expands vector search results to linked
+documents. See ``python -m graph_rag --help`` for the command line.
+
+Importing the package does no work and loads none of its dependencies:
+the names below are imported from their module on first access, so
+``import graph_rag`` stays cheap for the CLI and for callers that only
+need one part (``tests/test_package.py`` holds it to a time budget).
+"""
+import importlib
+from typing import Any, Dict, List
+
+# Public name -> module that defines it
+_EXPORTS: Dict[str, str] = {
+    "SimpleEmbeddings": "embeddings",
+    "get_embedding_model": "embeddings",
+    "CachedEmbeddings": "embedding_cache",
+    "extract_metadata_from_markdown": "ingestion",
+    "iter_markdown_files": "ingestion",
+    "process_all_markdown_files": "ingestion",
+    "IngestManifest": "manifest",
+    "ChunkStream": "pipeline",
+    "upload_documents": "upload",
+    "LocalVectorStore": "local_store",
+    "open_vector_store": "stores",
+    "LinkGraph": "link_graph",
+    "graph_search": "link_graph",
+    "Retriever": "retrieval",
+    "open_retriever": "retrieval",
+    "run_ingestion": "workflow",
+    "evaluate": "evaluation",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Cache it: later lookups no longer go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,92 @@
+"""
+Measure offline embedding throughput of SimpleEmbeddings.
+
+Three implementations embed the same texts (sentences from the synthetic
+corpus vocabulary, see ``corpus.py``):
+
+- the original one, which reseeded the global NumPy RNG with Python's salted
+  ``hash(text)`` per text. It never looks at the content, so it is a floor
+  for per-call overhead rather than a comparable embedding;
+- the same hashed n-gram features computed per text in a Python loop, and
+  checked to give identical vectors;
+- the vectorized ``SimpleEmbeddings.embed_array``.
+
+Usage (from graph_rag/):
+    python benchmarks/bench_embeddings.py --texts 20000 --batch-size 256
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from graph_rag.benchmarks.corpus import _sentence  # noqa: E402
+from graph_rag.embeddings import FNV_OFFSET, FNV_PRIME, SimpleEmbeddings, _mix  # noqa: E402
+
+
+def legacy_embed_documents(texts):
+    embeddings = []
+    for text in texts:
+        np.random.seed(hash(text) % (2**32))
+        embeddings.append(np.random.rand(384).tolist())
+    return embeddings
+
+
+def loop_embed_array(texts, model=SimpleEmbeddings()):
+    mask = (1 << 64) - 1
+    matrix = np.zeros((len(texts), model.dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        data = text.lower().encode("utf-8")
+        for start in range(len(data)):
+            h = int(FNV_OFFSET)
+            for n in range(1, min(max(model.ngram_sizes), len(data) - start) + 1):
+                h = ((h ^ data[start + n - 1]) * int(FNV_PRIME)) & mask
+                if n in model.ngram_sizes:
+                    mixed = int(_mix(np.array([h], dtype=np.uint64))[0])
+                    matrix[row, ((mixed >> 32) * model.dim) >> 32] += -1.0 if mixed & 1 else 1.0
+        norm = np.linalg.norm(matrix[row])
+        if norm:
+            matrix[row] /= norm
+    return matrix
+
+
+def make_texts(count, sentences=8, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(_sentence(rng) for _ in range(sentences)) for _ in range(count)]
+
+
+def run(name, embed, texts, batch_size):
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        embed(texts[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+    print(f"{name:<26} {elapsed:>8.2f} {len(texts) / elapsed:>10.0f}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--sentences", type=int, default=8, help="sentences per text (~100 chars each)")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--loop-texts", type=int, default=50, help="texts for the slow Python loop")
+    args = parser.parse_args()
+
+    texts = make_texts(args.texts, args.sentences)
+    model = SimpleEmbeddings()
+    print(f"{args.texts} texts of ~{sum(map(len, texts)) // len(texts)} chars, batches of {args.batch_size}")
+    print(f"{'implementation':<26} {'seconds':>8} {'texts/s':>10}")
+    run("original (per-text RNG)", legacy_embed_documents, texts, args.batch_size)
+    loop = run("n-grams, Python loop", loop_embed_array, texts[:args.loop_texts], args.batch_size)
+    vectorized = run("n-grams, embed_array", model.embed_array, texts, args.batch_size)
+    run("n-grams, embed_documents", model.embed_documents, texts, args.batch_size)
+    assert np.allclose(loop_embed_array(texts[:20]), model.embed_array(texts[:20]), atol=1e-6)
+    loop_rate = args.loop_texts / loop
+    print(f"vectorized vs Python loop: {args.texts / vectorized / loop_rate:.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Measure markdown ingestion throughput by worker count.
+
+Generates a synthetic corpus (see ``corpus.py``) and runs
+``process_all_markdown_files`` on it with 1, 2, 4, ... worker processes,
+reporting files/s and checking that every run returns the same documents in
+the same order as the serial run.
+
+Usage (from graph_rag/):
+    python benchmarks/bench_ingestion.py --files 5000
+    python benchmarks/bench_ingestion.py --files 5000 --workers 1 4 8 --chunksize 16
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from graph_rag.benchmarks.corpus import generate_corpus  # noqa: E402
+from graph_rag.ingestion import process_all_markdown_files  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--links", type=int, default=20, help="links per file")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--chunksize", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        generate_corpus(root, files=args.files, links_per_file=args.links)
+        print(f"{args.files} files, {args.links} links each, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8} {'seconds':>8} {'files/s':>9} {'speedup':>8}")
+        baseline_docs = baseline_time = None
+        for workers in sorted(set(args.workers)):
+            start = time.perf_counter()
+            documents = process_all_markdown_files(root, workers=workers, chunksize=args.chunksize, verbose=False)
+            elapsed = time.perf_counter() - start
+            if baseline_docs is None:
+                baseline_docs, baseline_time = documents, elapsed
+            assert documents == baseline_docs, f"{workers} workers returned different documents"
+            print(f"{workers:>8} {elapsed:>8.2f} {len(documents) / elapsed:>9.0f} {baseline_time / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
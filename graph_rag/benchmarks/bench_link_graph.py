@@ -0,0 +1,88 @@
+"""
+Measure graph-expanded retrieval latency against hop depth.
+
+Builds a synthetic link graph (each document links to ``--links`` others,
+targets drawn with a power law so a few hub documents collect most links,
+like index pages in a real knowledge base) and a LocalVectorStore with
+``--chunks`` random chunks per document. For every hop depth it reports the
+latency of the graph expansion alone and of the whole ``graph_search``
+(vector search + expansion + ranking), and how many documents were reached.
+
+Usage (from graph_rag/):
+    python benchmarks/bench_link_graph.py --docs 100000 --links 8
+    python benchmarks/bench_link_graph.py --docs 20000 --hops 0 1 2 3 4 --pagerank-weight 0.2
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from graph_rag.embeddings import SimpleEmbeddings  # noqa: E402
+from graph_rag.link_graph import LinkGraph, rank_graph_hits  # noqa: E402
+from graph_rag.local_store import LocalVectorStore  # noqa: E402
+
+
+def synthetic_graph(docs, links, seed=0):
+    rng = np.random.default_rng(seed)
+    sources = np.repeat(np.arange(docs), links)
+    targets = np.minimum(rng.zipf(1.5, size=len(sources)) - 1, docs - 1)
+    # Shuffle node ids so hubs are spread over the id range
+    targets = rng.permutation(docs)[targets]
+    return LinkGraph([f"doc_{i}.md" for i in range(docs)], sources, targets)
+
+
+def percentiles(samples):
+    return tuple(np.percentile(samples, [50, 99]) * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=50000)
+    parser.add_argument("--links", type=int, default=8, help="links per document")
+    parser.add_argument("--chunks", type=int, default=2, help="chunks per document")
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--hops", type=int, nargs="+", default=[0, 1, 2, 3])
+    parser.add_argument("--decay", type=float, default=0.5)
+    parser.add_argument("--pagerank-weight", type=float, default=0.0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = synthetic_graph(args.docs, args.links)
+    print(f"{args.docs} documents, {graph.edge_count} links: graph and PageRank built in "
+          f"{time.perf_counter() - start:.2f}s")
+
+    rng = np.random.default_rng(1)
+    rows = args.docs * args.chunks
+    store = LocalVectorStore(SimpleEmbeddings())
+    store.add_vectors(rng.normal(size=(rows, args.dim)).astype(np.float32), [""] * rows,
+                      [{"doc_id": graph.node_ids[i % args.docs]} for i in range(rows)])
+    queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+
+    print(f"{'hops':>4} {'reached':>9} {'expand p50':>11} {'p99 ms':>7} {'search p50':>11} {'p99 ms':>7}")
+    for hops in args.hops:
+        expand_times, search_times, reached = [], [], []
+        for query in queries:
+            start = time.perf_counter()
+            chunk_hits = store.similarity_search_with_score_by_vector(query, k=2 * args.k)
+            rank_graph_hits(graph, chunk_hits, args.k, hops, args.decay, args.pagerank_weight)
+            search_times.append(time.perf_counter() - start)
+
+            seeds = {graph.index[doc.metadata["doc_id"]]: max(score, 0.0) for doc, score in chunk_hits}
+            start = time.perf_counter()
+            nodes, _, _ = graph.expand_arrays(seeds, hops, args.decay)
+            expand_times.append(time.perf_counter() - start)
+            reached.append(len(nodes))
+        expand_p50, expand_p99 = percentiles(expand_times)
+        search_p50, search_p99 = percentiles(search_times)
+        print(f"{hops:>4} {np.mean(reached):>9.0f} {expand_p50:>11.2f} {expand_p99:>7.2f} "
+              f"{search_p50:>11.2f} {search_p99:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Micro-benchmark of link extraction on link-heavy documents.
+
+Writes ``--targets`` small markdown files and ``--docs`` documents with
+``--links`` links each (``../``, ``./`` and bare relative forms, anchors,
+and a share of links to missing files), then extracts the links of every
+document with:
+
+- the previous implementation, which resolved each link and the root
+  directory on the filesystem through ``get_relative_path_from_root``;
+- ``extract_links`` with a ``CorpusIndex`` built once, which normalises
+  links lexically and reports dangling ones.
+
+Both must agree on every link that points into the corpus.
+
+Usage (from graph_rag/):
+    python benchmarks/bench_link_resolution.py --docs 20 --links 5000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from graph_rag.ingestion import LINK_PATTERN, CorpusIndex, extract_links, get_relative_path_from_root  # noqa: E402
+
+CATEGORIES = ["01_corporate", "02_customer_service", "03_hr", "04_marketing"]
+
+
+def legacy_extract_links(content, file_path, root_dir):
+    links = []
+    for match in LINK_PATTERN.finditer(content):
+        link_path = match.group(2)
+        if '#' in link_path:
+            link_path = link_path.split('#')[0]
+        if not link_path.endswith('.md'):
+            continue
+        if link_path.startswith('../'):
+            full_path = Path(file_path).parent / link_path
+            links.append(get_relative_path_from_root(str(full_path.resolve()), root_dir))
+        elif link_path.startswith('./'):
+            full_path = Path(file_path).parent / link_path[2:]
+            links.append(get_relative_path_from_root(str(full_path.resolve()), root_dir))
+        elif os.path.isabs(link_path):
+            links.append(get_relative_path_from_root(link_path, root_dir))
+        else:
+            links.append(link_path)
+    return links
+
+
+def write_corpus(root, targets, docs, links, dangling, seed=0):
+    rng = random.Random(seed)
+    target_paths = []
+    for i in range(targets):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        os.makedirs(os.path.join(root, category), exist_ok=True)
+        target_paths.append((category, f"target_{i:05d}.md"))
+        with open(os.path.join(root, category, f"target_{i:05d}.md"), "w", encoding="utf-8") as f:
+            f.write(f"# Target {i}\n")
+    doc_paths = []
+    for d in range(docs):
+        category = CATEGORIES[d % len(CATEGORIES)]
+        lines = [f"# Link-heavy document {d}"]
+        for _ in range(links):
+            target_category, name = rng.choice(target_paths)
+            if rng.random() < dangling:
+                name = "missing_" + name
+            if target_category == category:
+                link = rng.choice([f"./{name}", f"{name}", f"../{category}/{name}"])
+            else:
+                link = f"../{target_category}/{name}"
+            lines.append(f"- [{name}]({link}#section-{rng.randint(1, 9)})")
+        path = os.path.join(root, category, f"heavy_{d:03d}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        doc_paths.append(path)
+    return doc_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", type=int, default=2000)
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--links", type=int, default=5000, help="links per document")
+    parser.add_argument("--dangling", type=float, default=0.05, help="share of links to missing files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        docs = write_corpus(root, args.targets, args.docs, args.links, args.dangling)
+        contents = [open(path, encoding="utf-8").read() for path in docs]
+        total = args.docs * args.links
+        print(f"{args.docs} documents x {args.links} links, {args.targets + args.docs} files in the corpus")
+        print(f"{'implementation':<26} {'seconds':>8} {'links/s':>10}")
+
+        start = time.perf_counter()
+        legacy = [legacy_extract_links(content, path, root) for content, path in zip(contents, docs)]
+        legacy_seconds = time.perf_counter() - start
+        print(f"{'per-link filesystem':<26} {legacy_seconds:>8.2f} {total / legacy_seconds:>10.0f}")
+
+        start = time.perf_counter()
+        index = CorpusIndex(root)
+        build_seconds = time.perf_counter() - start
+        results = [extract_links(content, index.doc_id(path), index) for content, path in zip(contents, docs)]
+        seconds = time.perf_counter() - start
+        print(f"{'corpus index (incl. build)':<26} {seconds:>8.2f} {total / seconds:>10.0f}")
+        print(f"(index of {len(index)} paths built in {build_seconds * 1000:.1f} ms; "
+              f"speedup {legacy_seconds / seconds:.0f}x)")
+
+        dangling = sum(len(missing) for _, missing in results)
+        for old, (links, _) in zip(legacy, results):
+            # Bare links used to be kept as written (so "name.md" never matched a doc_id)
+            # and are now resolved from the document's directory: every link the old
+            # code resolved into the corpus must still be found, at least as often
+            assert not Counter(link for link in old if link in index) - Counter(links), "resolved links differ"
+        print(f"{total - dangling} links resolved, {dangling} dangling reported")
+
+
+if __name__ == "__main__":
+    main()
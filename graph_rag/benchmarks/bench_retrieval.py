@@ -0,0 +1,100 @@
+"""
+Retrieval quality and latency harness.
+
+Runs ingestion and retrieval offline (``evaluation.evaluate``: local
+hashed n-gram embeddings, ``LocalVectorStore``, link graph) on either
+
+- the checked-in corpus with the labeled queries of ``queries.json``, or
+- a synthetic corpus (``--synthetic FILES``, see ``corpus.py``) whose
+  queries are word runs taken from random files,
+
+and reports recall@k, MRR, ingestion throughput and query p50/p99 as JSON.
+Settings default to config.py; pass another chunk size, embedding
+dimension or graph setting and compare the report with an earlier one
+through ``--baseline``.
+
+Usage (from graph_rag/):
+    python benchmarks/bench_retrieval.py --output baseline.json
+    python benchmarks/bench_retrieval.py --chunk-size 500 --baseline baseline.json
+    python benchmarks/bench_retrieval.py --synthetic 2000 --queries-count 200 --hops 0
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from graph_rag.benchmarks.corpus import generate_corpus, generate_queries  # noqa: E402
+from graph_rag.config import (CHUNK_OVERLAP, CHUNK_SIZE, DATA_DIRECTORY, EMBEDDING_DIMENSIONS, GRAPH_DECAY,  # noqa: E402
+                    GRAPH_HOPS, LOCAL_STORE_INDEX, PAGERANK_WEIGHT)
+from graph_rag.evaluation import compare_reports, evaluate, load_queries  # noqa: E402
+
+QUERIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "queries.json")
+
+
+def print_report(report):
+    print(f"{report['corpus']['files']} files, {report['corpus']['chunks']} chunks, "
+          f"{report['corpus']['queries']} queries")
+    print("  " + "  ".join(f"{name}={value:.3f}" for name, value in report["quality"].items()))
+    ingestion, latency = report["ingestion"], report["latency_ms"]
+    print(f"  ingestion {ingestion['seconds']:.2f}s ({ingestion['chunks_per_second']:.0f} chunks/s), "
+          f"query p50 {latency['p50']:.2f} ms, p99 {latency['p99']:.2f} ms")
+
+
+def print_comparison(rows):
+    print(f"\n{'metric':<32} {'baseline':>12} {'this run':>12} {'change':>10}")
+    for row in rows:
+        mark = {True: "better", False: "worse", None: ""}[row["better"]]
+        print(f"{row['metric']:<32} {row['baseline']:>12.4f} {row['value']:>12.4f} {row['change']:>+10.4f} {mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", default=DATA_DIRECTORY)
+    parser.add_argument("--queries", default=QUERIES_PATH, help="labeled queries for --data-dir")
+    parser.add_argument("--synthetic", type=int, metavar="FILES", help="evaluate on a generated corpus instead")
+    parser.add_argument("--queries-count", type=int, default=100, help="queries drawn from the synthetic corpus")
+    parser.add_argument("--query-words", type=int, default=16, help="words per synthetic query")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--chunk-overlap", type=int, default=CHUNK_OVERLAP)
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIMENSIONS, help="embedding dimension")
+    parser.add_argument("--index", choices=["exact", "ivf"], default=LOCAL_STORE_INDEX)
+    parser.add_argument("--hops", type=int, default=GRAPH_HOPS)
+    parser.add_argument("--decay", type=float, default=GRAPH_DECAY)
+    parser.add_argument("--pagerank-weight", type=float, default=PAGERANK_WEIGHT)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--output", help="write the JSON report here (default: print it)")
+    parser.add_argument("--baseline", help="earlier JSON report to compare with")
+    args = parser.parse_args()
+
+    settings = dict(k_values=args.k, chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap,
+                    embedding_dim=args.dim, index=args.index, hops=args.hops, decay=args.decay,
+                    pagerank_weight=args.pagerank_weight)
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as root:
+            paths = generate_corpus(root, files=args.synthetic)
+            queries = generate_queries(root, paths, count=args.queries_count, words=args.query_words)
+            report = evaluate(root, queries, **settings)
+        report["config"]["data_dir"] = f"synthetic:{args.synthetic}"
+    else:
+        report = evaluate(args.data_dir, load_queries(args.queries), **settings)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config", {}).get("data_dir") != report["config"]["data_dir"]:
+            print("⚠️  The baseline was measured on another corpus")
+        print_comparison(compare_reports(baseline, report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Measure peak memory of ingestion: building lists versus streaming.
+
+Generates a synthetic corpus of about ``--size-mb`` megabytes (see
+``corpus.py``; kept in ``--corpus`` between runs if given) and ingests it
+twice, each time in a fresh process so peak RSS is measured separately:
+
+- list: every file read into a list, converted to LangChain documents,
+  split into a list of chunks and then uploaded (the pipeline before
+  streaming, holding about three copies of the corpus);
+- stream: ``ChunkStream`` feeding ``upload_documents`` with bounded queues.
+
+Both embed with SimpleEmbeddings and upload into a store that only counts
+the chunks, so the numbers are those of the pipeline itself.
+
+Usage (from graph_rag/):
+    python benchmarks/bench_streaming_memory.py --size-mb 1024 --corpus /tmp/corpus_1g
+    python benchmarks/bench_streaming_memory.py --size-mb 100
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from graph_rag.benchmarks.corpus import generate_corpus  # noqa: E402
+
+PARAGRAPHS = 100
+
+
+class CountingStore:
+    """Stands in for a vector store: keeps nothing but a count."""
+
+    def __init__(self):
+        self.chunks = 0
+
+    def add_vectors(self, vectors, texts, metadatas=None, ids=None):
+        self.chunks += len(texts)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def ingest(mode: str, corpus: str, batch_size: int) -> dict:
+    from langchain_core.documents import Document
+
+    from graph_rag.embeddings import SimpleEmbeddings
+    from graph_rag.ingestion import iter_markdown_files, process_all_markdown_files
+    from graph_rag.manifest import IngestManifest
+    from graph_rag.pipeline import ChunkStream, chunk_metadata, make_splitter
+    from graph_rag.upload import upload_documents
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    store, splitter = CountingStore(), make_splitter()
+    builder = IngestManifest(os.devnull).plan_builder("bench", 1000, 200)
+    if mode == "list":
+        documents = process_all_markdown_files(corpus, verbose=False)
+        langchain_docs = [Document(page_content=doc["content"], metadata=chunk_metadata(doc)) for doc in documents]
+        chunks = splitter.split_documents(langchain_docs)
+    else:
+        chunks = ChunkStream(iter_markdown_files(corpus, verbose=False), builder, splitter)
+    upload_documents(store, chunks, SimpleEmbeddings(), batch_size=batch_size, progress=None)
+    return {"mode": mode, "chunks": store.chunks, "seconds": time.perf_counter() - start,
+            "baseline_mb": baseline, "peak_mb": peak_rss_mb()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--corpus", help="directory to keep the corpus in (generated if missing)")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--modes", nargs="+", default=["stream", "list"], choices=["stream", "list"])
+    parser.add_argument("--run", choices=["stream", "list"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(ingest(args.run, args.corpus, args.batch_size)))
+        return
+
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus = args.corpus or os.path.join(scratch, "corpus")
+        if not os.path.isdir(corpus):
+            # Size one file first to know how many make up the corpus
+            sample = generate_corpus(os.path.join(scratch, "sample"), files=20, paragraphs=PARAGRAPHS)
+            file_size = sum(os.path.getsize(path) for path in sample) / len(sample)
+            files = max(1, int(args.size_mb * 1024 * 1024 / file_size))
+            print(f"Generating {files} files of ~{file_size / 1024:.0f} KB in {corpus}...")
+            generate_corpus(corpus, files=files, paragraphs=PARAGRAPHS)
+        size = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(corpus) for f in fs)
+        print(f"Corpus: {size / 1024 / 1024:.0f} MB")
+        print(f"{'mode':<8} {'chunks':>9} {'seconds':>8} {'MB/s':>6} {'peak RSS MB':>12} {'above baseline':>15}")
+        for mode in args.modes:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run", mode, "--corpus", corpus,
+                 "--batch-size", str(args.batch_size)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            rate = size / 1024 / 1024 / result["seconds"]
+            print(f"{mode:<8} {result['chunks']:>9} {result['seconds']:>8.1f} {rate:>6.1f} "
+                  f"{result['peak_mb']:>12.0f} {result['peak_mb'] - result['baseline_mb']:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Compare exact and IVF search in LocalVectorStore: recall@k and latency.
+
+Vectors are drawn around random cluster centres (real embeddings are
+clustered by topic, uniform random vectors would make any IVF index look
+bad) and queries are perturbed copies of stored rows. Exact search is the
+ground truth; for each n_probe the IVF index reports recall@k against it,
+single-query latency percentiles and batched throughput.
+
+Usage (from graph_rag/):
+    python benchmarks/bench_vector_store.py --rows 100000 --dim 384
+    python benchmarks/bench_vector_store.py --rows 200000 --lists 1024 --probes 4 16 64
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from graph_rag.embeddings import SimpleEmbeddings  # noqa: E402
+from graph_rag.local_store import LocalVectorStore  # noqa: E402
+
+
+def clustered_vectors(rows, dim, clusters, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim)).astype(np.float32)
+    noise = rng.normal(scale=0.6, size=(rows, dim)).astype(np.float32)
+    return centres[rng.integers(clusters, size=rows)] + noise
+
+
+def measure(store, queries, k, batch_size, **kwargs):
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        results.extend(store.search_vectors(query, k, **kwargs))
+        latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    for i in range(0, len(queries), batch_size):
+        store.search_vectors(queries[i:i + batch_size], k, **kwargs)
+    qps = len(queries) / (time.perf_counter() - start)
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    return results, p50, p99, qps
+
+
+def recall(results, truth, k):
+    return np.mean([len({r for r, _ in a} & {r for r, _ in t}) / k for a, t in zip(results, truth)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default: about 4 * sqrt(rows))")
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    vectors = clustered_vectors(args.rows, args.dim, args.clusters)
+    rng = np.random.default_rng(1)
+    picks = rng.choice(args.rows, size=args.queries, replace=False)
+    queries = vectors[picks] + rng.normal(scale=0.3, size=(args.queries, args.dim)).astype(np.float32)
+
+    store = LocalVectorStore(SimpleEmbeddings())
+    store.add_vectors(vectors, [""] * args.rows)
+    print(f"{args.rows} vectors x {args.dim} dims, {args.queries} queries, k={args.k}")
+    print(f"{'mode':<14} {'recall@k':>9} {'p50 ms':>8} {'p99 ms':>8} {'batch q/s':>10}")
+    truth, p50, p99, qps = measure(store, queries, args.k, args.batch_size)
+    print(f"{'exact':<14} {1.0:>9.3f} {p50:>8.2f} {p99:>8.2f} {qps:>10.0f}")
+
+    start = time.perf_counter()
+    store.build_index(args.lists)
+    print(f"(IVF index with {store.n_lists} lists built in {time.perf_counter() - start:.2f}s)")
+    for n_probe in args.probes:
+        results, p50, p99, qps = measure(store, queries, args.k, args.batch_size, n_probe=n_probe)
+        print(f"{f'ivf probe={n_probe}':<14} {recall(results, truth, args.k):>9.3f} {p50:>8.2f} {p99:>8.2f} {qps:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
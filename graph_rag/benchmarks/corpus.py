@@ -0,0 +1,78 @@
+"""
+Synthetic markdown corpus for the graph_rag benchmarks.
+
+Generates a knowledge base shaped like ``97_raw_markdown_files``: numbered
+category directories, one ``# Title`` per file, prose paragraphs and
+relative ``../category/file.md#anchor`` links between documents. Output is
+fully determined by the seed, so runs are comparable.
+"""
+import os
+import random
+from typing import List
+
+WORDS = (
+    "orbit launch crew cabin passenger mission safety lunar mars venus jupiter europa titan "
+    "station dock module thruster fuel reactor shield gravity oxygen habitat suit training "
+    "certification booking fare cabin luxury cuisine window sunrise telescope rover landing "
+    "spaceport runway weather medical insurance refund partner contract budget revenue audit "
+    "network server backup incident response protocol checklist maintenance inspection"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.choices(WORDS, k=rng.randint(8, 18))
+    return " ".join(words).capitalize() + "."
+
+
+def generate_corpus(
+    root: str,
+    files: int = 1000,
+    categories: int = 8,
+    paragraphs: int = 12,
+    links_per_file: int = 8,
+    seed: int = 0,
+) -> List[str]:
+    """Write ``files`` markdown documents under ``root``; returns their paths."""
+    rng = random.Random(seed)
+    names = [(f"{i % categories + 1:02d}_category", f"doc_{i:06d}.md") for i in range(files)]
+    paths = []
+    for i, (category, name) in enumerate(names):
+        lines = [f"# Document {i}: {' '.join(rng.sample(WORDS, 3))}", ""]
+        for p in range(paragraphs):
+            lines.append(f"## Section {p + 1}")
+            lines.append(" ".join(_sentence(rng) for _ in range(rng.randint(3, 6))))
+            lines.append("")
+        lines.append("## Related Documents")
+        for target in rng.sample(range(files), min(links_per_file, files)):
+            target_category, target_name = names[target]
+            lines.append(f"- [Document {target}](../{target_category}/{target_name}#section-1)")
+        lines.append("- [Galaxium Travels](https://example.com/galaxium)")
+        os.makedirs(os.path.join(root, category), exist_ok=True)
+        path = os.path.join(root, category, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        paths.append(path)
+    return paths
+
+
+def generate_queries(root: str, paths: List[str], count: int = 100, words: int = 16, seed: int = 0) -> List[dict]:
+    """Labeled queries for a generated corpus: a run of ``words`` words from a random section of a random file.
+
+    Each query's only relevant document is the file it was taken from
+    (its doc_id, relative to ``root``). The corpus shares a small
+    vocabulary, so shorter runs are harder to place: with the hashed
+    n-gram embeddings 8 words find the file in the top 10 about a third
+    of the time, 32 words almost always.
+    """
+    rng = random.Random(seed)
+    queries = []
+    for path in rng.sample(paths, min(count, len(paths))):
+        with open(path, "r", encoding="utf-8") as f:
+            paragraphs = [line for line in f.read().splitlines() if line and not line.startswith(("#", "-"))]
+        tokens = rng.choice(paragraphs).split()
+        start = rng.randint(0, max(0, len(tokens) - words))
+        queries.append({
+            "query": " ".join(tokens[start:start + words]),
+            "relevant": [os.path.relpath(path, root)],
+        })
+    return queries
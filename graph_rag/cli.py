@@ -0,0 +1,96 @@
+"""
+Command line of the Graph RAG system (``python -m graph_rag``).
+
+    python -m graph_rag ingest [--backend local]     stream, embed and store the corpus
+    python -m graph_rag search "refund policy" -k 3  graph-expanded search
+    python -m graph_rag serve --port 8090            run the retrieval service
+    python -m graph_rag config                       settings and environment check
+
+Only argparse and the settings are loaded up front; each command imports
+what it needs when it runs, so ``--help`` and typos answer immediately.
+"""
+import argparse
+import json
+from typing import List, Optional
+
+from .config import COLLECTION_NAME, DATA_DIRECTORY, GRAPH_HOPS, VECTOR_STORE_BACKEND, VECTOR_STORE_BACKENDS
+
+def ingest(args: argparse.Namespace) -> int:
+    from dotenv import load_dotenv
+    from .workflow import run_ingestion
+
+    load_dotenv()
+    run = run_ingestion(args.data_dir, args.backend, args.collection)
+    return 0 if run.vector_store is not None else 1
+
+
+def search(args: argparse.Namespace) -> int:
+    from .retrieval import open_retriever
+
+    retriever = open_retriever(args.backend)
+    try:
+        result = retriever.search(args.query, k=args.k, hops=args.hops)
+    finally:
+        retriever.close()
+    if args.json:
+        print(json.dumps({
+            "query": result.query,
+            "results": [{"doc_id": hit.doc_id, "score": hit.score, "hops": hit.hops,
+                         "chunks": [document.id for document, _ in hit.chunks]} for hit in result.hits],
+            "timings": result.timings,
+        }, indent=2))
+        return 0
+    print(f"\n🔎 {result.query}")
+    for hit in result.hits:
+        via = f"{len(hit.chunks)} matching chunk(s)" if hit.hops == 0 else f"{hit.hops} link(s) away"
+        print(f"  {hit.score:.3f}  {hit.doc_id}  ({via})")
+    print("  " + ", ".join(f"{stage} {milliseconds:.1f} ms" for stage, milliseconds in result.timings.items()))
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    import uvicorn
+
+    uvicorn.run("graph_rag.service:app", host=args.host, port=args.port)
+    return 0
+
+
+def config(args: argparse.Namespace) -> int:
+    from .config import check_environment, get_config_summary
+
+    get_config_summary()
+    return 0 if check_environment() else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m graph_rag", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("ingest", help="stream, embed and store the markdown corpus")
+    command.add_argument("--data-dir", default=DATA_DIRECTORY)
+    command.add_argument("--backend", choices=VECTOR_STORE_BACKENDS, default=VECTOR_STORE_BACKEND)
+    command.add_argument("--collection", default=COLLECTION_NAME)
+    command.set_defaults(handler=ingest)
+
+    command = commands.add_parser("search", help="search the stored corpus")
+    command.add_argument("query")
+    command.add_argument("-k", type=int, default=5, help="documents to return")
+    command.add_argument("--hops", type=int, default=GRAPH_HOPS, help="links to follow from the vector hits")
+    command.add_argument("--backend", choices=VECTOR_STORE_BACKENDS, default=VECTOR_STORE_BACKEND)
+    command.add_argument("--json", action="store_true", help="print the results as JSON")
+    command.set_defaults(handler=search)
+
+    command = commands.add_parser("serve", help="run the retrieval service (see service.py)")
+    command.add_argument("--host", default="127.0.0.1")
+    command.add_argument("--port", type=int, default=8090)
+    command.set_defaults(handler=serve)
+
+    command = commands.add_parser("config", help="print the settings and check the environment")
+    command.set_defaults(handler=config)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
@@ -2,21 +2,75 @@
 # CONFIGURATION FILE FOR GRAPH RAG SYSTEM
 # =============================================================================
 
+import os
+
+# Relative paths below are relative to the package directory, whatever the working directory
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
 # Data Configuration
-DATA_DIRECTORY = "97_raw_markdown_files"
+DATA_DIRECTORY = os.path.join(PACKAGE_DIRECTORY, "97_raw_markdown_files")
 COLLECTION_NAME = "galaxium_travels"
 
 # Document Processing Configuration
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
+# Processes used to read and parse markdown files (None: one per CPU core, 1: serial)
+INGESTION_WORKERS = None
 
 # Embedding Configuration
 EMBEDDING_DIMENSIONS = 384
+# Local cache of computed embeddings, one namespace per model (None disables it)
+EMBEDDING_CACHE_DIR = os.path.join(PACKAGE_DIRECTORY, ".embedding_cache")
+EMBEDDING_CACHE_MAX_MB = 1024
+
+# Vector Store Configuration
+# "astradb" (remote, needs the AstraDB env vars) or "local" (in-process, see local_store.py)
+VECTOR_STORE_BACKEND = "astradb"
+VECTOR_STORE_BACKENDS = ("astradb", "local")
+LOCAL_STORE_DIRECTORY = os.path.join(PACKAGE_DIRECTORY, ".vector_store")
+# Local search: "exact" (every chunk is scored) or "ivf" (approximate inverted-file index)
+LOCAL_STORE_INDEX = "exact"
+# IVF only: lists per index (None: about 4 * sqrt(chunks)) and lists scanned per query
+IVF_LISTS = None
+IVF_PROBES = 8
+
+# Link Graph Configuration
+# CSR link graph built from the markdown links during ingestion (see link_graph.py)
+LINK_GRAPH_PATH = os.path.join(PACKAGE_DIRECTORY, ".link_graph.npz")
+# Graph-expanded retrieval: links followed from the vector hits, score kept per hop,
+# and weight of the PageRank prior (0 disables it)
+GRAPH_HOPS = 1
+GRAPH_DECAY = 0.5
+PAGERANK_WEIGHT = 0.2
 
 # AstraDB Configuration
 BATCH_SIZE = 50
 DEFAULT_KEYSPACE = "default_keyspace"
 
+# Upload Pipeline Configuration (see upload.py): embedding and upload run concurrently
+EMBED_WORKERS = 1
+UPLOAD_WORKERS = 4
+# Embedded batches allowed to wait for an upload worker
+UPLOAD_QUEUE_BATCHES = 8
+UPLOAD_RETRIES = 3
+UPLOAD_BACKOFF_SECONDS = 0.5
+
+# Retrieval Service Configuration (see retrieval.py and service.py)
+# Queries embedded together at most, and how long a query waits for others (0: only batch queries already waiting)
+QUERY_BATCH_SIZE = 32
+QUERY_BATCH_WAIT_MS = 0
+# In-memory LRU caches of query embeddings and of search results; results expire after the TTL
+QUERY_CACHE_SIZE = 4096
+SEARCH_CACHE_SIZE = 1024
+SEARCH_CACHE_TTL_SECONDS = 300
+# Threads running searches for the service
+SERVICE_WORKERS = 8
+
+# Incremental ingestion: hashes and chunk ids of what is stored in each collection,
+# one file per backend and collection (e.g. .ingest_manifest.local-graph_rag.json).
+# Delete a collection's file to force its full re-ingestion.
+MANIFEST_PATH = os.path.join(PACKAGE_DIRECTORY, ".ingest_manifest.json")
+
 # Display Configuration
 MAX_SUMMARY_ITEMS = 5
 MAX_RELATIONSHIP_ITEMS = 10
@@ -34,13 +88,14 @@ OPTIONAL_ENV_VARS = [
 
 def check_environment():
     """Check if required environment variables are set."""
-    import os
     from dotenv import load_dotenv
     
     load_dotenv()
     
     missing_vars = []
-    for var in REQUIRED_ENV_VARS:
+    # The local vector store needs no credentials
+    required_vars = REQUIRED_ENV_VARS if VECTOR_STORE_BACKEND == "astradb" else []
+    for var in required_vars:
         if not os.getenv(var):
             missing_vars.append(var)
     
@@ -56,7 +111,6 @@ def check_environment():
 
 def get_config_summary():
     """Get a summary of current configuration."""
-    import os
     from dotenv import load_dotenv
     
     load_dotenv()
@@ -66,8 +120,14 @@ def get_config_summary():
         "Collection Name": COLLECTION_NAME,
         "Chunk Size": CHUNK_SIZE,
         "Chunk Overlap": CHUNK_OVERLAP,
+        "Ingestion Workers": INGESTION_WORKERS or os.cpu_count(),
         "Embedding Dimensions": EMBEDDING_DIMENSIONS,
+        "Vector Store": VECTOR_STORE_BACKEND if VECTOR_STORE_BACKEND != "local" else f"local ({LOCAL_STORE_INDEX}, {LOCAL_STORE_DIRECTORY})",
+        "Graph Expansion": f"{GRAPH_HOPS} hop(s), decay {GRAPH_DECAY}, PageRank weight {PAGERANK_WEIGHT}",
         "Batch Size": BATCH_SIZE,
+        "Upload Workers": f"{EMBED_WORKERS} embedding, {UPLOAD_WORKERS} upload",
+        "Search Caches": f"{QUERY_CACHE_SIZE} queries, {SEARCH_CACHE_SIZE} results ({SEARCH_CACHE_TTL_SECONDS}s TTL)",
+        "Embedding Cache": f"{EMBEDDING_CACHE_DIR} (max {EMBEDDING_CACHE_MAX_MB} MB)" if EMBEDDING_CACHE_DIR else "disabled",
         "OpenAI API Key": "✅ Set" if os.getenv("OPENAI_API_KEY") else "❌ Not set",
         "AstraDB Token": "✅ Set" if os.getenv("ASTRA_DB_APPLICATION_TOKEN") else "❌ Not set",
         "AstraDB Endpoint": "✅ Set" if os.getenv("ASTRA_DB_API_ENDPOINT") else "❌ Not set",
@@ -0,0 +1,246 @@
+"""
+Persistent embedding cache for the Graph RAG system.
+
+Embeddings are stored on local disk keyed by the SHA-256 of the embedded
+text, so a chunk whose text was embedded before (in an earlier run, or as an
+overlapping chunk of another file) is never sent to the embedding API again.
+
+Each embedding model gets its own namespace directory, because vectors from
+different models are not interchangeable. A namespace holds three
+fixed-width, memory-mapped arrays that grow by doubling:
+
+- ``vectors.f32``: float32 rows of the embedding dimension,
+- ``keys.bin``: the 32-byte text digest of each row,
+- ``used.u64``: a use counter per row, for least-recently-used eviction.
+
+plus ``meta.json`` with the row count and dimension (taken from the first
+vectors stored when not given). When the namespace exceeds
+``max_bytes`` the least recently used rows are dropped by compacting the
+files (down to 90% of the limit, so eviction does not run on every add).
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+KEY_BYTES = 32
+INITIAL_CAPACITY = 1024
+# Fraction of max_bytes kept after an eviction
+EVICT_TO = 0.9
+
+
+def text_key(text: str, kind: str = "document") -> bytes:
+    """Cache key of a text; queries and documents are kept apart for models that embed them differently."""
+    return hashlib.sha256(f"{kind}\0{text}".encode("utf-8")).digest()
+
+
+def namespace_dir(directory: str, namespace: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", namespace).strip("_")[:60]
+    digest = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(directory, f"{slug}-{digest}")
+
+
+class EmbeddingCache:
+    """Text-digest -> float32 vector store for one embedding model (namespace)."""
+
+    def __init__(self, directory: str, namespace: str, dim: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.path = namespace_dir(directory, namespace)
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        meta = self._read_meta()
+        if dim is not None and meta.get("dim", dim) != dim:
+            raise ValueError(f"Embedding cache {self.path} holds {meta['dim']}-dimensional vectors, not {dim}.")
+        self.dim = meta.get("dim", dim)
+        self.rows = meta.get("rows", 0)
+        self._clock = meta.get("clock", 0)
+        self._index: Dict[bytes, int] = {}
+        self.capacity = 0
+        if self.dim is not None:
+            self._open(max(INITIAL_CAPACITY, self.rows))
+            self._index = self._build_index()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def row_bytes(self) -> int:
+        return (self.dim or 0) * 4 + KEY_BYTES + 8
+
+    @property
+    def size_bytes(self) -> int:
+        return self.rows * self.row_bytes
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _read_meta(self) -> dict:
+        try:
+            with open(self._file("meta.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_meta(self):
+        tmp_path = self._file("meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"namespace": self.namespace, "dim": self.dim, "rows": self.rows, "clock": self._clock}, f)
+        os.replace(tmp_path, self._file("meta.json"))
+
+    def _map(self, name: str, dtype, shape) -> np.memmap:
+        path = self._file(name)
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        with open(path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        return np.memmap(path, dtype=dtype, mode="r+", shape=shape)
+
+    def _open(self, capacity: int):
+        self.capacity = capacity
+        self._vectors = self._map("vectors.f32", np.float32, (capacity, self.dim))
+        self._keys = self._map("keys.bin", np.uint8, (capacity, KEY_BYTES))
+        self._used = self._map("used.u64", np.uint64, (capacity,))
+
+    def _build_index(self) -> Dict[bytes, int]:
+        raw = self._keys[:self.rows].tobytes()
+        return {raw[row * KEY_BYTES:(row + 1) * KEY_BYTES]: row for row in range(self.rows)}
+
+    def _close(self):
+        for array in (self._vectors, self._keys, self._used):
+            array.flush()
+        del self._vectors, self._keys, self._used
+
+    def get_many(self, keys: Sequence[bytes]) -> List[Optional[np.ndarray]]:
+        """Cached vectors for ``keys`` (None for misses); hits are marked as recently used."""
+        with self._lock:
+            self._clock += 1
+            result = []
+            for key in keys:
+                row = self._index.get(key)
+                if row is None:
+                    self.misses += 1
+                    result.append(None)
+                else:
+                    self.hits += 1
+                    self._used[row] = self._clock
+                    result.append(np.array(self._vectors[row]))
+            return result
+
+    def put_many(self, keys: Sequence[bytes], vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keys), -1)
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._open(INITIAL_CAPACITY)
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding cache {self.path} holds {self.dim}-dimensional vectors, not {vectors.shape[1]}.")
+            self._clock += 1
+            for key, vector in zip(keys, vectors):
+                row = self._index.get(key)
+                if row is None:
+                    if self.rows == self.capacity:
+                        self._close()
+                        self._open(self.capacity * 2)
+                    row = self.rows
+                    self.rows += 1
+                    self._index[key] = row
+                    self._keys[row] = np.frombuffer(key, dtype=np.uint8)
+                self._vectors[row] = vector
+                self._used[row] = self._clock
+            if self.max_bytes is not None and self.size_bytes > self.max_bytes:
+                self._evict()
+            self._vectors.flush()
+            self._keys.flush()
+            self._used.flush()
+            self._write_meta()
+
+    def _evict(self):
+        """Keep the most recently used rows that fit in EVICT_TO * max_bytes, rewriting the files compactly."""
+        keep_rows = int(self.max_bytes * EVICT_TO) // self.row_bytes
+        order = np.argsort(self._used[:self.rows], kind="stable")[::-1]
+        kept = np.sort(order[:keep_rows])
+        vectors = np.array(self._vectors[kept])
+        keys = np.array(self._keys[kept])
+        used = np.array(self._used[kept])
+        self.evictions += self.rows - len(kept)
+        # Record zero rows first: a crash while compacting leaves an empty
+        # cache, never keys that point at another text's vector
+        self.rows = 0
+        self._write_meta()
+        self._close()
+        for name in ("vectors.f32", "keys.bin", "used.u64"):
+            os.remove(self._file(name))
+        self._open(max(INITIAL_CAPACITY, len(kept)))
+        self.rows = len(kept)
+        self._vectors[:self.rows] = vectors
+        self._keys[:self.rows] = keys
+        self._used[:self.rows] = used
+        self._index = self._build_index()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "rows": self.rows,
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def embedding_model_name(model: Embeddings) -> str:
+    """Namespace for a model: its class plus model name and dimensions when it has them."""
+    parts = [type(model).__name__]
+    for attribute in ("model", "model_name", "dimensions", "dim"):
+        value = getattr(model, attribute, None)
+        if value is not None:
+            parts.append(f"{attribute}={value}")
+    return ":".join(parts)
+
+
+class CachedEmbeddings(Embeddings):
+    """Wraps an embedding model so each distinct text is embedded at most once, across runs.
+
+    Texts repeated within one ``embed_documents`` call are embedded once as
+    well. Only cache misses are sent to the wrapped model, in one call.
+    """
+
+    def __init__(self, model: Embeddings, directory: str, max_bytes: Optional[int] = None,
+                 namespace: Optional[str] = None):
+        self.model = model
+        self.cache = EmbeddingCache(directory, namespace or embedding_model_name(model), max_bytes=max_bytes)
+
+    def _embed(self, texts: List[str], kind: str) -> List[List[float]]:
+        keys = [text_key(text, kind) for text in texts]
+        cached = self.cache.get_many(keys)
+        missing: Dict[bytes, str] = {}
+        for key, text, vector in zip(keys, texts, cached):
+            if vector is None:
+                missing.setdefault(key, text)
+        fresh: Dict[bytes, np.ndarray] = {}
+        if missing:
+            missing_texts = list(missing.values())
+            if kind == "query":
+                vectors = np.asarray([self.model.embed_query(missing_texts[0])], dtype=np.float32)
+            elif hasattr(self.model, "embed_array"):
+                # Models that return a matrix directly skip the list round trip
+                vectors = np.asarray(self.model.embed_array(missing_texts), dtype=np.float32)
+            else:
+                vectors = np.asarray(self.model.embed_documents(missing_texts), dtype=np.float32)
+            fresh = dict(zip(missing, vectors))
+            self.cache.put_many(list(fresh), vectors)
+        return [(vector if vector is not None else fresh[key]).tolist() for key, vector in zip(keys, cached)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, "document")
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text], "query")[0]
@@ -0,0 +1,111 @@
+"""
+Embedding models for the Graph RAG system.
+
+``get_embedding_model`` returns OpenAI embeddings when OPENAI_API_KEY is set
+and the offline ``SimpleEmbeddings`` otherwise, wrapped in the persistent
+``CachedEmbeddings`` layer when EMBEDDING_CACHE_DIR is configured, so
+re-runs never pay for an embedding twice.
+"""
+import os
+from typing import List, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from .config import EMBEDDING_CACHE_DIR, EMBEDDING_CACHE_MAX_MB
+
+
+# FNV-1a over the bytes of each n-gram, then the splitmix64 finalizer so all
+# bits used for bucket and sign are well mixed. Fixed constants (not Python's
+# salted hash()) make vectors identical across processes and machines.
+FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, in place."""
+    h ^= h >> np.uint64(30)
+    h *= np.uint64(0xBF58476D1CE4E5B9)
+    h ^= h >> np.uint64(27)
+    h *= np.uint64(0x94D049BB133111EB)
+    h ^= h >> np.uint64(31)
+    return h
+
+
+class SimpleEmbeddings(Embeddings):
+    """Offline hashed character n-gram embeddings, for testing and benchmarking without API calls.
+
+    Every lower-cased byte n-gram of a text is hashed into one of ``dim``
+    buckets with a hash-derived sign, and rows are L2-normalised. Texts that
+    share vocabulary get similar vectors, a whole batch is embedded in a few
+    NumPy passes over the concatenated bytes, and the global NumPy RNG is
+    never touched.
+    """
+
+    model_name = "hashed-ngram-v1"
+
+    def __init__(self, dim: int = 384, ngram_sizes: Sequence[int] = (3, 4, 5)):
+        self.dim = dim
+        self.ngram_sizes = tuple(ngram_sizes)
+
+    def embed_array(self, texts: Sequence[str]) -> np.ndarray:
+        """Embeddings of ``texts`` as a float32 matrix of shape (len(texts), dim)."""
+        encoded = [text.lower().encode("utf-8") for text in texts]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+        # Bytes left in their own text from every position on; an n-gram
+        # starting where fewer than n remain would run into the next text
+        ends = np.repeat(np.cumsum(lengths), lengths)
+        remaining = ends - np.arange(len(data))
+        rows = np.repeat(np.arange(len(encoded)), lengths)
+
+        # Hash all n-gram sizes in one sweep: after n steps h holds the hash
+        # of the n-gram starting at each position. N-grams that run into the
+        # next text are counted in a spare cell past the end of the matrix.
+        size = len(encoded) * self.dim
+        cells = rows * self.dim
+        counts = np.zeros(2 * size + 2, dtype=np.int64)
+        h = np.full(len(data), FNV_OFFSET, dtype=np.uint64)
+        for n in range(1, max(self.ngram_sizes, default=0) + 1):
+            starts = len(data) - n + 1
+            if starts <= 0:
+                break
+            h = h[:starts]
+            h ^= data[n - 1:]
+            h *= FNV_PRIME
+            if n not in self.ngram_sizes:
+                continue
+            mixed = _mix(h.copy())
+            # Multiply-shift maps the high hash bits onto [0, dim) without a
+            # division; the lowest bit picks the sign
+            buckets = ((mixed >> np.uint64(32)) * np.uint64(self.dim)) >> np.uint64(32)
+            index = (cells[:starts] + buckets.view(np.int64)) * 2 + (mixed & np.uint64(1)).view(np.int64)
+            index[remaining[:starts] < n] = 2 * size
+            counts += np.bincount(index, minlength=counts.size)
+
+        matrix = (counts[0:2 * size:2] - counts[1:2 * size:2]).reshape(len(encoded), self.dim).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_array([text])[0].tolist()
+
+
+def get_embedding_model(cache: bool = True) -> Embeddings:
+    """Get the appropriate embedding model based on available API keys."""
+    if os.getenv("OPENAI_API_KEY"):
+        print("🔑 Using OpenAI embeddings...")
+        from langchain_openai import OpenAIEmbeddings
+        model = OpenAIEmbeddings()
+    else:
+        print("🧪 Using simple test embeddings...")
+        model = SimpleEmbeddings()
+    if cache and EMBEDDING_CACHE_DIR:
+        from .embedding_cache import CachedEmbeddings
+        model = CachedEmbeddings(model, EMBEDDING_CACHE_DIR, max_bytes=EMBEDDING_CACHE_MAX_MB * 1024 * 1024)
+        print(f"💾 Caching embeddings in {model.cache.path} ({len(model.cache)} cached)")
+    return model
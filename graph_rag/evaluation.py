@@ -0,0 +1,169 @@
+"""
+Offline retrieval evaluation for the Graph RAG system.
+
+``evaluate`` runs the whole pipeline on a markdown corpus without any
+remote service: streaming ingestion (``ChunkStream``), hashed n-gram
+embeddings (``SimpleEmbeddings``) into a ``LocalVectorStore``, the link
+graph, and searches through a ``Retriever``. A labeled query set (a query
+and the doc_ids that answer it) gives the quality metrics; ingestion and
+every search are timed.
+
+The result is a plain dict, written as JSON by
+``benchmarks/bench_retrieval.py``: runs with a different chunk size,
+embedding dimension or graph setting can be compared metric by metric
+(see ``compare_reports``).
+"""
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .embeddings import SimpleEmbeddings
+from .ingestion import iter_markdown_files
+from .link_graph import LinkGraph
+from .local_store import LocalVectorStore
+from .manifest import PlanBuilder
+from .pipeline import ChunkStream, make_splitter
+from .retrieval import Retriever
+from .upload import upload_documents
+
+REPORT_VERSION = 1
+# Metrics where a lower value is better (everything else: higher is better)
+LOWER_IS_BETTER = ("latency_ms", "ingestion.seconds")
+
+
+def recall_at_k(ranked: Sequence[str], relevant: Sequence[str], k: int) -> float:
+    """Share of the ``relevant`` doc_ids found in the first ``k`` of ``ranked``."""
+    if not relevant:
+        return 0.0
+    return len(set(ranked[:k]) & set(relevant)) / len(set(relevant))
+
+
+def reciprocal_rank(ranked: Sequence[str], relevant: Sequence[str]) -> float:
+    """1 / rank of the first relevant doc_id in ``ranked`` (0 if none is)."""
+    relevant = set(relevant)
+    for rank, doc_id in enumerate(ranked, 1):
+        if doc_id in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def load_queries(path: str) -> List[Dict[str, Any]]:
+    """A JSON list of ``{"query": ..., "relevant": [doc_id, ...]}``; doc_ids use "/" as separator."""
+    with open(path, "r", encoding="utf-8") as f:
+        queries = json.load(f)
+    return [{"query": q["query"], "relevant": [os.path.normpath(doc_id) for doc_id in q["relevant"]]}
+            for q in queries]
+
+
+def evaluate(
+    data_dir: str,
+    queries: List[Dict[str, Any]],
+    k_values: Sequence[int] = (1, 3, 5, 10),
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    embedding_dim: int = 384,
+    index: str = "exact",
+    hops: int = 1,
+    decay: float = 0.5,
+    pagerank_weight: float = 0.0,
+    workers: Optional[int] = 1,
+    batch_size: int = 50,
+) -> Dict[str, Any]:
+    """Ingest ``data_dir``, run every query and report quality, throughput and latency."""
+    embedding = SimpleEmbeddings(dim=embedding_dim)
+    store = LocalVectorStore(embedding)
+    started = time.perf_counter()
+    stream = ChunkStream(iter_markdown_files(data_dir, workers=workers, verbose=False), PlanBuilder({}),
+                         make_splitter(chunk_size, chunk_overlap))
+    stats = upload_documents(store, stream, embedding, batch_size=batch_size, progress=None)
+    if index == "ivf":
+        store.build_index()
+    graph = LinkGraph.from_documents(stream.links)
+    ingestion_seconds = time.perf_counter() - started
+
+    # No caches: every query goes through embedding, search and graph expansion
+    retriever = Retriever(embedding, store, graph, hops=hops, decay=decay, pagerank_weight=pagerank_weight,
+                          query_cache_size=0, result_cache_size=0)
+    retriever.warm_up()
+    depth = max(k_values)
+    recalls = {k: [] for k in k_values}
+    reciprocal_ranks, latencies = [], []
+    try:
+        for query in queries:
+            start = time.perf_counter()
+            result = retriever.search(query["query"], k=depth)
+            latencies.append((time.perf_counter() - start) * 1000)
+            ranked = [hit.doc_id for hit in result.hits]
+            for k in k_values:
+                recalls[k].append(recall_at_k(ranked, query["relevant"], k))
+            reciprocal_ranks.append(reciprocal_rank(ranked, query["relevant"]))
+    finally:
+        retriever.close()
+
+    stages = retriever.latency.summary()
+    latencies = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        "version": REPORT_VERSION,
+        "config": {
+            "data_dir": data_dir,
+            "chunk_size": chunk_size,
+            "chunk_overlap": chunk_overlap,
+            "embedding": f"{type(embedding).__name__}:{embedding.model_name}:dim={embedding_dim}",
+            "index": index,
+            "hops": hops,
+            "decay": decay,
+            "pagerank_weight": pagerank_weight,
+        },
+        "corpus": {
+            "files": stream.files,
+            "characters": stream.characters,
+            "chunks": stats.chunks,
+            "links": graph.edge_count,
+            "queries": len(queries),
+        },
+        "ingestion": {
+            "seconds": ingestion_seconds,
+            "files_per_second": stream.files / ingestion_seconds,
+            "chunks_per_second": stats.chunks / ingestion_seconds,
+        },
+        "quality": {
+            **{f"recall@{k}": float(np.mean(values)) if values else 0.0 for k, values in recalls.items()},
+            "mrr": float(np.mean(reciprocal_ranks)) if reciprocal_ranks else 0.0,
+        },
+        "latency_ms": {
+            "p50": float(np.percentile(latencies, 50)),
+            "p99": float(np.percentile(latencies, 99)),
+            "mean": float(latencies.mean()),
+            **{f"{stage}_p50": stages[stage]["p50_ms"] for stage in ("embed", "search", "graph")},
+        },
+    }
+
+
+def _flatten(report: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    values = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            values.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[f"{prefix}{key}"] = value
+    return values
+
+
+def compare_reports(baseline: Dict[str, Any], report: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Every numeric metric of two reports with its change; ``better`` is None when it did not change."""
+    sections = ("ingestion", "quality", "latency_ms")
+    before = _flatten({section: baseline.get(section, {}) for section in sections})
+    after = _flatten({section: report.get(section, {}) for section in sections})
+    rows = []
+    for metric, value in after.items():
+        if metric not in before:
+            continue
+        change = value - before[metric]
+        lower_is_better = metric.startswith(LOWER_IS_BETTER)
+        better = None if change == 0 else (change < 0) == lower_is_better
+        rows.append({"metric": metric, "baseline": before[metric], "value": value,
+                     "change": change, "better": better})
+    return rows
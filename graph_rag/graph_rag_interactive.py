@@ -1,332 +1,102 @@
 #%% [markdown]
 # # Graph RAG System - Interactive Notebook
-# 
+#
 # This notebook processes markdown documents and creates a graph-based RAG system.
 # Each cell is designed to be run independently for easy debugging and experimentation.
+#
+# The steps live in the graph_rag package (see workflow.py); ``python -m graph_rag ingest``
+# runs them in one go. Every cell only does work when run, never when this module is imported.
 
 #%%
 # =============================================================================
 # 1. IMPORTS AND CONFIGURATION
 # =============================================================================
 import os
-import re
-import pandas as pd
-from pathlib import Path
-from typing import List, Dict, Any
-import markdown
-from bs4 import BeautifulSoup
-from datetime import datetime
-from dotenv import load_dotenv
+import sys
 
-# Load environment variables
-load_dotenv()
+if __name__ == "__main__":
+    # Run as a script or cell by cell from graph_rag/: make the package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(globals().get("__file__", "graph_rag_interactive.py")))))
 
-# Configuration
-DATA_DIRECTORY = "97_raw_markdown_files"
-COLLECTION_NAME = "galaxium_travels"
-CHUNK_SIZE = 1000
-CHUNK_OVERLAP = 200
+from dotenv import load_dotenv  # noqa: E402
 
-print("✅ Imports loaded successfully")
-print(f"📁 Data directory: {DATA_DIRECTORY}")
-print(f"🗄️  Collection name: {COLLECTION_NAME}")
+from graph_rag.config import COLLECTION_NAME, DATA_DIRECTORY, VECTOR_STORE_BACKEND  # noqa: E402
 
+if __name__ == "__main__":
+    # Load environment variables
+    load_dotenv()
+
+    print("✅ Imports loaded successfully")
+    print(f"📁 Data directory: {DATA_DIRECTORY}")
+    print(f"🗄️  Collection name: {COLLECTION_NAME}")
 
-#%% [markdown]
-# # Graph RAG System - Interactive Notebook
-# 
-# This notebook processes markdown documents and creates a graph-based RAG system.
-# Each cell is designed to be run independently for easy debugging and experimentation.
 #%%
 # =============================================================================
-# 2. UTILITY FUNCTIONS
+# 2. METADATA EXTRACTION
 # =============================================================================
 
-def get_relative_path_from_root(absolute_path: str, root_dir: str = "97_raw_markdown_files") -> str:
-    """Convert absolute path to relative path from the root directory."""
-    abs_path = Path(absolute_path).resolve()
-    root_path = Path(root_dir).resolve()
-    
-    try:
-        rel_path = abs_path.relative_to(root_path)
-        return str(rel_path)
-    except ValueError:
-        return str(abs_path)
-
-def print_summary(title: str, data: Any, max_items: int = 5):
-    """Print a nice summary of data."""
-    print(f"\n{'='*50}")
-    print(f"📊 {title}")
-    print(f"{'='*50}")
-    
-    if isinstance(data, list):
-        print(f"Total items: {len(data)}")
-        if data and max_items > 0:
-            print(f"\nFirst {min(max_items, len(data))} items:")
-            for i, item in enumerate(data[:max_items]):
-                if isinstance(item, dict):
-                    print(f"  {i+1}. {item.get('title', item.get('doc_id', str(item)))}")
-                else:
-                    print(f"  {i+1}. {item}")
-    elif isinstance(data, dict):
-        for key, value in data.items():
-            print(f"{key}: {value}")
-    else:
-        print(str(data))
-
-def extract_metadata_from_markdown(file_path: str) -> Dict[str, Any]:
-    """Extract metadata and content from a markdown file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Extract title (first # heading)
-    title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE) # regex to extract the title from the markdown file
-    title = title_match.group(1) if title_match else Path(file_path).stem
-    
-    # Extract links to other documents
-    links = []
-    link_pattern = r'\[([^\]]+)\]\(([^)]+)\)' # regex to extract the links from the markdown file
-    for match in re.finditer(link_pattern, content):
-        link_path = match.group(2)
-        
-        # Strip anchor fragments (everything after #) from the path
-        if '#' in link_path:
-            link_path = link_path.split('#')[0]
-        
-        # Only process markdown files (skip external links, images, etc.)
-        if not link_path.endswith('.md'):
-            continue
-            
-        # Convert paths to relative paths from root
-        if link_path.startswith('../'):
-            base_path = Path(file_path).parent
-            full_path = base_path / link_path
-            relative_path = get_relative_path_from_root(str(full_path.resolve()))
-            links.append(relative_path)
-        elif link_path.startswith('./'):
-            base_path = Path(file_path).parent
-            full_path = base_path / link_path[2:]
-            relative_path = get_relative_path_from_root(str(full_path.resolve()))
-            links.append( relative_path)
-        else:
-            if os.path.isabs(link_path):
-                relative_path = get_relative_path_from_root(link_path)
-            else:
-                relative_path = link_path
-            links.append(relative_path)
-    
-    # Extract document category from path
-    path_parts = Path(file_path).parts
-    category = path_parts[-2] if len(path_parts) > 1 else 'root'
-    
-    return {
-        'doc_id': get_relative_path_from_root(file_path),
-        'title': title,
-        'content': content,
-        'category': category,
-        'file_path': file_path,
-        'links': links,
-        'metadata': {
-            'file_size': len(content),
-            'word_count': len(content.split()),
-            'link_count': len(links)
-        }
-    }
+from graph_rag.ingestion import extract_metadata_from_markdown  # noqa: E402
 
-def process_all_markdown_files(data_dir: str) -> List[Dict[str, Any]]:
-    """Process all markdown files in the directory and extract metadata."""
-    documents = []
-    data_path = Path(data_dir)
-    
-    print(f"🔍 Scanning for markdown files in: {data_path}")
-    
-    for md_file in data_path.rglob('*.md'):
-        try:
-            doc_metadata = extract_metadata_from_markdown(str(md_file))
-            documents.append(doc_metadata)
-            print(f"  ✅ {md_file.name}")
-        except Exception as e:
-            print(f"  ❌ Error processing {md_file}: {e}")
-    
-    return documents
-
-print("✅ Utility functions defined")
-
-
-#%%
-# Test the extract_metadata_from_markdown function
-test_file = "97_raw_markdown_files/04_marketing/02_offerings/02_earth_orbit_experience.md"
-metadata = extract_metadata_from_markdown(test_file)
-print("doc_id: ", metadata['doc_id'])
-print("links: ", metadata['links'])
-
-#%%
+if __name__ == "__main__":
+    # Test the extract_metadata_from_markdown function
+    test_file = os.path.join(DATA_DIRECTORY, "04_marketing/02_offerings/02_earth_orbit_experience.md")
+    metadata = extract_metadata_from_markdown(test_file)
+    print("doc_id: ", metadata['doc_id'])
+    print("links: ", metadata['links'])
+    print("unresolved links: ", metadata['dangling_links'])
 
 #%%
 # =============================================================================
-# 3. EMBEDDING CLASSES
+# 3. STREAMING INGESTION
 # =============================================================================
 
-from langchain_core.embeddings import Embeddings
-import numpy as np
+from graph_rag.workflow import load_manifest, open_chunk_stream  # noqa: E402
 
-class SimpleEmbeddings(Embeddings):
-    """Simple embeddings class for testing without actual API calls."""
-    
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Create simple random embeddings for testing."""
-        embeddings = []
-        for text in texts:
-            hash_val = hash(text) % (2**32)
-            np.random.seed(hash_val)
-            embedding = np.random.rand(384).tolist()
-            embeddings.append(embedding)
-        return embeddings
-    
-    def embed_query(self, text: str) -> List[float]:
-        """Create a simple random embedding for a query."""
-        hash_val = hash(text) % (2**32)
-        np.random.seed(hash_val)
-        return np.random.rand(384).tolist()
+if __name__ == "__main__":
+    # Compare with what the last run stored: only new and changed files are embedded.
+    manifest = load_manifest()
 
-def get_embedding_model():
-    """Get the appropriate embedding model based on available API keys."""
-    if os.getenv("OPENAI_API_KEY"):
-        print("🔑 Using OpenAI embeddings...")
-        from langchain_openai import OpenAIEmbeddings
-        return OpenAIEmbeddings()
-    else:
-        print("🧪 Using simple test embeddings...")
-        return SimpleEmbeddings()
+    # Nothing is read yet: files are read, checked against the manifest and split
+    # while the chunks are embedded and uploaded (section 4), so memory use stays
+    # flat however large the corpus is
+    chunk_stream = open_chunk_stream(manifest)
 
-print("✅ Embedding classes defined")
+    print("✅ Streaming ingestion pipeline set up")
 
 #%%
 # =============================================================================
-# 4. MARKDOWN PROCESSING
+# 4. VECTOR STORE (ASTRA DB OR LOCAL)
 # =============================================================================
 
-print("✅ Markdown processing functions already defined in utility functions")
+from graph_rag.workflow import record_ingestion, store_chunks  # noqa: E402
 
-#%%
-# =============================================================================
-# 5. PROCESS MARKDOWN FILES
-# =============================================================================
+if __name__ == "__main__":
+    # Execute streaming ingestion: the collection is updated in place
+    vector_store = store_chunks(chunk_stream, VECTOR_STORE_BACKEND, COLLECTION_NAME)
 
-# Execute markdown processing
-print("🚀 Processing markdown files...")
-documents = process_all_markdown_files(DATA_DIRECTORY)
-
-print_summary("Markdown Processing Results", documents)
-print(f"Total links found: {sum(len(doc['links']) for doc in documents)}")
+    # Remember what is stored now, so the next run only embeds what changed
+    if vector_store is not None:
+        record_ingestion(manifest, chunk_stream)
 
 #%%
 # =============================================================================
-# 6. CREATE LANGCHAIN DOCUMENTS
+# 5. LINK GRAPH
 # =============================================================================
 
-from langchain_core.documents import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-
-def create_langchain_documents(metadata_list: List[Dict[str, Any]]) -> List[Document]:
-    """Convert extracted metadata to LangChain Document objects."""
-    documents = []
-    
-    for metadata in metadata_list:
-        doc = Document(
-            page_content=metadata['content'],
-            metadata={
-                'doc_id': metadata['doc_id'],
-                'title': metadata['title'],
-                'category': metadata['category'],
-                'file_path': metadata['file_path'],
-                'linked_docs': metadata['links']
-            }
-        )
-        documents.append(doc)
-    
-    return documents
-
-def split_documents(documents: List[Document], chunk_size: int = 1000, chunk_overlap: int = 200) -> List[Document]:
-    """Split documents into smaller chunks for better embedding."""
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        length_function=len,
-    )
-    return text_splitter.split_documents(documents)
-
-# Execute document creation
-print("🔄 Creating LangChain documents...")
-langchain_docs = create_langchain_documents(documents)
-
-print("🔄 Splitting documents into chunks...")
-split_docs = split_documents(langchain_docs, CHUNK_SIZE, CHUNK_OVERLAP)
-
-print_summary("Document Processing Results", split_docs)
-
-#%%
-
+from graph_rag.workflow import save_link_graph  # noqa: E402
 
+if __name__ == "__main__" and chunk_stream.completed:
+    link_graph = save_link_graph(chunk_stream)
 
 #%%
 # =============================================================================
-# 9. ASTRA DB STORAGE
+# 6. GRAPH-EXPANDED RETRIEVAL
 # =============================================================================
 
-from langchain_astradb import AstraDBVectorStore
-from astrapy.api_options import APIOptions, SerdesOptions
-
-def store_documents_in_astradb(documents: List[Document], collection_name: str = "galaxium_travels") -> AstraDBVectorStore:
-    """Store documents in AstraDB with vector embeddings using FLOAT ARRAYS."""
-    
-    embedding_model = get_embedding_model()
-    
-    try:
-        # Configure AstraPy to use plain float arrays instead of binary encoding
-        api_options = APIOptions(
-            serdes_options=SerdesOptions(
-                binary_encode_vectors=False,  # Key flag for Langflow compatibility
-                custom_datatypes_in_reading=False
-            )
-        )
-        
-        print("🔧 Configuring AstraDB with float array vector support...")
-        
-        # Initialize AstraDB vector store
-        vector_store = AstraDBVectorStore(
-            embedding=embedding_model,
-            collection_name=collection_name,
-            token=os.getenv("ASTRA_DB_APPLICATION_TOKEN"),
-            api_endpoint=os.getenv("ASTRA_DB_API_ENDPOINT"),
-            namespace=os.getenv("ASTRA_DB_KEYSPACE", "default_keyspace"),
-            api_options=api_options
-        )
-        
-        print(f"✅ Connected to AstraDB collection: {collection_name}")
-        
-        # Add documents in batches
-        print(f"Adding {len(documents)} documents to AstraDB...")
-        batch_size = 50
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i:i + batch_size]
-            vector_store.add_documents(batch)
-            print(f"  📦 Added batch {i//batch_size + 1}/{(len(documents)-1)//batch_size + 1}")
-        
-        print(f"✅ Successfully stored {len(documents)} documents in AstraDB")
-        return vector_store
-        
-    except Exception as e:
-        print(f"❌ Error connecting to AstraDB: {e}")
-        print("This is expected if AstraDB credentials are not configured.")
-        return None
-
-# Execute AstraDB storage
-print("🚀 Starting AstraDB storage...")
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-collection_name = f"{COLLECTION_NAME}_{timestamp}"
-print(f"📅 Using collection name: {collection_name}")
+from graph_rag.workflow import show_graph_search  # noqa: E402
 
-vector_store = store_documents_in_astradb(split_docs, collection_name)
+if __name__ == "__main__" and vector_store is not None and chunk_stream.completed:
+    show_graph_search(vector_store, link_graph, "What safety training do passengers need before launch?")
+    show_graph_search(vector_store, link_graph, "How are refunds handled when a flight is cancelled?")
 
 #%%
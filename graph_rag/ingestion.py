@@ -0,0 +1,264 @@
+"""
+Markdown ingestion for the Graph RAG system.
+
+Reads every markdown file under the data directory and extracts its title,
+category, content and links to other documents. Links are resolved against
+a ``CorpusIndex`` of all markdown paths, built once per run, without
+touching the filesystem; links to files outside the corpus are reported as
+dangling.
+
+Files are independent, so ``iter_markdown_files`` can spread them over a
+process pool: paths are sorted and handed to the workers in chunks, and
+results come back in path order, so serial and parallel runs return
+identical documents. It yields documents as they are read;
+``process_all_markdown_files`` collects them in a list.
+"""
+import multiprocessing
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import unquote
+
+from .config import DATA_DIRECTORY
+
+TITLE_PATTERN = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+
+
+def get_relative_path_from_root(absolute_path: str, root_dir: str = DATA_DIRECTORY) -> str:
+    """Convert absolute path to relative path from the root directory."""
+    abs_path = Path(absolute_path).resolve()
+    root_path = Path(root_dir).resolve()
+
+    try:
+        rel_path = abs_path.relative_to(root_path)
+        return str(rel_path)
+    except ValueError:
+        return str(abs_path)
+
+
+class CorpusIndex:
+    """Relative paths of every markdown file under a root, for resolving links without the filesystem.
+
+    The root is made absolute (and resolved) once; file paths and links are
+    then normalised lexically with ``os.path``, so resolving a link is a
+    string operation and a set lookup.
+    """
+
+    def __init__(self, root_dir: str, files: Optional[List[str]] = None):
+        self.root = os.path.abspath(root_dir)
+        # Paths may also arrive resolved (e.g. through a symlinked data directory)
+        self.resolved_root = str(Path(root_dir).resolve())
+        files = list_markdown_files(root_dir) if files is None else files
+        self.paths = frozenset(self.doc_id(file_path) for file_path in files)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.paths
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def _relative(self, absolute_path: str) -> Optional[str]:
+        for root in (self.root, self.resolved_root):
+            if absolute_path == root or absolute_path.startswith(root + os.sep):
+                return os.path.relpath(absolute_path, root)
+        return None
+
+    def doc_id(self, file_path: str) -> str:
+        """Path of ``file_path`` relative to the root (the absolute path if it is outside)."""
+        absolute_path = os.path.abspath(file_path)
+        return self._relative(absolute_path) or absolute_path
+
+    def resolve(self, doc_id: str, link_path: str) -> Tuple[str, bool]:
+        """Normalised target of a link in document ``doc_id``, and whether it is in the corpus.
+
+        Relative links are relative to the linking document's directory; a
+        bare ``name.md`` that does not exist there is also tried from the
+        root, which is how these links were read before.
+        """
+        if os.path.isabs(link_path):
+            target = os.path.normpath(link_path)
+            relative = self._relative(target)
+            return relative or target, relative in self.paths
+        target = os.path.normpath(os.path.join(os.path.dirname(doc_id), link_path))
+        if target in self.paths:
+            return target, True
+        if not link_path.startswith(('./', '../')):
+            from_root = os.path.normpath(link_path)
+            if from_root in self.paths:
+                return from_root, True
+        return target, False
+
+
+_corpus_indexes: Dict[str, CorpusIndex] = {}
+
+
+def corpus_index(root_dir: str, refresh: bool = False) -> CorpusIndex:
+    """The index of ``root_dir``, built on first use (or when ``refresh``) and then shared."""
+    key = os.path.abspath(root_dir)
+    if refresh or key not in _corpus_indexes:
+        _corpus_indexes[key] = CorpusIndex(root_dir)
+    return _corpus_indexes[key]
+
+
+def extract_links(content: str, doc_id: str, index: CorpusIndex) -> Tuple[List[str], List[str]]:
+    """Markdown links of a document: (doc_ids in the corpus, normalised targets that are not)."""
+    links, dangling = [], []
+    for match in LINK_PATTERN.finditer(content):
+        # Strip anchor fragments (everything after #) from the path
+        link_path = unquote(match.group(2).split('#', 1)[0].strip())
+
+        # Only process markdown files (skip external links, images, etc.)
+        if not link_path.endswith('.md') or '://' in link_path or link_path.startswith('mailto:'):
+            continue
+
+        target, found = index.resolve(doc_id, link_path)
+        (links if found else dangling).append(target)
+    return links, dangling
+
+
+def extract_metadata_from_markdown(file_path: str, root_dir: str = DATA_DIRECTORY,
+                                   index: Optional[CorpusIndex] = None) -> Dict[str, Any]:
+    """Extract metadata and content from a markdown file.
+
+    Links are resolved against ``index`` (by default the shared index of
+    ``root_dir``): ``links`` holds the doc_ids of linked corpus documents,
+    ``dangling_links`` the targets that are not in the corpus.
+    """
+    index = index or corpus_index(root_dir)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Extract title (first # heading)
+    title_match = TITLE_PATTERN.search(content)
+    title = title_match.group(1) if title_match else Path(file_path).stem
+
+    doc_id = index.doc_id(file_path)
+    links, dangling_links = extract_links(content, doc_id, index)
+
+    # Extract document category from path
+    path_parts = Path(file_path).parts
+    category = path_parts[-2] if len(path_parts) > 1 else 'root'
+
+    return {
+        'doc_id': doc_id,
+        'title': title,
+        'content': content,
+        'category': category,
+        'file_path': file_path,
+        'links': links,
+        'dangling_links': dangling_links,
+        'metadata': {
+            'file_size': len(content),
+            'word_count': len(content.split()),
+            'link_count': len(links),
+            'dangling_link_count': len(dangling_links),
+        }
+    }
+
+
+def list_markdown_files(data_dir: str) -> List[str]:
+    """All markdown files under ``data_dir``, sorted so every run sees the same order."""
+    return sorted(str(path) for path in Path(data_dir).rglob('*.md'))
+
+
+def _extract(task: Tuple[str, str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    # Runs in the worker processes: errors are returned, not raised, so one
+    # bad file does not abort the whole map
+    file_path, root_dir = task
+    try:
+        return extract_metadata_from_markdown(file_path, root_dir), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _pool_context():
+    # spawn, not fork: the pool may be started from a thread of the upload
+    # pipeline (see pipeline.ChunkStream) while other threads hold locks, and
+    # a forked child would inherit those locks held. Spawned workers import
+    # this module and re-import the __main__ script, which are both free of
+    # side effects (graph_rag_interactive.py only runs its cells as __main__).
+    return multiprocessing.get_context("spawn")
+
+
+def _install_index(data_dir: str, files: List[str]):
+    # Pool initializer: each worker gets the run's index instead of scanning the corpus again
+    _corpus_indexes[os.path.abspath(data_dir)] = CorpusIndex(data_dir, files)
+
+
+def iter_markdown_files(
+    data_dir: str,
+    workers: Optional[int] = 1,
+    chunksize: Optional[int] = None,
+    verbose: bool = True,
+    on_error: Optional[Callable[[str], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield the metadata of every markdown file in path order, reading files as they are consumed.
+
+    ``workers`` > 1 extracts files in that many processes (None: one per CPU
+    core). ``chunksize`` is the number of files sent to a worker at a time;
+    by default each worker gets about four chunks, which keeps inter-process
+    overhead low while still balancing uneven file sizes. At most two chunks
+    per worker are in flight, so a slow consumer never has the whole corpus
+    waiting in memory.
+
+    Files that cannot be read are skipped; ``on_error`` is called with
+    their doc_id (e.g. ``PlanBuilder.fail``, so they are not taken for
+    deleted files).
+    """
+    files = list_markdown_files(data_dir)
+    # Index the corpus once per run; pool workers are handed the same file list
+    index = _corpus_indexes[os.path.abspath(data_dir)] = CorpusIndex(data_dir, files)
+    workers = workers or os.cpu_count() or 1
+    tasks = [(file_path, data_dir) for file_path in files]
+
+    if verbose:
+        print(f"🔍 Scanning for markdown files in: {data_dir} ({len(files)} files, {workers} worker(s))")
+
+    if workers > 1 and len(files) > 1:
+        chunksize = chunksize or max(1, len(files) // (workers * 4))
+        batches = [tasks[start:start + chunksize] for start in range(0, len(tasks), chunksize)]
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                                 initializer=_install_index, initargs=(data_dir, files)) as pool:
+            pending = deque()
+            for batch in batches:
+                pending.append(pool.submit(_extract_batch, batch))
+                if len(pending) >= 2 * workers:
+                    yield from _report(pending.popleft().result(), verbose, index, on_error)
+            while pending:
+                yield from _report(pending.popleft().result(), verbose, index, on_error)
+    else:
+        for task in tasks:
+            yield from _report([(task[0], _extract(task))], verbose, index, on_error)
+
+
+def _extract_batch(tasks: List[Tuple[str, str]]) -> List[Tuple[str, Tuple[Optional[Dict[str, Any]], Optional[str]]]]:
+    return [(task[0], _extract(task)) for task in tasks]
+
+
+def _report(results, verbose: bool, index: CorpusIndex,
+            on_error: Optional[Callable[[str], None]]) -> Iterator[Dict[str, Any]]:
+    for file_path, (doc_metadata, error) in results:
+        if error is not None:
+            if verbose:
+                print(f"  ❌ Error processing {file_path}: {error}")
+            if on_error is not None:
+                on_error(index.doc_id(file_path))
+            continue
+        if verbose:
+            dangling = len(doc_metadata['dangling_links'])
+            print(f"  ✅ {Path(file_path).name}" + (f" ({dangling} unresolved link(s))" if dangling else ""))
+        yield doc_metadata
+
+
+def process_all_markdown_files(
+    data_dir: str,
+    workers: Optional[int] = 1,
+    chunksize: Optional[int] = None,
+    verbose: bool = True,
+) -> List[Dict[str, Any]]:
+    """Process all markdown files in the directory and extract metadata (see ``iter_markdown_files``)."""
+    return list(iter_markdown_files(data_dir, workers, chunksize, verbose))
@@ -0,0 +1,236 @@
+"""
+Document link graph for the Graph RAG system.
+
+``LinkGraph`` turns the ``links`` extracted from every markdown file into a
+directed graph over integer node ids, stored as CSR arrays: the targets of
+node ``i`` are ``indices[indptr[i]:indptr[i + 1]]``. The reverse graph is
+kept the same way, so "linked from" is as cheap to follow as "links to".
+A PageRank score per node is computed once when the graph is built.
+
+``graph_search`` uses it for retrieval: the documents of the vector search
+hits are the seeds, and are expanded ``hops`` links outwards. Each hop
+multiplies the score by ``decay``, a document reached on several paths
+keeps its best score, and PageRank can be mixed in as a prior so that
+central documents rank higher.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+
+def _csr(sources: np.ndarray, targets: np.ndarray, nodes: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.lexsort((targets, sources))
+    indptr = np.zeros(nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=nodes), out=indptr[1:])
+    return indptr, targets[order].astype(np.int32)
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Neighbours of ``nodes`` and, for each, the position in ``nodes`` it was reached from."""
+    starts, ends = indptr[nodes], indptr[nodes + 1]
+    counts = ends - starts
+    parents = np.repeat(np.arange(len(nodes)), counts)
+    # Position of every neighbour inside its node's slice
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return indices[np.repeat(starts, counts) + offsets], parents
+
+
+class LinkGraph:
+    """Directed document graph in CSR form, with PageRank per node."""
+
+    def __init__(self, node_ids: List[str], sources: np.ndarray, targets: np.ndarray,
+                 pagerank: Optional[np.ndarray] = None):
+        self.node_ids = list(node_ids)
+        self.index = {doc_id: i for i, doc_id in enumerate(self.node_ids)}
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        # Drop duplicate edges and self links
+        edges = np.unique(np.stack([sources, targets], axis=1), axis=0) if len(sources) else np.empty((0, 2), np.int64)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        self.indptr, self.indices = _csr(edges[:, 0], edges[:, 1], len(self.node_ids))
+        self.in_indptr, self.in_indices = _csr(edges[:, 1], edges[:, 0], len(self.node_ids))
+        self.pagerank = self.compute_pagerank() if pagerank is None else np.asarray(pagerank, dtype=np.float64)
+        # Links whose target is not a node (set by from_documents)
+        self.dangling_links = 0
+
+    @classmethod
+    def from_documents(cls, documents: Sequence[Dict[str, Any]]) -> "LinkGraph":
+        """Build the graph from ``process_all_markdown_files`` output; links to unknown documents are skipped."""
+        graph_nodes = [document["doc_id"] for document in documents]
+        index = {doc_id: i for i, doc_id in enumerate(graph_nodes)}
+        sources, targets = [], []
+        # Links ingestion could not resolve, plus links to files that failed to parse
+        dangling = sum(len(document.get("dangling_links", ())) for document in documents)
+        for i, document in enumerate(documents):
+            for link in document["links"]:
+                target = index.get(link)
+                if target is None:
+                    dangling += 1
+                    continue
+                sources.append(i)
+                targets.append(target)
+        graph = cls(graph_nodes, np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64))
+        graph.dangling_links = dangling
+        return graph
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def links_from(self, doc_id: str) -> List[str]:
+        i = self.index[doc_id]
+        return [self.node_ids[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def links_to(self, doc_id: str) -> List[str]:
+        i = self.index[doc_id]
+        return [self.node_ids[j] for j in self.in_indices[self.in_indptr[i]:self.in_indptr[i + 1]]]
+
+    def compute_pagerank(self, damping: float = 0.85, iterations: int = 100, tolerance: float = 1e-10) -> np.ndarray:
+        """PageRank by power iteration; pages without links spread their rank evenly."""
+        nodes = len(self.node_ids)
+        if nodes == 0:
+            return np.empty(0)
+        out_degree = np.diff(self.indptr)
+        sources = np.repeat(np.arange(nodes), out_degree)
+        rank = np.full(nodes, 1.0 / nodes)
+        for _ in range(iterations):
+            shares = np.divide(rank, out_degree, out=np.zeros(nodes), where=out_degree > 0)
+            dangling = rank[out_degree == 0].sum()
+            new_rank = (1 - damping) / nodes + damping * (
+                np.bincount(self.indices, weights=shares[sources], minlength=nodes) + dangling / nodes
+            )
+            converged = np.abs(new_rank - rank).sum() < tolerance
+            rank = new_rank
+            if converged:
+                break
+        return rank
+
+    def expand(
+        self,
+        seeds: Dict[int, float],
+        hops: int = 1,
+        decay: float = 0.5,
+        direction: str = "both",
+    ) -> Dict[int, Tuple[float, int]]:
+        """Best score and hop distance of every node within ``hops`` links of ``seeds``.
+
+        A node's score is its best seed score times ``decay`` per hop;
+        ``direction`` is "out" (follow links), "in" (follow backlinks) or "both".
+        """
+        nodes, scores, distances = self.expand_arrays(seeds, hops, decay, direction)
+        return {int(node): (float(score), int(hop)) for node, score, hop in zip(nodes, scores, distances)}
+
+    def expand_arrays(
+        self,
+        seeds: Dict[int, float],
+        hops: int = 1,
+        decay: float = 0.5,
+        direction: str = "both",
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``expand`` as (nodes, scores, hop distances) arrays, without building a dict."""
+        best = np.full(len(self.node_ids), -np.inf)
+        distance = np.full(len(self.node_ids), -1, dtype=np.int64)
+        frontier = np.fromiter(seeds.keys(), dtype=np.int64, count=len(seeds))
+        scores = np.fromiter(seeds.values(), dtype=np.float64, count=len(seeds))
+        best[frontier] = scores
+        distance[frontier] = 0
+        graphs = {"out": [(self.indptr, self.indices)], "in": [(self.in_indptr, self.in_indices)]}
+        graphs["both"] = graphs["out"] + graphs["in"]
+        for hop in range(1, hops + 1):
+            reached, reached_scores = [], []
+            for indptr, indices in graphs[direction]:
+                neighbours, parents = _gather(indptr, indices, frontier)
+                reached.append(neighbours)
+                reached_scores.append(scores[parents] * decay)
+            neighbours = np.concatenate(reached)
+            neighbour_scores = np.concatenate(reached_scores)
+            if len(neighbours) == 0:
+                break
+            # Best score per neighbour, then keep only the ones that improved
+            order = np.lexsort((-neighbour_scores, neighbours))
+            neighbours, neighbour_scores = neighbours[order], neighbour_scores[order]
+            first = np.r_[True, neighbours[1:] != neighbours[:-1]]
+            neighbours, neighbour_scores = neighbours[first], neighbour_scores[first]
+            improved = neighbour_scores > best[neighbours]
+            frontier, scores = neighbours[improved], neighbour_scores[improved]
+            distance[frontier[best[frontier] == -np.inf]] = hop
+            best[frontier] = scores
+            if len(frontier) == 0:
+                break
+        found = np.flatnonzero(distance >= 0)
+        return found, best[found], distance[found]
+
+    def save(self, path: str):
+        np.savez(path, node_ids=np.array(self.node_ids, dtype=str), indptr=self.indptr,
+                 indices=self.indices, pagerank=self.pagerank)
+
+    @classmethod
+    def load(cls, path: str) -> "LinkGraph":
+        with np.load(path) as data:
+            indptr, indices = data["indptr"], data["indices"]
+            sources = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+            return cls(data["node_ids"].tolist(), sources, indices, data["pagerank"])
+
+
+class GraphHit(NamedTuple):
+    doc_id: str
+    score: float
+    # 0 for documents found by the vector search, else their link distance from the nearest one
+    hops: int
+    # Matching chunks from the vector search (empty for documents reached by links)
+    chunks: List[Tuple[Document, float]]
+
+
+def graph_search(
+    vector_store: VectorStore,
+    graph: LinkGraph,
+    query: str,
+    k: int = 5,
+    hops: int = 1,
+    decay: float = 0.5,
+    pagerank_weight: float = 0.0,
+    fetch_k: Optional[int] = None,
+) -> List[GraphHit]:
+    """Vector search for ``fetch_k`` chunks, expanded along document links, top ``k`` documents.
+
+    With ``pagerank_weight`` w > 0 each score is multiplied by
+    ``1 + w * pagerank / max(pagerank)``.
+    """
+    chunk_hits = vector_store.similarity_search_with_score(query, k=fetch_k or 2 * k)
+    return rank_graph_hits(graph, chunk_hits, k, hops, decay, pagerank_weight)
+
+
+def rank_graph_hits(
+    graph: LinkGraph,
+    chunk_hits: List[Tuple[Document, float]],
+    k: int = 5,
+    hops: int = 1,
+    decay: float = 0.5,
+    pagerank_weight: float = 0.0,
+) -> List[GraphHit]:
+    """The graph part of ``graph_search``, for chunk hits that were already retrieved."""
+    seeds: Dict[int, float] = {}
+    chunks: Dict[int, List[Tuple[Document, float]]] = {}
+    for document, score in chunk_hits:
+        node = graph.index.get(document.metadata.get("doc_id"))
+        if node is None:
+            continue
+        # Clipped at 0: decaying a negative similarity would raise it
+        seeds[node] = max(seeds.get(node, 0.0), score)
+        chunks.setdefault(node, []).append((document, score))
+    if not seeds:
+        return []
+    nodes, scores, distances = graph.expand_arrays(seeds, hops, decay)
+    if pagerank_weight:
+        scores = scores * (1 + pagerank_weight * graph.pagerank[nodes] / graph.pagerank.max())
+    # Best score first; ties go to the closer, then the lower node id
+    ranked = np.lexsort((nodes, distances, -scores))[:k]
+    return [
+        GraphHit(graph.node_ids[nodes[i]], float(scores[i]), int(distances[i]), chunks.get(int(nodes[i]), []))
+        for i in ranked
+    ]
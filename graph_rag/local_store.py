@@ -0,0 +1,409 @@
+"""
+In-process vector store for the Graph RAG system.
+
+``LocalVectorStore`` implements the LangChain ``VectorStore`` interface on a
+contiguous float32 matrix with one L2-normalised row per chunk, so it needs
+no credentials or network and can back development, tests and benchmarks.
+Scores are cosine similarities.
+
+Two search modes:
+
+- exact: the query batch is multiplied with the whole matrix and the top k
+  rows are picked with ``argpartition``; results are always exact.
+- ivf: ``build_index`` clusters the rows with spherical k-means into
+  ``n_lists`` inverted lists. A query is only compared with the rows of its
+  ``n_probe`` nearest lists (plus rows added since the index was built), which
+  is approximate but scans a fraction of the matrix.
+
+``save`` writes the store to a directory (``vectors.f32``, ``docs.jsonl``,
+``meta.json`` and ``ivf.npz`` for the index) and ``load`` memory-maps the
+vectors back, so opening a large store does not read it into memory.
+"""
+import json
+import math
+import os
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+INITIAL_CAPACITY = 1024
+# Upper bound on the (queries x rows) score matrix computed at once in exact mode
+MAX_SCORE_BLOCK = 16 * 1024 * 1024
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores of each row, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(part, order, axis=1)
+
+
+def nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid of every row, computed in blocks to bound memory."""
+    block = max(1, MAX_SCORE_BLOCK // max(1, len(centroids)))
+    return np.concatenate(
+        [np.argmax(vectors[i:i + block] @ centroids.T, axis=1) for i in range(0, len(vectors), block)]
+        or [np.empty(0, dtype=np.int64)]
+    )
+
+
+def spherical_kmeans(vectors: np.ndarray, n_lists: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Unit-norm centroids of ``n_lists`` clusters of the (normalised) rows of ``vectors``.
+
+    Trains on at most 256 rows per list, which is plenty to place the
+    centroids and keeps index builds fast on large stores.
+    """
+    rng = np.random.default_rng(seed)
+    if len(vectors) > 256 * n_lists:
+        vectors = vectors[np.sort(rng.choice(len(vectors), size=256 * n_lists, replace=False))]
+    centroids = vectors[rng.choice(len(vectors), size=n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = nearest_centroids(vectors, centroids)
+        order = np.argsort(assignments, kind="stable")
+        starts = np.flatnonzero(np.r_[True, np.diff(assignments[order]) != 0])
+        # Empty clusters keep their previous centroid
+        centroids[np.unique(assignments)] = _normalise(np.add.reduceat(vectors[order], starts))
+    return centroids
+
+
+class LocalVectorStore(VectorStore):
+    """LangChain vector store on an in-memory (or memory-mapped) float32 matrix."""
+
+    def __init__(self, embedding: Embeddings, directory: Optional[str] = None, n_probe: int = 8):
+        self.embedding = embedding
+        self.directory = directory
+        self.n_probe = n_probe
+        self.dim: Optional[int] = None
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._rows = 0
+        self._ids: List[str] = []
+        self._texts: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._row_of: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        # IVF index: centroids, row numbers grouped by list, list boundaries,
+        # and the rows added since it was built (always scanned)
+        self._centroids: Optional[np.ndarray] = None
+        self._list_rows = np.empty(0, dtype=np.int64)
+        self._list_offsets = np.zeros(1, dtype=np.int64)
+        self._pending: List[int] = []
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    @property
+    def indexed(self) -> bool:
+        return self._centroids is not None
+
+    @property
+    def n_lists(self) -> int:
+        return len(self._centroids) if self.indexed else 0
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    # ------------------------------------------------------------------ writes
+
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        if hasattr(self.embedding, "embed_array"):
+            return self.embedding.embed_array(texts)
+        return np.asarray(self.embedding.embed_documents(texts), dtype=np.float32)
+
+    def _reserve(self, rows: int):
+        if rows <= len(self._vectors):
+            return
+        capacity = max(INITIAL_CAPACITY, len(self._vectors))
+        while capacity < rows:
+            capacity *= 2
+        vectors = np.empty((capacity, self.dim), dtype=np.float32)
+        vectors[:self._rows] = self._vectors[:self._rows]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._rows] = self._alive[:self._rows]
+        self._vectors, self._alive = vectors, alive
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        return self.add_vectors(self._embed_texts(texts), texts, metadatas, ids=ids)
+
+    def add_vectors(
+        self,
+        vectors: np.ndarray,
+        texts: List[str],
+        metadatas: Optional[List[dict]] = None,
+        ids: Optional[List[Optional[str]]] = None,
+    ) -> List[str]:
+        """Add precomputed embeddings; an existing id is overwritten in place."""
+        vectors = _normalise(vectors) if len(texts) else np.empty((0, self.dim or 0), dtype=np.float32)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = [id_ or str(uuid.uuid4()) for id_ in ids] if ids else [str(uuid.uuid4()) for _ in texts]
+        with self._lock:
+            if self.dim is None and len(texts):
+                self.dim = vectors.shape[1]
+                self._vectors = np.empty((0, self.dim), dtype=np.float32)
+            if len(texts) and vectors.shape[1] != self.dim:
+                raise ValueError(f"Vector store holds {self.dim}-dimensional vectors, not {vectors.shape[1]}.")
+            self._reserve(self._rows + len(texts))
+            for id_, text, metadata, vector in zip(ids, texts, metadatas, vectors):
+                row = self._row_of.get(id_)
+                if row is None:
+                    row = self._rows
+                    self._rows += 1
+                    self._row_of[id_] = row
+                    self._ids.append(id_)
+                    self._texts.append(text)
+                    self._metadatas.append(dict(metadata))
+                    self._alive[row] = True
+                else:
+                    self._texts[row] = text
+                    self._metadatas[row] = dict(metadata)
+                if self.indexed:
+                    self._pending.append(row)
+                self._vectors[row] = vector
+            # Rebuild once the unindexed rows cost as much to scan as the index saves
+            if self.indexed and len(self._pending) > max(INITIAL_CAPACITY, len(self._list_rows) // 2):
+                self.build_index(self.n_lists)
+        return ids
+
+    def delete(self, ids: Optional[Sequence[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Remove documents; their rows are skipped by searches and dropped on ``save``."""
+        if ids is None:
+            return False
+        with self._lock:
+            for id_ in ids:
+                row = self._row_of.pop(id_, None)
+                if row is not None:
+                    self._alive[row] = False
+        return True
+
+    def get_by_ids(self, ids: Sequence[str], /) -> List[Document]:
+        documents = []
+        for id_ in ids:
+            row = self._row_of.get(id_)
+            if row is not None:
+                documents.append(self._document(row))
+        return documents
+
+    def _document(self, row: int) -> Document:
+        return Document(id=self._ids[row], page_content=self._texts[row], metadata=dict(self._metadatas[row]))
+
+    # ---------------------------------------------------------------- IVF index
+
+    def build_index(self, n_lists: Optional[int] = None, iterations: int = 10, seed: int = 0):
+        """Cluster the live rows into ``n_lists`` inverted lists (default: about 4 * sqrt(rows))."""
+        with self._lock:
+            rows = np.flatnonzero(self._alive[:self._rows])
+            if len(rows) == 0:
+                self.drop_index()
+                return
+            n_lists = min(n_lists or max(1, int(4 * math.sqrt(len(rows)))), len(rows))
+            vectors = self._vectors[rows]
+            centroids = spherical_kmeans(vectors, n_lists, iterations, seed)
+            self._set_lists(centroids, rows, nearest_centroids(vectors, centroids))
+
+    def _set_lists(self, centroids: np.ndarray, rows: np.ndarray, assignments: np.ndarray):
+        order = np.argsort(assignments, kind="stable")
+        self._centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self._list_rows = rows[order]
+        self._list_offsets = np.searchsorted(assignments[order], np.arange(len(centroids) + 1))
+        self._pending = []
+
+    def drop_index(self):
+        """Go back to exact search."""
+        with self._lock:
+            self._centroids = None
+            self._list_rows = np.empty(0, dtype=np.int64)
+            self._list_offsets = np.zeros(1, dtype=np.int64)
+            self._pending = []
+
+    # ----------------------------------------------------------------- search
+
+    def _filter_mask(self, filter: Optional[Callable[[Document], bool]]) -> np.ndarray:
+        alive = self._alive[:self._rows].copy()
+        if filter is not None:
+            for row in np.flatnonzero(alive):
+                alive[row] = filter(self._document(row))
+        return alive
+
+    def search_vectors(
+        self,
+        queries: np.ndarray,
+        k: int = 4,
+        filter: Optional[Callable[[Document], bool]] = None,
+        n_probe: Optional[int] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """(row, cosine similarity) of the top ``k`` rows for each query vector, best first."""
+        queries = _normalise(queries)
+        with self._lock:
+            if self._rows == 0 or k <= 0:
+                return [[] for _ in queries]
+            mask = self._filter_mask(filter)
+            if self.indexed:
+                return self._search_ivf(queries, k, mask, n_probe or self.n_probe)
+            return self._search_exact(queries, k, mask)
+
+    def _search_exact(self, queries: np.ndarray, k: int, mask: np.ndarray) -> List[List[Tuple[int, float]]]:
+        matrix = self._vectors[:self._rows]
+        block = max(1, MAX_SCORE_BLOCK // max(1, self._rows))
+        results = []
+        for start in range(0, len(queries), block):
+            scores = queries[start:start + block] @ matrix.T
+            if not mask.all():
+                scores[:, ~mask] = -np.inf
+            for row_scores, top in zip(scores, _top_k(scores, k)):
+                results.append([(int(row), float(row_scores[row])) for row in top if mask[row]])
+        return results
+
+    def _search_ivf(self, queries: np.ndarray, k: int, mask: np.ndarray, n_probe: int) -> List[List[Tuple[int, float]]]:
+        probes = _top_k(queries @ self._centroids.T, n_probe)
+        pending = np.asarray(self._pending, dtype=np.int64)
+        results = []
+        for query, lists in zip(queries, probes):
+            candidates = np.concatenate(
+                [self._list_rows[self._list_offsets[i]:self._list_offsets[i + 1]] for i in lists] + [pending]
+            )
+            candidates = np.unique(candidates[mask[candidates]])
+            scores = self._vectors[candidates] @ query
+            top = _top_k(scores[None, :], k)[0]
+            results.append([(int(candidates[i]), float(scores[i])) for i in top])
+        return results
+
+    def similarity_search_with_score_by_vectors(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        k: int = 4,
+        filter: Optional[Callable[[Document], bool]] = None,
+        **kwargs: Any,
+    ) -> List[List[Tuple[Document, float]]]:
+        """Search for a batch of query vectors with one matrix multiply."""
+        hits = self.search_vectors(np.asarray(embeddings, dtype=np.float32), k, filter, kwargs.get("n_probe"))
+        return [[(self._document(row), score) for row, score in query_hits] for query_hits in hits]
+
+    def similarity_search_with_score_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[Callable[[Document], bool]] = None,
+        **kwargs: Any,
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vectors([embedding], k, filter, **kwargs)[0]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(self.embedding.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Cosine similarity in [-1, 1] -> relevance in [0, 1]
+        return lambda score: (score + 1.0) / 2.0
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        store = cls(embedding, **kwargs)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
+
+    # ------------------------------------------------------------ persistence
+
+    def save(self, directory: Optional[str] = None):
+        """Write the live rows (and the IVF index) to ``directory``; meta.json is replaced last."""
+        directory = directory or self.directory
+        if directory is None:
+            raise ValueError("No directory to save the vector store to.")
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            rows = np.flatnonzero(self._alive[:self._rows])
+            self._vectors[rows].tofile(os.path.join(directory, "vectors.f32.tmp"))
+            with open(os.path.join(directory, "docs.jsonl.tmp"), "w", encoding="utf-8") as f:
+                for row in rows:
+                    f.write(json.dumps({"id": self._ids[row], "text": self._texts[row],
+                                        "metadata": self._metadatas[row]}) + "\n")
+            files = ["vectors.f32", "docs.jsonl"]
+            if self.indexed:
+                # Rows are renumbered on save: store each live row's list instead of row numbers
+                assignments = np.full(self._rows, -1, dtype=np.int64)
+                for i in range(len(self._centroids)):
+                    assignments[self._list_rows[self._list_offsets[i]:self._list_offsets[i + 1]]] = i
+                if self._pending:
+                    pending = np.asarray(self._pending)
+                    assignments[pending] = nearest_centroids(self._vectors[pending], self._centroids)
+                np.savez(os.path.join(directory, "ivf.tmp.npz"), centroids=self._centroids,
+                         assignments=assignments[rows])
+                os.replace(os.path.join(directory, "ivf.tmp.npz"), os.path.join(directory, "ivf.npz"))
+            elif os.path.exists(os.path.join(directory, "ivf.npz")):
+                os.remove(os.path.join(directory, "ivf.npz"))
+            for name in files:
+                os.replace(os.path.join(directory, name + ".tmp"), os.path.join(directory, name))
+            meta = {"dim": self.dim, "rows": len(rows), "indexed": self.indexed, "n_probe": self.n_probe}
+            with open(os.path.join(directory, "meta.json.tmp"), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(os.path.join(directory, "meta.json.tmp"), os.path.join(directory, "meta.json"))
+
+    @classmethod
+    def load(cls, directory: str, embedding: Embeddings, mmap: bool = True) -> "LocalVectorStore":
+        """Open a saved store; with ``mmap`` the vectors are paged in from disk on demand."""
+        store = cls(embedding, directory)
+        meta_path = os.path.join(directory, "meta.json")
+        if not os.path.exists(meta_path):
+            return store
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        store.n_probe = meta.get("n_probe", store.n_probe)
+        if not meta["rows"]:
+            return store
+        store.dim = meta["dim"]
+        store._rows = meta["rows"]
+        shape = (store._rows, store.dim)
+        path = os.path.join(directory, "vectors.f32")
+        if mmap:
+            # Copy-on-write: updates stay in memory until the next save
+            store._vectors = np.memmap(path, dtype=np.float32, mode="c", shape=shape)
+        else:
+            store._vectors = np.fromfile(path, dtype=np.float32).reshape(shape)
+        store._alive = np.ones(store._rows, dtype=bool)
+        with open(os.path.join(directory, "docs.jsonl"), "r", encoding="utf-8") as f:
+            for row, line in enumerate(f):
+                doc = json.loads(line)
+                store._ids.append(doc["id"])
+                store._texts.append(doc["text"])
+                store._metadatas.append(doc["metadata"])
+                store._row_of[doc["id"]] = row
+        if meta.get("indexed"):
+            with np.load(os.path.join(directory, "ivf.npz")) as ivf:
+                store._set_lists(ivf["centroids"], np.arange(store._rows), ivf["assignments"])
+        return store
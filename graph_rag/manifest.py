@@ -0,0 +1,218 @@
+"""
+Incremental re-ingestion for the Graph RAG system.
+
+A local JSON manifest records, for one backend's collection, the content
+hash of every ingested markdown file and the ids of the chunks stored for it.
+Each collection has its own manifest file (see ``manifest_path``).
+On the next run ``IngestManifest.plan`` compares the current files against it:
+
+- new and changed files are split and embedded again,
+- chunks of changed and deleted files are removed from the vector store,
+- unchanged files cost nothing,
+- files that could not be read keep their entry and their chunks until a
+  later run reads them.
+
+Chunk ids contain the file's content hash, so the chunks of a new version
+never collide with the ids of the version they replace. Changing the chunk
+size or chunk overlap re-ingests every file and deletes all chunks recorded
+for the old settings. A manifest that was recorded for another collection
+is not trusted: every file is ingested again.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+from langchain_core.documents import Document
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def chunk_id(doc_id: str, file_hash: str, index: int) -> str:
+    return f"{doc_id}:{file_hash[:16]}:{index}"
+
+
+def manifest_path(base_path: str, collection_key: str) -> str:
+    """The manifest file of ``collection_key`` (``backend:collection``), next to ``base_path``."""
+    root, ext = os.path.splitext(base_path)
+    return f"{root}.{re.sub(r'[^A-Za-z0-9_.-]+', '-', collection_key)}{ext}"
+
+
+def chunk_doc_id(id_: str) -> str:
+    """The doc_id part of a ``chunk_id``."""
+    return id_.rsplit(":", 2)[0]
+
+
+class IngestPlan(NamedTuple):
+    added: List[Dict[str, Any]]
+    changed: List[Dict[str, Any]]
+    unchanged: List[str]
+    deleted: List[str]
+    stale_chunk_ids: List[str]
+    hashes: Dict[str, str]
+    # Entries kept for the files that could not be read
+    failed: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def to_embed(self) -> List[Dict[str, Any]]:
+        """Documents (as returned by ``process_all_markdown_files``) that must be split and embedded."""
+        return self.added + self.changed
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "New files": len(self.added),
+            "Changed files": len(self.changed),
+            "Unchanged files": len(self.unchanged),
+            "Deleted files": len(self.deleted),
+            "Chunks to delete": len(self.stale_chunk_ids),
+        }
+
+
+class IngestManifest:
+    """File hashes and chunk ids of what is stored in the vector store collection."""
+
+    def __init__(self, path: str, data: Dict[str, Any] = None):
+        self.path = path
+        self.data = data or {"settings": {}, "files": {}}
+
+    @classmethod
+    def load(cls, path: str) -> "IngestManifest":
+        if not os.path.exists(path):
+            return cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(path, json.load(f))
+
+    def save(self):
+        """Write the manifest atomically: a crash never leaves a half-written file."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".manifest-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @property
+    def files(self) -> Dict[str, Dict[str, Any]]:
+        return self.data["files"]
+
+    def plan(self, documents: List[Dict[str, Any]], collection_name: str, chunk_size: int, chunk_overlap: int) -> IngestPlan:
+        """Compare the current documents with the manifest.
+
+        The chunks are not known yet: after a chunk settings change, the
+        stale ids may include ids that the new chunks reuse (see
+        ``PlanBuilder.finish``). ``ChunkStream`` excludes them.
+        """
+        builder = self.plan_builder(collection_name, chunk_size, chunk_overlap, keep_content=True)
+        for document in documents:
+            builder.add(document)
+        return builder.finish()
+
+    def plan_builder(self, collection_name: str, chunk_size: int, chunk_overlap: int,
+                     keep_content: bool = False) -> "PlanBuilder":
+        """Plan one document at a time, for documents that are streamed rather than listed."""
+        settings = {"collection": collection_name, "chunk_size": chunk_size, "chunk_overlap": chunk_overlap}
+        retired_chunk_ids: List[str] = []
+        if self.data["settings"] != settings:
+            if self.data["settings"].get("collection") == collection_name:
+                # Same collection, different chunking: every stored chunk is replaced
+                retired_chunk_ids = [id_ for entry in self.files.values() for id_ in entry["chunk_ids"]]
+            # Nothing recorded is reusable
+            self.data = {"settings": settings, "files": {}}
+        return PlanBuilder(self.files, keep_content, retired_chunk_ids)
+
+    def record(self, plan: IngestPlan, ids: Iterable[str]):
+        """Update the manifest after the chunks ``ids`` were stored and the stale chunks deleted."""
+        for doc_id in plan.deleted:
+            del self.files[doc_id]
+        self.files.update(plan.failed)
+        chunk_ids: Dict[str, List[str]] = {document["doc_id"]: [] for document in plan.to_embed}
+        for id_ in ids:
+            chunk_ids[chunk_doc_id(id_)].append(id_)
+        for doc_id, doc_chunk_ids in chunk_ids.items():
+            self.files[doc_id] = {"hash": plan.hashes[doc_id], "chunk_ids": doc_chunk_ids}
+
+
+class PlanBuilder:
+    """Builds an ``IngestPlan`` from documents added one by one.
+
+    Without ``keep_content`` the plan lists documents without their
+    ``content``, so a streamed corpus is never held in memory.
+    ``retired_chunk_ids`` are stored chunks that no file entry accounts for
+    any more (those of the previous chunk settings); they are deleted too.
+    """
+
+    def __init__(self, files: Dict[str, Dict[str, Any]], keep_content: bool = False,
+                 retired_chunk_ids: Iterable[str] = ()):
+        self.files = files
+        self.keep_content = keep_content
+        self.retired_chunk_ids = list(retired_chunk_ids)
+        self.added: List[Dict[str, Any]] = []
+        self.changed: List[Dict[str, Any]] = []
+        self.unchanged: List[str] = []
+        self.stale_chunk_ids: List[str] = []
+        self.hashes: Dict[str, str] = {}
+        self.failed: List[str] = []
+
+    def add(self, document: Dict[str, Any]) -> bool:
+        """Record ``document``; True if it is new or changed and must be embedded."""
+        doc_id = document["doc_id"]
+        self.hashes[doc_id] = content_hash(document["content"])
+        entry = self.files.get(doc_id)
+        if entry is not None and entry["hash"] == self.hashes[doc_id]:
+            self.unchanged.append(doc_id)
+            return False
+        if not self.keep_content:
+            document = {key: value for key, value in document.items() if key != "content"}
+        if entry is None:
+            self.added.append(document)
+        else:
+            self.changed.append(document)
+            self.stale_chunk_ids.extend(entry["chunk_ids"])
+        return True
+
+    def fail(self, doc_id: str):
+        """Record that ``doc_id`` exists but could not be read: it is not deleted."""
+        self.failed.append(doc_id)
+
+    def finish(self, written_ids: Iterable[str] = ()) -> IngestPlan:
+        """The plan, once every current document was added: files not seen are deleted.
+
+        ``written_ids`` are the ids of the new chunks. A retired chunk with
+        one of these ids (same file content and position) was overwritten by
+        the new chunk and must not be deleted. The chunks of files that
+        failed are kept; after a chunk settings change their entry gets an
+        empty hash, so the next run that reads them replaces them.
+        """
+        failed = {doc_id: self.files[doc_id] for doc_id in self.failed if doc_id in self.files}
+        for id_ in self.retired_chunk_ids:
+            doc_id = chunk_doc_id(id_)
+            if doc_id in self.failed and doc_id not in self.files:
+                failed.setdefault(doc_id, {"hash": "", "chunk_ids": []})["chunk_ids"].append(id_)
+        deleted = sorted(set(self.files) - set(self.hashes) - set(failed))
+        stale_chunk_ids = list(self.stale_chunk_ids)
+        for doc_id in deleted:
+            stale_chunk_ids.extend(self.files[doc_id]["chunk_ids"])
+        if self.retired_chunk_ids:
+            written = set(written_ids)
+            stale_chunk_ids.extend(id_ for id_ in self.retired_chunk_ids
+                                   if id_ not in written and chunk_doc_id(id_) not in failed)
+        return IngestPlan(self.added, self.changed, self.unchanged, deleted, stale_chunk_ids, self.hashes, failed)
+
+
+def assign_chunk_ids(chunks: List[Document], hashes: Dict[str, str]) -> List[str]:
+    """Deterministic ids for the chunks of the files in ``hashes`` (numbered per file, in order)."""
+    counters: Dict[str, int] = {}
+    ids = []
+    for chunk in chunks:
+        doc_id = chunk.metadata["doc_id"]
+        index = counters.get(doc_id, 0)
+        counters[doc_id] = index + 1
+        ids.append(chunk_id(doc_id, hashes[doc_id], index))
+    return ids
@@ -0,0 +1,104 @@
+"""
+Streaming ingestion for the Graph RAG system.
+
+``ChunkStream`` connects the stages as generators: markdown files are read
+one at a time (``iter_markdown_files``), checked against the ingestion
+manifest, split with ``RecursiveCharacterTextSplitter`` and yielded as
+chunks, which ``upload_documents`` embeds and stores through its bounded
+queues. Only the file being split and a few batches of chunks are in
+memory at any time, so peak memory does not grow with the corpus.
+
+What later steps need from the whole corpus is kept without the file
+contents: the doc_id and links of every file (for the link graph), the
+number of chunks of each file (their ids, for the manifest, follow from
+it) and, once the stream is exhausted, the ``IngestPlan``.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from .manifest import IngestPlan, PlanBuilder, chunk_id
+
+
+def make_splitter(chunk_size: int = 1000, chunk_overlap: int = 200) -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=len)
+
+
+def chunk_metadata(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Metadata stored with every chunk of ``document``."""
+    return {
+        'doc_id': document['doc_id'],
+        'title': document['title'],
+        'category': document['category'],
+        'file_path': document['file_path'],
+        'linked_docs': document['links'],
+    }
+
+
+def split_document(document: Dict[str, Any], splitter: RecursiveCharacterTextSplitter,
+                   file_hash: str) -> Iterator[Document]:
+    """The chunks of one document, with their ``chunk_id`` as id."""
+    metadata = chunk_metadata(document)
+    for index, text in enumerate(splitter.split_text(document['content'])):
+        yield Document(id=chunk_id(document['doc_id'], file_hash, index), page_content=text,
+                       metadata=dict(metadata))
+
+
+class ChunkStream:
+    """Single-pass iterable of the chunks of new and changed files."""
+
+    def __init__(self, documents: Iterable[Dict[str, Any]], builder: PlanBuilder,
+                 splitter: Optional[RecursiveCharacterTextSplitter] = None):
+        self.documents = documents
+        self.builder = builder
+        self.splitter = splitter or make_splitter()
+        # doc_id, links and unresolved links of every file, for LinkGraph.from_documents
+        self.links: List[Dict[str, Any]] = []
+        # Chunks per embedded file: their ids follow from it (see chunk_ids)
+        self.chunk_counts: Dict[str, int] = {}
+        self.files = 0
+        self.characters = 0
+        self._plan: Optional[IngestPlan] = None
+        self._started = False
+
+    def __iter__(self) -> Iterator[Document]:
+        if self._started:
+            raise RuntimeError("A ChunkStream can only be iterated once.")
+        self._started = True
+        for document in self.documents:
+            self.files += 1
+            self.links.append({'doc_id': document['doc_id'], 'links': document['links'],
+                               'dangling_links': document['dangling_links']})
+            if not self.builder.add(document):
+                continue
+            self.characters += len(document['content'])
+            doc_id = document['doc_id']
+            self.chunk_counts[doc_id] = 0
+            for chunk in split_document(document, self.splitter, self.builder.hashes[doc_id]):
+                self.chunk_counts[doc_id] += 1
+                yield chunk
+        self._plan = self.builder.finish(self.chunk_ids)
+
+    @property
+    def chunk_count(self) -> int:
+        return sum(self.chunk_counts.values())
+
+    @property
+    def chunk_ids(self) -> Iterator[str]:
+        """Ids of the chunks yielded so far, in order."""
+        for doc_id, count in self.chunk_counts.items():
+            file_hash = self.builder.hashes[doc_id]
+            for index in range(count):
+                yield chunk_id(doc_id, file_hash, index)
+
+    @property
+    def completed(self) -> bool:
+        return self._plan is not None
+
+    @property
+    def plan(self) -> IngestPlan:
+        """The ingestion plan; available once every chunk was consumed."""
+        if self._plan is None:
+            raise RuntimeError("The plan is only known once the stream was consumed.")
+        return self._plan
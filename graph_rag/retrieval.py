@@ -0,0 +1,325 @@
+"""
+Query path of the Graph RAG system.
+
+A ``Retriever`` answers searches against an open vector store and, when one
+was built, the document link graph (see ``link_graph.py``). It is meant to
+be created once and kept warm (see ``service.py``):
+
+- concurrent queries are embedded together by a ``QueryBatcher``: one
+  thread embeds every query that is waiting as a single batch, so a burst
+  of searches costs one call to the embedding model instead of one each;
+- query vectors are kept in an LRU cache and search results in an LRU cache
+  whose entries expire after ``result_ttl`` seconds, so repeated questions
+  skip the model and the store;
+- every search reports the time spent embedding, searching the store and
+  expanding along the graph, and the last ``LatencyStats.window`` timings
+  of each stage are kept for percentiles.
+
+Queries are embedded with ``embed_documents`` (or ``embed_array``) so that a
+batch is one call; the supported models embed queries and documents the
+same way.
+"""
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from .config import (GRAPH_DECAY, GRAPH_HOPS, LINK_GRAPH_PATH, PAGERANK_WEIGHT, QUERY_BATCH_SIZE,
+                     QUERY_BATCH_WAIT_MS, QUERY_CACHE_SIZE, SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL_SECONDS)
+from .embeddings import get_embedding_model
+from .link_graph import GraphHit, LinkGraph, rank_graph_hits
+from .stores import open_vector_store
+from .upload import embed_batch
+
+STAGES = ("embed", "search", "graph")
+# Stops the QueryBatcher thread
+_STOP = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache of at most ``max_entries``; entries expire after ``ttl`` seconds (None: never)."""
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """The value for ``key``, or None when it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class QueryBatcher:
+    """Embeds the queries of concurrent callers in batches on one background thread.
+
+    ``embed`` blocks until the vector of its text is ready. The thread takes
+    every query waiting when it becomes free (up to ``max_batch``), and
+    waits at most ``max_wait`` seconds for more: with the default of 0 a
+    lone query is embedded at once, and queries that arrive while a batch is
+    being embedded form the next one.
+    """
+
+    def __init__(self, embedding: Embeddings, max_batch: int = 32, max_wait: float = 0.0):
+        self.embedding = embedding
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.queries = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="query-embedder", daemon=True)
+        self._thread.start()
+
+    def embed(self, text: str) -> np.ndarray:
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self) -> Tuple[List[Tuple[str, Future]], bool]:
+        """The next batch, and whether the batcher was closed meanwhile."""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stopped = False
+        while not stopped:
+            batch, stopped = self._collect()
+            if not batch:
+                continue
+            # The same question asked twice at once is embedded once
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                vectors = dict(zip(texts, embed_batch(self.embedding, texts)))
+            except BaseException as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.queries += len(batch)
+            for text, future in batch:
+                future.set_result(vectors[text])
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "queries": self.queries,
+            "mean_batch_size": self.queries / self.batches if self.batches else 0.0,
+        }
+
+
+class LatencyStats:
+    """Recent per-stage timings (milliseconds) of a retriever, for percentiles."""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: Dict[str, deque] = {stage: deque(maxlen=window) for stage in STAGES + ("total",)}
+        self._lock = threading.Lock()
+
+    def record(self, timings: Dict[str, float]):
+        with self._lock:
+            for stage, milliseconds in timings.items():
+                self._samples[stage].append(milliseconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            samples = {stage: np.array(values) for stage, values in self._samples.items()}
+        return {
+            stage: {
+                "count": len(values),
+                "p50_ms": float(np.percentile(values, 50)) if len(values) else 0.0,
+                "p99_ms": float(np.percentile(values, 99)) if len(values) else 0.0,
+            }
+            for stage, values in samples.items()
+        }
+
+
+class SearchResult(NamedTuple):
+    query: str
+    hits: List[GraphHit]
+    # Milliseconds per stage ("embed", "search", "graph") and "total"
+    timings: Dict[str, float]
+    # Whether the hits came from the result cache
+    cached: bool
+
+
+def rank_documents(chunk_hits: List[Tuple[Document, float]], k: int) -> List[GraphHit]:
+    """Chunk hits grouped into documents by best score, for searches without a link graph."""
+    documents: Dict[str, GraphHit] = {}
+    for document, score in chunk_hits:
+        doc_id = document.metadata.get("doc_id", document.id)
+        hit = documents.get(doc_id)
+        if hit is None:
+            documents[doc_id] = GraphHit(doc_id, float(score), 0, [(document, score)])
+        else:
+            hit.chunks.append((document, score))
+            if score > hit.score:
+                documents[doc_id] = hit._replace(score=float(score))
+    return sorted(documents.values(), key=lambda hit: -hit.score)[:k]
+
+
+class Retriever:
+    """Warm search over a vector store and an optional link graph, with query batching and caches."""
+
+    def __init__(
+        self,
+        embedding: Embeddings,
+        vector_store: VectorStore,
+        graph: Optional[LinkGraph] = None,
+        hops: int = 1,
+        decay: float = 0.5,
+        pagerank_weight: float = 0.0,
+        batch_size: int = 32,
+        batch_wait: float = 0.0,
+        query_cache_size: int = 4096,
+        result_cache_size: int = 1024,
+        result_ttl: float = 300.0,
+    ):
+        self.embedding = embedding
+        self.vector_store = vector_store
+        self.graph = graph
+        self.hops = hops
+        self.decay = decay
+        self.pagerank_weight = pagerank_weight
+        self.batcher = QueryBatcher(embedding, batch_size, batch_wait)
+        # A query's vector never changes; results do once the store is updated
+        self.query_cache = TTLCache(query_cache_size)
+        self.result_cache = TTLCache(result_cache_size, result_ttl)
+        self.latency = LatencyStats()
+
+    def close(self):
+        self.batcher.close()
+
+    def warm_up(self):
+        """Embed and search once so that clients, connections and memory maps are ready before the first request."""
+        self._search_uncached("warm-up", 1, self.hops)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        vector = self.query_cache.get(query)
+        if vector is None:
+            vector = self.batcher.embed(query)
+            self.query_cache.put(query, vector)
+        return vector
+
+    def search(self, query: str, k: int = 5, hops: Optional[int] = None) -> SearchResult:
+        """The top ``k`` documents for ``query``, expanded ``hops`` links along the graph (default: ``self.hops``)."""
+        hops = self.hops if hops is None else hops
+        started = time.perf_counter()
+        key = (query, k, hops)
+        hits = self.result_cache.get(key)
+        if hits is not None:
+            timings = dict.fromkeys(STAGES, 0.0)
+            timings["total"] = (time.perf_counter() - started) * 1000
+            self.latency.record({"total": timings["total"]})
+            return SearchResult(query, hits, timings, True)
+        hits, timings = self._search_uncached(query, k, hops)
+        self.result_cache.put(key, hits)
+        timings["total"] = (time.perf_counter() - started) * 1000
+        self.latency.record(timings)
+        return SearchResult(query, hits, timings, False)
+
+    def _search_uncached(self, query: str, k: int, hops: int) -> Tuple[List[GraphHit], Dict[str, float]]:
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        vector = self.embed_query(query)
+        timings["embed"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        # Fetch more chunks than documents: several chunks can share one
+        chunk_hits = self.vector_store.similarity_search_with_score_by_vector(vector.tolist(), k=2 * k)
+        timings["search"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        if self.graph is not None:
+            hits = rank_graph_hits(self.graph, chunk_hits, k, hops, self.decay, self.pagerank_weight)
+        else:
+            hits = rank_documents(chunk_hits, k)
+        timings["graph"] = (time.perf_counter() - start) * 1000
+        return hits, timings
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "query_cache": self.query_cache.stats(),
+            "result_cache": self.result_cache.stats(),
+            "batching": self.batcher.stats(),
+            "latency": self.latency.summary(),
+        }
+
+
+def open_retriever(backend: Optional[str] = None) -> Retriever:
+    """A retriever on the store and link graph written by ingestion, with the settings of config.py."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    # Queries are cached in memory by the retriever; the disk cache would add a write per new query
+    embedding = get_embedding_model(cache=False)
+    graph = LinkGraph.load(LINK_GRAPH_PATH) if os.path.exists(LINK_GRAPH_PATH) else None
+    return Retriever(
+        embedding,
+        open_vector_store(embedding, backend),
+        graph,
+        hops=GRAPH_HOPS,
+        decay=GRAPH_DECAY,
+        pagerank_weight=PAGERANK_WEIGHT,
+        batch_size=QUERY_BATCH_SIZE,
+        batch_wait=QUERY_BATCH_WAIT_MS / 1000,
+        query_cache_size=QUERY_CACHE_SIZE,
+        result_cache_size=SEARCH_CACHE_SIZE,
+        result_ttl=SEARCH_CACHE_TTL_SECONDS,
+    )
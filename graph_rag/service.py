@@ -0,0 +1,137 @@
+"""
+Retrieval service for the Graph RAG system.
+
+A long-lived FastAPI app around one warm ``Retriever`` (see retrieval.py):
+the embedding model, the vector store client and the link graph are opened
+once, at startup, and shared by every request.
+
+    GET /search?q=...&k=5&hops=1   top documents, with per-stage timings
+    GET /stats                     cache, batching and latency statistics
+    GET /health
+
+Run after ingestion, from the repository root:
+
+    python -m graph_rag serve --port 8090
+    uvicorn graph_rag.service:app --port 8090
+
+Searches run on a pool of SERVICE_WORKERS threads, so concurrent requests
+reach the query batcher together and are embedded in one call. Stage
+timings are also sent as a ``Server-Timing`` header.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Response
+from pydantic import BaseModel
+
+from .config import GRAPH_HOPS, SERVICE_WORKERS, VECTOR_STORE_BACKEND
+from .retrieval import Retriever, open_retriever
+
+# Largest k and number of hops a request may ask for
+MAX_K = 50
+MAX_HOPS = 3
+
+_executor = ThreadPoolExecutor(max_workers=SERVICE_WORKERS, thread_name_prefix="rag-search")
+_retriever: Optional[Retriever] = None
+
+
+class SearchChunk(BaseModel):
+    chunk_id: Optional[str]
+    content: str
+    score: float
+    title: Optional[str] = None
+    file_path: Optional[str] = None
+
+
+class SearchHit(BaseModel):
+    doc_id: str
+    score: float
+    # 0 for documents found by the vector search, else their link distance from one
+    hops: int
+    chunks: List[SearchChunk]
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchHit]
+    # Milliseconds spent in "embed", "search", "graph" and "total"
+    timings: Dict[str, float]
+    cached: bool
+
+
+def get_retriever() -> Retriever:
+    global _retriever
+    if _retriever is None:
+        try:
+            _retriever = open_retriever()
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error opening the retriever: {str(e)}. Please check that ingestion has run for the "
+                       f"'{VECTOR_STORE_BACKEND}' backend and that the environment variables are set."
+            )
+    return _retriever
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the clients and run one search before serving, so the first request is not a cold one
+    try:
+        retriever = get_retriever()
+        await asyncio.get_running_loop().run_in_executor(_executor, retriever.warm_up)
+    except Exception as e:
+        print(f"⚠️  Retriever warm-up failed: {e}")
+    yield
+    if _retriever is not None:
+        _retriever.close()
+
+
+app = FastAPI(title="Galaxium Travels Graph RAG Search", lifespan=lifespan)
+
+
+def to_hit(hit) -> SearchHit:
+    return SearchHit(
+        doc_id=hit.doc_id,
+        score=hit.score,
+        hops=hit.hops,
+        chunks=[
+            SearchChunk(chunk_id=document.id, content=document.page_content, score=score,
+                        title=document.metadata.get("title"), file_path=document.metadata.get("file_path"))
+            for document, score in hit.chunks
+        ],
+    )
+
+
+@app.get("/search", response_model=SearchResponse)
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, description="The question to search for"),
+    k: int = Query(5, ge=1, le=MAX_K, description="Number of documents to return"),
+    hops: Optional[int] = Query(None, ge=0, le=MAX_HOPS, description=f"Links to follow from the vector hits (default {GRAPH_HOPS})"),
+    retriever: Retriever = Depends(get_retriever),
+):
+    try:
+        result = await asyncio.get_running_loop().run_in_executor(_executor, retriever.search, q, k, hops)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching: {str(e)}")
+    response.headers["Server-Timing"] = ", ".join(
+        f"{stage};dur={milliseconds:.2f}" for stage, milliseconds in result.timings.items()
+    )
+    return SearchResponse(query=q, results=[to_hit(hit) for hit in result.hits],
+                          timings=result.timings, cached=result.cached)
+
+
+@app.get("/stats")
+async def stats(retriever: Retriever = Depends(get_retriever)):
+    return retriever.stats()
+
+
+@app.get("/health")
+async def health(retriever: Retriever = Depends(get_retriever)):
+    return {
+        "status": "ok",
+        "backend": VECTOR_STORE_BACKEND,
+        "graph_nodes": len(retriever.graph) if retriever.graph is not None else 0,
+    }
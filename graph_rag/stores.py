@@ -0,0 +1,55 @@
+"""
+Vector store backends of the Graph RAG system.
+
+``open_vector_store`` opens the store selected by ``VECTOR_STORE_BACKEND``
+for ingestion and for the query path alike. Each backend's client is
+imported only when it is opened, so the local backend runs without the
+AstraDB client installed.
+"""
+import os
+from typing import Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from .config import (COLLECTION_NAME, DEFAULT_KEYSPACE, IVF_PROBES, LOCAL_STORE_DIRECTORY,
+                     VECTOR_STORE_BACKEND, VECTOR_STORE_BACKENDS)
+
+
+def open_astradb_store(embedding: Embeddings, collection_name: str = COLLECTION_NAME) -> VectorStore:
+    """The AstraDB collection, configured to store vectors as plain float arrays."""
+    from langchain_astradb import AstraDBVectorStore
+    from astrapy.api_options import APIOptions, SerdesOptions
+
+    api_options = APIOptions(
+        serdes_options=SerdesOptions(
+            binary_encode_vectors=False,  # Key flag for Langflow compatibility
+            custom_datatypes_in_reading=False
+        )
+    )
+    return AstraDBVectorStore(
+        embedding=embedding,
+        collection_name=collection_name,
+        token=os.getenv("ASTRA_DB_APPLICATION_TOKEN"),
+        api_endpoint=os.getenv("ASTRA_DB_API_ENDPOINT"),
+        namespace=os.getenv("ASTRA_DB_KEYSPACE", DEFAULT_KEYSPACE),
+        api_options=api_options,
+    )
+
+
+def open_local_store(embedding: Embeddings, directory: str = LOCAL_STORE_DIRECTORY) -> VectorStore:
+    """The in-process store saved under ``directory`` (empty if nothing was saved yet)."""
+    from .local_store import LocalVectorStore
+
+    vector_store = LocalVectorStore.load(directory, embedding)
+    vector_store.n_probe = IVF_PROBES
+    return vector_store
+
+
+def open_vector_store(embedding: Embeddings, backend: Optional[str] = None) -> VectorStore:
+    backend = backend or VECTOR_STORE_BACKEND
+    if backend == "local":
+        return open_local_store(embedding)
+    if backend == "astradb":
+        return open_astradb_store(embedding)
+    raise ValueError(f"Unknown vector store backend '{backend}'. Valid values are: {', '.join(VECTOR_STORE_BACKENDS)}.")
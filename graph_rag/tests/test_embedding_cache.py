@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from graph_rag.embedding_cache import CachedEmbeddings, EmbeddingCache, text_key
+
+
+class CountingEmbeddings(Embeddings):
+    """Deterministic 4-dimensional embeddings that record every text sent to the model."""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), float(sum(map(ord, text)) % 97), 1.0, 0.5] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_texts_are_embedded_once_across_runs(tmp_path):
+    model = CountingEmbeddings()
+    first = CachedEmbeddings(model, str(tmp_path)).embed_documents(["a", "b", "a"])
+    assert model.calls == [["a", "b"]]
+
+    second = CachedEmbeddings(model, str(tmp_path)).embed_documents(["b", "c", "a"])
+    assert model.calls == [["a", "b"], ["c"]]
+    assert second[0] == first[1]
+    assert second[2] == first[0]
+
+
+def test_queries_and_documents_are_cached_separately(tmp_path):
+    model = CountingEmbeddings()
+    cached = CachedEmbeddings(model, str(tmp_path))
+    cached.embed_documents(["mars"])
+    cached.embed_query("mars")
+    cached.embed_query("mars")
+    assert model.calls == [["mars"], ["mars"]]
+
+
+def test_models_use_separate_namespaces(tmp_path):
+    first = CachedEmbeddings(CountingEmbeddings(), str(tmp_path), namespace="model-a")
+    second = CachedEmbeddings(CountingEmbeddings(), str(tmp_path), namespace="model-b")
+    first.embed_documents(["x"])
+    second.embed_documents(["x"])
+    assert second.model.calls == [["x"]]
+    assert first.cache.path != second.cache.path
+
+
+def test_cache_grows_beyond_initial_capacity(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "grow", dim=2)
+    keys = [text_key(str(i)) for i in range(3000)]
+    vectors = np.arange(6000, dtype=np.float32).reshape(3000, 2)
+    cache.put_many(keys, vectors)
+    reopened = EmbeddingCache(str(tmp_path), "grow")
+    assert len(reopened) == 3000
+    assert np.array_equal(reopened.get_many([keys[2999]])[0], vectors[2999])
+
+
+def test_least_recently_used_rows_are_evicted(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "evict", dim=2, max_bytes=10 * (2 * 4 + 32 + 8))
+    old, recent = [text_key(f"old{i}") for i in range(5)], [text_key(f"new{i}") for i in range(5)]
+    cache.put_many(old, np.zeros((5, 2)))
+    cache.put_many(recent, np.ones((5, 2)))
+    cache.get_many(recent)
+    cache.put_many([text_key("newest")], np.full((1, 2), 2.0))
+    assert len(cache) == 9
+    assert cache.evictions == 2
+    assert cache.get_many(old[:2]) == [None, None]
+    assert all(vector is not None for vector in cache.get_many(recent))
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    EmbeddingCache(str(tmp_path), "dims", dim=2).put_many([text_key("a")], np.zeros((1, 2)))
+    with pytest.raises(ValueError):
+        EmbeddingCache(str(tmp_path), "dims", dim=3)
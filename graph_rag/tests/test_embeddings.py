@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from graph_rag.embeddings import SimpleEmbeddings
+
+TEXTS = [
+    "Passengers must complete safety training before launch.",
+    "Safety training is required for every passenger before launch.",
+    "The quarterly revenue audit covers partner contracts.",
+    "",
+]
+
+
+def test_batch_is_a_normalised_float32_matrix():
+    matrix = SimpleEmbeddings().embed_array(TEXTS)
+    assert matrix.dtype == np.float32
+    assert matrix.shape == (4, 384)
+    assert np.allclose(np.linalg.norm(matrix[:3], axis=1), 1.0)
+    assert not matrix[3].any()
+
+
+def test_batch_matches_one_text_at_a_time():
+    model = SimpleEmbeddings()
+    batch = model.embed_array(TEXTS)
+    for text, row in zip(TEXTS, batch):
+        assert np.array_equal(model.embed_array([text])[0], row)
+    assert np.allclose(model.embed_query(TEXTS[0]), batch[0])
+
+
+def test_similar_texts_are_closer_than_unrelated_ones():
+    matrix = SimpleEmbeddings().embed_array(TEXTS)
+    assert matrix[0] @ matrix[1] > matrix[0] @ matrix[2]
+
+
+def test_global_random_state_is_untouched():
+    np.random.seed(7)
+    expected = np.random.rand(3)
+    np.random.seed(7)
+    SimpleEmbeddings().embed_documents(TEXTS)
+    assert np.array_equal(np.random.rand(3), expected)
+
+
+def test_vectors_are_identical_across_processes():
+    script = "from graph_rag.embeddings import SimpleEmbeddings; print(SimpleEmbeddings().embed_array(['lunar orbit'])[0].tobytes().hex())"
+    repo_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    outputs = set()
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        result = subprocess.run([sys.executable, "-c", script], cwd=repo_dir, env=env,
+                                capture_output=True, text=True, check=True)
+        outputs.add(result.stdout)
+    assert outputs == {SimpleEmbeddings().embed_array(["lunar orbit"])[0].tobytes().hex() + "\n"}
@@ -0,0 +1,48 @@
+import pytest
+
+from graph_rag.evaluation import compare_reports, evaluate, recall_at_k, reciprocal_rank
+
+DOCUMENTS = {
+    "refunds.md": "# Refunds\n\nRefunds are issued within fourteen days of a cancellation.\n\n"
+                  "See the [terms](legal/terms.md) for the full policy.\n",
+    "legal/terms.md": "# Terms\n\nAll payments are final except as specified in the cancellation section.\n",
+    "training.md": "# Training\n\nMars missions require six months of crew training in the centrifuge.\n",
+}
+
+
+def test_recall_and_reciprocal_rank():
+    ranked = ["a.md", "b.md", "c.md"]
+    assert recall_at_k(ranked, ["b.md", "d.md"], 1) == 0.0
+    assert recall_at_k(ranked, ["b.md", "d.md"], 2) == 0.5
+    assert reciprocal_rank(ranked, ["c.md", "b.md"]) == 0.5
+    assert reciprocal_rank(ranked, ["d.md"]) == 0.0
+
+
+def test_compare_reports_knows_which_direction_is_better():
+    baseline = {"quality": {"mrr": 0.5}, "latency_ms": {"p50": 2.0}, "ingestion": {"seconds": 1.0}}
+    report = {"quality": {"mrr": 0.6}, "latency_ms": {"p50": 3.0}, "ingestion": {"seconds": 1.0}}
+    rows = {row["metric"]: row for row in compare_reports(baseline, report)}
+    assert rows["quality.mrr"]["better"] is True
+    assert rows["quality.mrr"]["change"] == pytest.approx(0.1)
+    assert rows["latency_ms.p50"]["better"] is False
+    assert rows["ingestion.seconds"]["better"] is None
+
+
+def test_evaluate_reports_quality_throughput_and_latency(tmp_path):
+    for doc_id, content in DOCUMENTS.items():
+        path = tmp_path / doc_id
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    queries = [
+        {"query": "Mars missions require six months of crew training", "relevant": ["training.md"]},
+        {"query": "Refunds are issued within fourteen days", "relevant": ["refunds.md", "legal/terms.md"]},
+    ]
+    report = evaluate(str(tmp_path), queries, k_values=(1, 3), chunk_size=200, chunk_overlap=0, hops=1)
+    assert report["corpus"] == {"files": 3, "characters": report["corpus"]["characters"], "chunks": 3,
+                                "links": 1, "queries": 2}
+    assert report["quality"]["recall@1"] == pytest.approx(0.75)
+    # The terms are reached through the link from the refunds page
+    assert report["quality"]["recall@3"] == 1.0
+    assert report["quality"]["mrr"] == 1.0
+    assert report["ingestion"]["chunks_per_second"] > 0
+    assert 0 < report["latency_ms"]["p50"] <= report["latency_ms"]["p99"]
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from graph_rag.ingestion import CorpusIndex, extract_metadata_from_markdown, process_all_markdown_files
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    files = {
+        "guide.md": "# Guide\n[Top](top.md)",
+        "top.md": "# Top",
+        "a/one.md": (
+            "# One\n"
+            "[two](two.md) [two again](./two.md#intro) [top](../top.md) [root bare](guide.md)\n"
+            "[spaced](../b/my%20notes.md) [absolute]({root}/b/three.md) [outside](../../escape.md)\n"
+            "[missing](../b/missing.md) [web](https://example.com/page.md) [image](pic.png)\n"
+        ),
+        "a/two.md": "# Two",
+        "b/three.md": "# Three",
+        "b/my notes.md": "# Notes",
+    }
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content.format(root=tmp_path))
+    return tmp_path
+
+
+def test_links_are_resolved_lexically_against_the_corpus(corpus):
+    document = extract_metadata_from_markdown(str(corpus / "a" / "one.md"), str(corpus), CorpusIndex(str(corpus)))
+    assert document["doc_id"] == os.path.join("a", "one.md")
+    assert document["links"] == [
+        os.path.join("a", "two.md"),
+        os.path.join("a", "two.md"),
+        "top.md",
+        "guide.md",
+        os.path.join("b", "my notes.md"),
+        os.path.join("b", "three.md"),
+    ]
+    assert document["dangling_links"] == [os.path.join("..", "escape.md"), os.path.join("b", "missing.md")]
+    assert document["metadata"]["link_count"] == 6
+    assert document["metadata"]["dangling_link_count"] == 2
+
+
+def test_index_matches_paths_relative_to_a_relative_root(corpus, monkeypatch):
+    monkeypatch.chdir(corpus.parent)
+    index = CorpusIndex(corpus.name)
+    assert os.path.join("b", "my notes.md") in index and len(index) == 6
+    assert index.doc_id(os.path.join(corpus.name, "a", "two.md")) == os.path.join("a", "two.md")
+    assert index.resolve("top.md", "a/two.md") == (os.path.join("a", "two.md"), True)
+
+
+def test_serial_and_parallel_runs_report_the_same_links(corpus):
+    serial = process_all_markdown_files(str(corpus), workers=1, verbose=False)
+    parallel = process_all_markdown_files(str(corpus), workers=2, chunksize=1, verbose=False)
+    assert serial == parallel
+    assert [document["doc_id"] for document in serial][:2] == [os.path.join("a", "one.md"), os.path.join("a", "two.md")]
+
+
+def test_parallel_run_keeps_file_order_and_survives_a_bad_file(corpus, capsys):
+    # Not UTF-8: reading it fails in whichever process extracts it
+    (corpus / "a" / "broken.md").write_bytes(b"# Broken \xff\xfe\n")
+    serial = process_all_markdown_files(str(corpus), workers=1)
+    serial_log = capsys.readouterr().out
+    parallel = process_all_markdown_files(str(corpus), workers=3, chunksize=2)
+    parallel_log = capsys.readouterr().out
+    assert serial == parallel
+    assert [document["doc_id"] for document in parallel] == sorted(document["doc_id"] for document in parallel)
+    assert len(parallel) == 6 and os.path.join("a", "broken.md") not in {document["doc_id"] for document in parallel}
+    assert "Error processing" in serial_log and "Error processing" in parallel_log
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from graph_rag.link_graph import LinkGraph, rank_graph_hits
+
+# a -> b -> c -> d, a -> c, e isolated; "x.md" does not exist
+DOCUMENTS = [
+    {"doc_id": "a.md", "links": ["b.md", "c.md", "x.md"]},
+    {"doc_id": "b.md", "links": ["c.md", "c.md"]},
+    {"doc_id": "c.md", "links": ["d.md", "c.md"]},
+    {"doc_id": "d.md", "links": []},
+    {"doc_id": "e.md", "links": []},
+]
+
+
+@pytest.fixture
+def graph():
+    return LinkGraph.from_documents(DOCUMENTS)
+
+
+def test_csr_adjacency_drops_duplicates_self_links_and_dangling_links(graph):
+    assert graph.edge_count == 4
+    assert graph.dangling_links == 1
+    assert graph.links_from("a.md") == ["b.md", "c.md"]
+    assert graph.links_from("c.md") == ["d.md"]
+    assert graph.links_to("c.md") == ["a.md", "b.md"]
+
+
+def test_pagerank_favours_linked_documents(graph):
+    assert graph.pagerank.sum() == pytest.approx(1.0)
+    rank = dict(zip(graph.node_ids, graph.pagerank))
+    assert rank["d.md"] > rank["c.md"] > rank["b.md"] > rank["a.md"]
+    assert rank["a.md"] == pytest.approx(rank["e.md"])
+
+
+def test_expansion_decays_per_hop_and_keeps_best_score(graph):
+    a, b, c, d = (graph.index[name] for name in ("a.md", "b.md", "c.md", "d.md"))
+    assert graph.expand({a: 1.0}, hops=0) == {a: (1.0, 0)}
+    assert graph.expand({a: 1.0}, hops=2, direction="out") == {
+        a: (1.0, 0), b: (0.5, 1), c: (0.5, 1), d: (0.25, 2),
+    }
+    # Backlinks: d is reached from c, and b from a seed with a better score
+    expanded = graph.expand({d: 0.8, b: 0.1}, hops=1, direction="in")
+    assert expanded[c] == (0.4, 1)
+    assert expanded[a] == (pytest.approx(0.05), 1)
+
+
+def test_rank_graph_hits_merges_chunks_per_document(graph):
+    hits = [
+        (Document(page_content="a1", metadata={"doc_id": "a.md"}), 0.9),
+        (Document(page_content="a2", metadata={"doc_id": "a.md"}), 0.7),
+        (Document(page_content="unknown", metadata={"doc_id": "z.md"}), 0.95),
+    ]
+    ranked = rank_graph_hits(graph, hits, k=3, hops=1, decay=0.5)
+    assert [(hit.doc_id, hit.hops) for hit in ranked] == [("a.md", 0), ("b.md", 1), ("c.md", 1)]
+    assert ranked[0].score == 0.9 and len(ranked[0].chunks) == 2
+    assert ranked[1].chunks == []
+
+    with_prior = rank_graph_hits(graph, hits, k=3, hops=1, decay=0.5, pagerank_weight=1.0)
+    assert [hit.doc_id for hit in with_prior][1:] == ["c.md", "b.md"]
+
+
+def test_save_and_load(tmp_path, graph):
+    path = str(tmp_path / "graph.npz")
+    graph.save(path)
+    loaded = LinkGraph.load(path)
+    assert loaded.node_ids == graph.node_ids
+    assert np.array_equal(loaded.indices, graph.indices)
+    assert np.array_equal(loaded.pagerank, graph.pagerank)
+    assert loaded.links_to("c.md") == ["a.md", "b.md"]
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from graph_rag.embeddings import SimpleEmbeddings
+from graph_rag.local_store import LocalVectorStore
+
+TEXTS = [
+    "Lunar orbit packages include a three day stay at the station.",
+    "Mars missions require six months of crew training.",
+    "Refunds are issued within fourteen days of a cancellation.",
+    "The spaceport runway is inspected before every launch.",
+]
+
+
+@pytest.fixture
+def store():
+    store = LocalVectorStore(SimpleEmbeddings())
+    store.add_texts(TEXTS, [{"category": f"c{i % 2}"} for i in range(4)], ids=[f"doc{i}" for i in range(4)])
+    return store
+
+
+def clustered_vectors(rows, dim=32, clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    return (centres[rng.integers(clusters, size=rows)] + 0.3 * rng.normal(size=(rows, dim))).astype(np.float32)
+
+
+def test_exact_search_finds_the_matching_text(store):
+    doc, score = store.similarity_search_with_score("Refunds after a cancellation", k=1)[0]
+    assert doc.id == "doc2"
+    assert doc.metadata == {"category": "c0"}
+    assert 0 < score <= 1
+
+
+def test_filter_and_delete(store):
+    docs = store.similarity_search("Refunds after a cancellation", k=4, filter=lambda d: d.metadata["category"] == "c1")
+    assert {doc.id for doc in docs} == {"doc1", "doc3"}
+    store.delete(["doc2"])
+    assert len(store) == 3
+    assert "doc2" not in [doc.id for doc in store.similarity_search("Refunds after a cancellation", k=4)]
+    assert store.get_by_ids(["doc2", "doc0"])[0].id == "doc0"
+
+
+def test_adding_an_existing_id_replaces_it(store):
+    store.add_texts(["Refunds are never issued."], ids=["doc2"])
+    assert len(store) == 4
+    assert store.get_by_ids(["doc2"])[0].page_content == "Refunds are never issued."
+
+
+def test_batched_search_matches_single_queries():
+    vectors = clustered_vectors(500)
+    store = LocalVectorStore(SimpleEmbeddings())
+    store.add_vectors(vectors, [str(i) for i in range(500)])
+    batch = store.search_vectors(vectors[:10], k=5)
+    for hits, vector in zip(batch, vectors[:10]):
+        single = store.search_vectors(vector, k=5)[0]
+        assert [row for row, _ in hits] == [row for row, _ in single]
+        assert np.allclose([score for _, score in hits], [score for _, score in single], atol=1e-6)
+    assert [hits[0][0] for hits in batch] == list(range(10))
+
+
+def test_ivf_recall_and_rows_added_after_build():
+    vectors = clustered_vectors(3000)
+    store = LocalVectorStore(SimpleEmbeddings(), n_probe=6)
+    store.add_vectors(vectors, [str(i) for i in range(3000)])
+    queries = vectors[:50] + 0.05
+    exact = store.search_vectors(queries, k=10)
+    store.build_index(n_lists=40)
+    approximate = store.search_vectors(queries, k=10)
+    recall = np.mean([len({r for r, _ in a} & {r for r, _ in e}) / 10 for a, e in zip(approximate, exact)])
+    assert recall > 0.9
+
+    ids = store.add_vectors(vectors[:1] * -1, ["opposite"])
+    hit = store.search_vectors(vectors[:1] * -1, k=1)[0][0]
+    assert store.get_by_ids(ids)[0].page_content == "opposite" and hit[0] == 3000
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_save_and_load_round_trip(tmp_path, store, indexed):
+    store.delete(["doc1"])
+    if indexed:
+        store.build_index(n_lists=2)
+    store.save(str(tmp_path))
+    loaded = LocalVectorStore.load(str(tmp_path), SimpleEmbeddings())
+    assert isinstance(loaded._vectors, np.memmap)
+    assert loaded.indexed == indexed
+    assert len(loaded) == 3
+    query = "Refunds after a cancellation"
+    expected = store.similarity_search_with_score(query, k=3)
+    results = loaded.similarity_search_with_score(query, k=3)
+    assert [doc for doc, _ in results] == [doc for doc, _ in expected]
+    assert np.allclose([score for _, score in results], [score for _, score in expected], atol=1e-6)
+    loaded.add_texts(["New text"], ids=["doc9"])
+    assert loaded.get_by_ids(["doc9"])[0].page_content == "New text"
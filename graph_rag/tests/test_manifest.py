@@ -0,0 +1,110 @@
+from graph_rag.manifest import IngestManifest, chunk_id, content_hash, manifest_path
+
+
+def document(doc_id, content):
+    return {"doc_id": doc_id, "content": content}
+
+
+def ingest(manifest, documents, collection="local:test", chunk_size=300, chunk_overlap=50, chunks=2):
+    """Plan ``documents`` and record ``chunks`` chunk ids for every file that had to be embedded."""
+    plan = manifest.plan(documents, collection, chunk_size, chunk_overlap)
+    ids = [chunk_id(doc["doc_id"], plan.hashes[doc["doc_id"]], i) for doc in plan.to_embed for i in range(chunks)]
+    manifest.record(plan, ids)
+    return plan
+
+
+def test_plan_sorts_files_into_added_changed_unchanged_and_deleted(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    first = ingest(manifest, [document("a.md", "A"), document("b.md", "B"), document("c.md", "C")])
+    assert first.summary() == {"New files": 3, "Changed files": 0, "Unchanged files": 0,
+                               "Deleted files": 0, "Chunks to delete": 0}
+    old_b = manifest.files["b.md"]["chunk_ids"]
+    old_c = manifest.files["c.md"]["chunk_ids"]
+
+    plan = ingest(manifest, [document("a.md", "A"), document("b.md", "B2"), document("d.md", "D")])
+    assert [doc["doc_id"] for doc in plan.added] == ["d.md"]
+    assert [doc["doc_id"] for doc in plan.changed] == ["b.md"]
+    assert (plan.unchanged, plan.deleted) == (["a.md"], ["c.md"])
+    assert plan.stale_chunk_ids == old_b + old_c
+    assert sorted(manifest.files) == ["a.md", "b.md", "d.md"]
+    assert manifest.files["b.md"] == {"hash": content_hash("B2"),
+                                      "chunk_ids": [chunk_id("b.md", content_hash("B2"), i) for i in range(2)]}
+
+
+def test_manifest_round_trips_through_its_file(tmp_path):
+    path = str(tmp_path / "manifest.json")
+    manifest = IngestManifest(path)
+    ingest(manifest, [document("a.md", "A")])
+    manifest.save()
+    plan = ingest(IngestManifest.load(path), [document("a.md", "A")])
+    assert (plan.to_embed, plan.unchanged) == ([], ["a.md"])
+
+
+def test_chunk_settings_change_deletes_every_recorded_chunk(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    ingest(manifest, [document("a.md", "A"), document("b.md", "B")], chunks=3)
+    recorded = [id_ for entry in manifest.files.values() for id_ in entry["chunk_ids"]]
+
+    plan = manifest.plan([document("a.md", "A"), document("b.md", "B")], "local:test", 500, 50)
+    assert plan.summary()["New files"] == 2
+    # Chunks beyond the new per-file count would otherwise stay in the collection
+    assert plan.stale_chunk_ids == recorded
+
+
+def test_retired_chunks_overwritten_by_new_chunks_are_kept(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    ingest(manifest, [document("a.md", "A")], chunks=3)
+    builder = manifest.plan_builder("local:test", 500, 50)
+    builder.add(document("a.md", "A"))
+    # One chunk with the new settings: it reuses (and overwrites) the id of the old first chunk
+    plan = builder.finish([chunk_id("a.md", content_hash("A"), 0)])
+    assert plan.stale_chunk_ids == [chunk_id("a.md", content_hash("A"), i) for i in (1, 2)]
+
+
+def test_collection_change_deletes_nothing(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    ingest(manifest, [document("a.md", "A")])
+    plan = manifest.plan([document("a.md", "A")], "astradb:test", 300, 50)
+    assert plan.summary()["New files"] == 1
+    assert plan.stale_chunk_ids == []
+
+
+def test_files_that_fail_to_read_keep_their_entry_and_chunks(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    ingest(manifest, [document("a.md", "A"), document("b.md", "B")])
+    entry = manifest.files["b.md"]
+    builder = manifest.plan_builder("local:test", 300, 50)
+    builder.add(document("a.md", "A"))
+    builder.fail("b.md")
+    plan = builder.finish()
+    assert (plan.deleted, plan.stale_chunk_ids) == ([], [])
+    manifest.record(plan, [])
+    assert manifest.files["b.md"] == entry
+
+    # After a chunk settings change the old chunks are kept too, and replaced once the file is read
+    old_a = manifest.files["a.md"]["chunk_ids"]
+    builder = manifest.plan_builder("local:test", 500, 50)
+    builder.add(document("a.md", "A"))
+    builder.fail("b.md")
+    plan = builder.finish()
+    assert plan.stale_chunk_ids == old_a
+    manifest.record(plan, [])
+    assert manifest.files["b.md"] == {"hash": "", "chunk_ids": entry["chunk_ids"]}
+    plan = ingest(manifest, [document("a.md", "A"), document("b.md", "B")], chunk_size=500)
+    assert [doc["doc_id"] for doc in plan.changed] == ["b.md"]
+    assert plan.stale_chunk_ids == entry["chunk_ids"]
+
+
+def test_each_collection_has_its_own_manifest(tmp_path):
+    base = str(tmp_path / ".ingest_manifest.json")
+    local = IngestManifest(manifest_path(base, "local:graph_rag"))
+    ingest(local, [document("a.md", "A")], collection="local:graph_rag")
+    local.save()
+    assert local.path == str(tmp_path / ".ingest_manifest.local-graph_rag.json")
+
+    # Ingesting another backend leaves the local manifest, and the chunks it accounts for, alone
+    astra = IngestManifest.load(manifest_path(base, "astradb:graph_rag"))
+    assert ingest(astra, [document("a.md", "A")], collection="astradb:graph_rag").summary()["New files"] == 1
+    astra.save()
+    plan = ingest(IngestManifest.load(local.path), [document("a.md", "A")], collection="local:graph_rag")
+    assert plan.unchanged == ["a.md"]
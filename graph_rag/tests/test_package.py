@@ -0,0 +1,69 @@
+import os
+import re
+import subprocess
+import sys
+
+import graph_rag
+from graph_rag import cli, retrieval
+from graph_rag.embeddings import SimpleEmbeddings
+from graph_rag.local_store import LocalVectorStore
+from graph_rag.retrieval import Retriever
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the package or its CLI must load none of these
+HEAVY_MODULES = ("numpy", "pandas", "langchain_core", "langchain_text_splitters", "langchain_openai",
+                 "langchain_astradb", "astrapy", "fastapi", "uvicorn", "markdown", "bs4")
+# Cumulative import time of graph_rag plus graph_rag.cli, as reported by -X importtime
+IMPORT_BUDGET_MS = 150
+
+
+def run_python(code, cwd=REPO_DIR, *options):
+    return subprocess.run([sys.executable, *options, "-c", code], cwd=cwd, capture_output=True, text=True, check=True)
+
+
+def test_importing_the_package_and_cli_loads_no_heavy_dependency():
+    result = run_python("import sys, graph_rag, graph_rag.cli; print(' '.join(sys.modules))")
+    loaded = {name.split(".")[0] for name in result.stdout.split()}
+    assert loaded.isdisjoint(HEAVY_MODULES), sorted(loaded & set(HEAVY_MODULES))
+
+
+def test_import_time_budget():
+    result = run_python("import graph_rag.cli", REPO_DIR, "-X", "importtime")
+    # "import time: self [us] | cumulative | imported package"
+    cumulative = {match.group(2): int(match.group(1))
+                  for match in re.finditer(r"(\d+) \|\s+(\S+)$", result.stderr, re.MULTILINE)}
+    total_ms = (cumulative["graph_rag"] + cumulative["graph_rag.cli"]) / 1000
+    assert total_ms < IMPORT_BUDGET_MS, f"importing graph_rag.cli took {total_ms:.1f} ms"
+
+
+def test_exports_are_imported_on_first_access():
+    result = run_python("import sys, graph_rag; before = 'graph_rag.link_graph' in sys.modules; "
+                        "graph_rag.LinkGraph; print(before, 'graph_rag.link_graph' in sys.modules)")
+    assert result.stdout.split() == ["False", "True"]
+    assert all(getattr(graph_rag, name) is not None for name in graph_rag.__all__)
+
+
+def test_importing_the_walkthrough_runs_nothing():
+    result = run_python("import graph_rag.graph_rag_interactive")
+    assert result.stdout == ""
+
+
+def test_cli_search_prints_ranked_documents(monkeypatch, capsys):
+    embedding = SimpleEmbeddings(dim=64)
+    store = LocalVectorStore(embedding)
+    store.add_texts(["Refunds are issued within fourteen days of a cancellation.",
+                     "Mars missions require six months of crew training."],
+                    [{"doc_id": "refunds.md"}, {"doc_id": "training.md"}], ids=["refunds.md:0", "training.md:0"])
+    monkeypatch.setattr(retrieval, "open_retriever", lambda backend: Retriever(embedding, store))
+
+    assert cli.main(["search", "refund after a cancellation", "-k", "1", "--backend", "local"]) == 0
+    output = capsys.readouterr().out
+    assert "refunds.md" in output and "training.md" not in output
+    assert "embed" in output and "search" in output
+
+
+def test_cli_rejects_unknown_commands():
+    result = subprocess.run([sys.executable, "-m", "graph_rag", "reindex"], cwd=REPO_DIR,
+                            capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "invalid choice" in result.stderr
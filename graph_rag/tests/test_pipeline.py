@@ -0,0 +1,90 @@
+import pytest
+
+from graph_rag.embeddings import SimpleEmbeddings
+from graph_rag.ingestion import iter_markdown_files
+from graph_rag.local_store import LocalVectorStore
+from graph_rag.manifest import IngestManifest
+from graph_rag.pipeline import ChunkStream, make_splitter
+from graph_rag.upload import upload_documents
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    root = tmp_path / "docs"
+    for category in ("01_a", "02_b"):
+        (root / category).mkdir(parents=True)
+    for i in range(6):
+        category = "01_a" if i % 2 else "02_b"
+        body = "\n\n".join(f"Paragraph {p} of document {i} about lunar orbit trips." for p in range(30))
+        (root / category / f"doc{i}.md").write_text(f"# Doc {i}\n\n{body}\n\n[next](../01_a/doc1.md)\n")
+    return root
+
+
+def stream(corpus, manifest):
+    builder = manifest.plan_builder("local:test", 300, 50)
+    return ChunkStream(iter_markdown_files(str(corpus), verbose=False), builder, make_splitter(300, 50))
+
+
+def test_files_are_read_lazily(corpus, tmp_path):
+    chunk_stream = stream(corpus, IngestManifest(str(tmp_path / "manifest.json")))
+    first = next(iter(chunk_stream))
+    assert chunk_stream.files == 1
+    assert first.id.startswith("01_a/doc1.md:") and first.metadata["title"] == "Doc 1"
+    with pytest.raises(RuntimeError):
+        chunk_stream.plan
+
+
+def test_streamed_upload_and_incremental_rerun(corpus, tmp_path):
+    manifest_path = str(tmp_path / "manifest.json")
+    store = LocalVectorStore(SimpleEmbeddings())
+    manifest = IngestManifest.load(manifest_path)
+    chunk_stream = stream(corpus, manifest)
+    stats = upload_documents(store, chunk_stream, SimpleEmbeddings(), batch_size=4, queue_batches=1, progress=None)
+    assert stats.chunks == chunk_stream.chunk_count == len(list(chunk_stream.chunk_ids)) == len(store) > 6
+    assert store.get_by_ids(list(chunk_stream.chunk_ids)[:1])
+    assert chunk_stream.plan.summary()["New files"] == 6
+    assert chunk_stream.plan.added[0].get("content") is None
+    assert {doc["doc_id"] for doc in chunk_stream.links} == {f"{c}/doc{i}.md" for i, c in
+                                                             enumerate(["02_b", "01_a"] * 3)}
+    first_ids = list(chunk_stream.chunk_ids)
+    manifest.record(chunk_stream.plan, first_ids)
+    manifest.save()
+
+    (corpus / "02_b" / "doc0.md").write_text("# Doc 0\n\nRewritten.\n")
+    (corpus / "01_a" / "doc3.md").unlink()
+    manifest = IngestManifest.load(manifest_path)
+    rerun = stream(corpus, manifest)
+    chunks = list(rerun)
+    assert [chunk.metadata["doc_id"] for chunk in chunks] == ["02_b/doc0.md"]
+    plan = rerun.plan
+    assert (plan.summary()["Changed files"], plan.deleted) == (1, ["01_a/doc3.md"])
+    assert set(plan.stale_chunk_ids) == {
+        id_ for id_ in first_ids if id_.startswith(("02_b/doc0.md:", "01_a/doc3.md:"))
+    }
+    manifest.record(plan, rerun.chunk_ids)
+    assert manifest.files["02_b/doc0.md"]["chunk_ids"] == [chunks[0].id]
+    assert "01_a/doc3.md" not in manifest.files
+
+
+def test_stream_can_only_be_consumed_once(corpus, tmp_path):
+    chunk_stream = stream(corpus, IngestManifest(str(tmp_path / "manifest.json")))
+    list(chunk_stream)
+    with pytest.raises(RuntimeError):
+        list(chunk_stream)
+
+
+def test_unreadable_file_is_not_taken_for_deleted(corpus, tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    chunk_stream = stream(corpus, manifest)
+    list(chunk_stream)
+    manifest.record(chunk_stream.plan, chunk_stream.chunk_ids)
+    entry = manifest.files["01_a/doc3.md"]
+
+    (corpus / "01_a" / "doc3.md").write_bytes(b"# Doc 3\n\n\xff\xfe not utf-8\n")
+    builder = manifest.plan_builder("local:test", 300, 50)
+    rerun = ChunkStream(iter_markdown_files(str(corpus), workers=2, verbose=False, on_error=builder.fail),
+                        builder, make_splitter(300, 50))
+    assert list(rerun) == []
+    assert (rerun.plan.deleted, rerun.plan.stale_chunk_ids) == ([], [])
+    manifest.record(rerun.plan, rerun.chunk_ids)
+    assert manifest.files["01_a/doc3.md"] == entry
@@ -0,0 +1,127 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from graph_rag.embeddings import SimpleEmbeddings
+from graph_rag.link_graph import LinkGraph
+from graph_rag.local_store import LocalVectorStore
+from graph_rag.retrieval import QueryBatcher, Retriever, TTLCache
+
+CHUNKS = [
+    ("refunds.md", "Refunds are issued within fourteen days of a cancellation."),
+    ("refunds.md", "Refunds for cancelled flights go back to the original card."),
+    ("training.md", "Mars missions require six months of crew training."),
+    ("safety.md", "The spaceport runway is inspected before every launch."),
+]
+
+
+class CountingEmbeddings(SimpleEmbeddings):
+    def __init__(self, delay: float = 0.0):
+        super().__init__(dim=64)
+        self.delay = delay
+        self.batches = []
+
+    def embed_array(self, texts):
+        self.batches.append(list(texts))
+        time.sleep(self.delay)
+        return super().embed_array(texts)
+
+
+@pytest.fixture
+def store():
+    store = LocalVectorStore(SimpleEmbeddings(dim=64))
+    store.add_texts([text for _, text in CHUNKS], [{"doc_id": doc_id} for doc_id, _ in CHUNKS],
+                    ids=[f"chunk{i}" for i in range(len(CHUNKS))])
+    return store
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expires():
+    cache = TTLCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats() == {"entries": 2, "hits": 3, "misses": 1, "evictions": 1}
+
+    expiring = TTLCache(ttl=0.01)
+    expiring.put("a", 1)
+    time.sleep(0.02)
+    assert expiring.get("a") is None
+    assert len(expiring) == 0
+
+
+def test_batcher_embeds_concurrent_queries_together():
+    embedding = CountingEmbeddings(delay=0.05)
+    batcher = QueryBatcher(embedding, max_batch=16)
+    queries = [f"question {i % 6}" for i in range(12)]
+    vectors = [None] * len(queries)
+
+    def ask(i):
+        vectors[i] = batcher.embed(queries[i])
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in range(len(queries))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+
+    assert len(embedding.batches) < len(queries)
+    # Repeated questions are embedded once per batch
+    assert all(len(batch) == len(set(batch)) for batch in embedding.batches)
+    expected = SimpleEmbeddings(dim=64).embed_array(queries)
+    assert np.allclose(np.stack(vectors), expected, atol=1e-6)
+    assert batcher.stats()["queries"] == len(queries)
+
+
+def test_batcher_raises_embedding_errors_in_every_caller():
+    class BrokenEmbeddings(SimpleEmbeddings):
+        def embed_array(self, texts):
+            raise ConnectionError("embedding API unavailable")
+
+    batcher = QueryBatcher(BrokenEmbeddings())
+    with pytest.raises(ConnectionError):
+        batcher.embed("anything")
+    batcher.close()
+
+
+def test_repeated_searches_come_from_the_caches(store):
+    embedding = CountingEmbeddings()
+    retriever = Retriever(embedding, store)
+    first = retriever.search("refund after cancellation", k=2)
+    assert not first.cached
+    assert set(first.timings) == {"embed", "search", "graph", "total"}
+    # Chunks of one document are grouped under it
+    assert first.hits[0].doc_id == "refunds.md"
+    assert len(first.hits[0].chunks) == 2
+
+    second = retriever.search("refund after cancellation", k=2)
+    assert second.cached
+    assert [hit.doc_id for hit in second.hits] == [hit.doc_id for hit in first.hits]
+    # Another k misses the result cache but not the query cache
+    retriever.search("refund after cancellation", k=3)
+    assert len(embedding.batches) == 1
+    stats = retriever.stats()
+    assert stats["result_cache"]["hits"] == 1
+    assert stats["latency"]["total"]["count"] == 3
+    retriever.close()
+
+
+def test_search_expands_along_the_link_graph(store):
+    graph = LinkGraph.from_documents([
+        {"doc_id": "refunds.md", "links": ["policies.md"]},
+        {"doc_id": "policies.md", "links": []},
+        {"doc_id": "training.md", "links": []},
+        {"doc_id": "safety.md", "links": []},
+    ])
+    retriever = Retriever(SimpleEmbeddings(dim=64), store, graph, hops=1, decay=0.5)
+    doc_ids = {hit.doc_id: hit.hops for hit in retriever.search("refund after cancellation", k=4).hits}
+    assert doc_ids["refunds.md"] == 0
+    assert doc_ids["policies.md"] == 1
+    without_graph = retriever.search("refund after cancellation", k=4, hops=0).hits
+    assert "policies.md" not in {hit.doc_id for hit in without_graph}
+    retriever.close()
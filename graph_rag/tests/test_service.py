@@ -0,0 +1,52 @@
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from graph_rag import service
+from graph_rag.embeddings import SimpleEmbeddings
+from graph_rag.local_store import LocalVectorStore
+from graph_rag.retrieval import Retriever
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A test client around a retriever on a small local store."""
+    embedding = SimpleEmbeddings(dim=64)
+    store = LocalVectorStore(embedding)
+    store.add_texts(
+        ["Refunds are issued within fourteen days of a cancellation.",
+         "Mars missions require six months of crew training."],
+        [{"doc_id": "refunds.md", "title": "Refunds", "file_path": "refunds.md"},
+         {"doc_id": "training.md", "title": "Training", "file_path": "training.md"}],
+        ids=["refunds.md:0", "training.md:0"],
+    )
+    monkeypatch.setattr(service, "_retriever", Retriever(embedding, store))
+    with TestClient(service.app) as test_client:
+        yield test_client
+
+
+def test_search_returns_documents_with_timings(client):
+    response = client.get("/search", params={"q": "refund after a cancellation", "k": 1})
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert [hit["doc_id"] for hit in body["results"]] == ["refunds.md"]
+    assert body["results"][0]["chunks"][0]["chunk_id"] == "refunds.md:0"
+    assert set(body["timings"]) == {"embed", "search", "graph", "total"}
+    assert not body["cached"]
+    assert "search;dur=" in response.headers["Server-Timing"]
+    assert client.get("/search", params={"q": "refund after a cancellation", "k": 1}).json()["cached"]
+
+
+def test_search_validates_parameters(client):
+    assert client.get("/search", params={"q": ""}).status_code == 422
+    assert client.get("/search", params={"q": "refunds", "k": 0}).status_code == 422
+    assert client.get("/search", params={"q": "refunds", "hops": 9}).status_code == 422
+
+
+def test_stats_report_caches_and_latency(client):
+    client.get("/search", params={"q": "crew training"})
+    client.get("/search", params={"q": "crew training"})
+    stats = client.get("/stats").json()
+    assert stats["result_cache"]["hits"] == 1
+    assert stats["latency"]["search"]["count"] >= 1
+    assert client.get("/health").json()["status"] == "ok"
@@ -0,0 +1,140 @@
+import time
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.vectorstores import InMemoryVectorStore
+
+from graph_rag import workflow
+from graph_rag.embeddings import SimpleEmbeddings
+from graph_rag.local_store import LocalVectorStore
+from graph_rag.upload import PrecomputedEmbeddings, UploadError, upload_documents
+
+
+class SlowEmbeddings(SimpleEmbeddings):
+    def __init__(self, delay: float):
+        super().__init__(dim=16)
+        self.delay = delay
+        self.batches = []
+
+    def embed_array(self, texts):
+        self.batches.append(len(texts))
+        time.sleep(self.delay)
+        return super().embed_array(texts)
+
+
+class StubStore(LocalVectorStore):
+    """Local store whose uploads are slow and fail ``failures`` times first."""
+
+    def __init__(self, delay: float = 0.0, failures: int = 0):
+        super().__init__(SimpleEmbeddings(dim=16))
+        self.delay = delay
+        self.failures = failures
+        self.attempts = 0
+
+    def add_vectors(self, vectors, texts, metadatas=None, ids=None):
+        self.attempts += 1
+        time.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("upload failed")
+        return super().add_vectors(vectors, texts, metadatas, ids)
+
+
+def make_documents(count):
+    documents = [Document(page_content=f"chunk number {i}", metadata={"doc_id": f"d{i % 3}"}) for i in range(count)]
+    return documents, [f"id{i}" for i in range(count)]
+
+
+def test_all_chunks_are_stored_under_their_ids_in_batches():
+    documents, ids = make_documents(23)
+    store, embedding = StubStore(), SlowEmbeddings(0)
+    stats = upload_documents(store, documents, embedding, ids, batch_size=5, upload_workers=3, progress=None)
+    assert (stats.chunks, stats.batches, stats.retries) == (23, 5, 0)
+    assert sorted(embedding.batches) == [3, 5, 5, 5, 5]
+    assert store.get_by_ids(["id22"])[0].page_content == "chunk number 22"
+    assert len(store) == 23
+
+
+def test_stages_overlap():
+    documents, ids = make_documents(40)
+    store, embedding = StubStore(delay=0.05), SlowEmbeddings(0.05)
+    stats = upload_documents(store, documents, embedding, ids, batch_size=5, upload_workers=2, progress=None)
+    # 8 batches: 0.8s when embedding and uploading run one after the other
+    assert stats.seconds < 0.6
+    assert stats.embed_seconds + stats.upload_seconds > 0.75
+
+
+def test_failed_uploads_are_retried_with_backoff():
+    documents, ids = make_documents(10)
+    store = StubStore(failures=2)
+    messages = []
+    stats = upload_documents(store, documents, SlowEmbeddings(0), ids, batch_size=10, backoff=0.01,
+                             progress=messages.append)
+    assert stats.retries == 2 and store.attempts == 3
+    assert len(store) == 10
+    assert "retrying in 0.0s" in messages[0] and "retrying" in messages[1]
+    assert "Stored batch 1/1" in messages[2]
+
+
+def test_upload_error_is_raised_after_the_last_retry():
+    documents, ids = make_documents(30)
+    store = StubStore(failures=100)
+    with pytest.raises(UploadError) as excinfo:
+        upload_documents(store, documents, SlowEmbeddings(0), ids, batch_size=5, retries=1, backoff=0.01,
+                         progress=None)
+    assert store.attempts < 12
+    assert excinfo.value.stage == "upload"
+    assert isinstance(excinfo.value.__cause__, ConnectionError)
+
+
+def test_failure_reports_the_stage_and_what_was_stored_before():
+    documents, ids = make_documents(30)
+    embedding = SlowEmbeddings(0)
+    embed_array = embedding.embed_array
+    embedding.embed_array = lambda texts: embed_array(texts) if len(embedding.batches) < 3 else 1 / 0
+    store = StubStore()
+    with pytest.raises(UploadError) as excinfo:
+        upload_documents(store, documents, embedding, ids, batch_size=5, upload_workers=1, queue_batches=1,
+                         progress=None)
+    assert excinfo.value.stage == "embedding"
+    assert isinstance(excinfo.value.__cause__, ZeroDivisionError)
+    assert excinfo.value.stats.batches == len(store) // 5 <= 3
+    assert f"after {excinfo.value.stats.batches} stored batch(es)" in str(excinfo.value)
+
+
+def test_langchain_stores_get_the_precomputed_vectors():
+    documents, ids = make_documents(12)
+    model = SlowEmbeddings(0)
+    store = InMemoryVectorStore(PrecomputedEmbeddings(model))
+    upload_documents(store, documents, model, ids, batch_size=4, progress=None)
+    assert model.batches == [4, 4, 4]
+    assert store.get_by_ids(["id3"])[0].page_content == "chunk number 3"
+    assert store.embeddings._vectors == {}
+
+
+def test_astradb_upload_failure_is_not_reported_as_a_connection_error(monkeypatch, capsys):
+    documents, ids = make_documents(12)
+    for document, id_ in zip(documents, ids):
+        document.id = id_
+    monkeypatch.setattr(workflow, "get_embedding_model", lambda: SlowEmbeddings(0))
+    monkeypatch.setattr(workflow, "open_astradb_store", lambda embedding, name: StubStore(failures=100))
+    monkeypatch.setattr(workflow, "UPLOAD_BACKOFF_SECONDS", 0)
+    assert workflow.store_documents_in_astradb(documents) is None
+    output = capsys.readouterr().out
+    assert "Connected to AstraDB" in output and "Error connecting" not in output
+    assert "Upload to AstraDB stopped: upload failed after 0 stored batch(es)" in output
+
+
+def test_local_upload_failure_saves_and_records_nothing(monkeypatch, capsys):
+    documents, ids = make_documents(12)
+    for document, id_ in zip(documents, ids):
+        document.id = id_
+    store = StubStore(failures=100)
+    store.save = lambda: pytest.fail("a failed upload must not be saved")
+    monkeypatch.setattr(workflow, "get_embedding_model", lambda: SlowEmbeddings(0))
+    monkeypatch.setattr(workflow, "open_local_store", lambda embedding, directory: store)
+    monkeypatch.setattr(workflow, "UPLOAD_BACKOFF_SECONDS", 0)
+    assert workflow.store_documents_locally(documents) is None
+    output = capsys.readouterr().out
+    assert "Upload to the local vector store stopped: upload failed after 0 stored batch(es)" in output
+    assert "nothing was saved or recorded" in output
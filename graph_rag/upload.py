@@ -0,0 +1,279 @@
+"""
+Pipelined upload of chunks into a vector store.
+
+``upload_documents`` splits the chunks into batches of ``batch_size`` and runs
+the stages at the same time, each on its own threads:
+
+    chunks -> [feeder] -> bounded queue -> [embed workers] -> bounded queue -> [upload workers] -> store
+
+The chunks may come from a generator (see ``pipeline.ChunkStream``). The
+queues are bounded, so at most a few batches are held in memory, and while
+one batch is uploaded the next ones are already being embedded: the run
+takes about as long as its slowest stage instead of the sum of all. Failed
+uploads are retried with exponential backoff; a run that still fails raises
+``UploadError``, which tells how much was stored before the failure.
+
+Stores that take precomputed vectors (``LocalVectorStore.add_vectors``) get
+them directly. Any other LangChain store, which embeds inside
+``add_documents``, is given a ``PrecomputedEmbeddings`` model that returns
+the vectors of the embed stage.
+"""
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+# Marks the end of a queue for one worker
+_DONE = None
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """Returns vectors registered by the embed stage; other texts go to ``model``."""
+
+    def __init__(self, model: Embeddings):
+        self.model = model
+        self._vectors: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, texts: Sequence[str], vectors: np.ndarray):
+        with self._lock:
+            self._vectors.update(zip(texts, np.asarray(vectors, dtype=np.float32).tolist()))
+
+    def release(self, texts: Sequence[str]):
+        with self._lock:
+            for text in texts:
+                self._vectors.pop(text, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            vectors = [self._vectors.get(text) for text in texts]
+        missing = [text for text, vector in zip(texts, vectors) if vector is None]
+        if missing:
+            # Released by another batch with the same text: embed again
+            fresh = iter(self.model.embed_documents(missing))
+            vectors = [vector if vector is not None else next(fresh) for vector in vectors]
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.model.embed_query(text)
+
+
+class UploadStats(NamedTuple):
+    chunks: int
+    batches: int
+    seconds: float
+    # Time spent inside each stage, summed over its workers
+    embed_seconds: float
+    upload_seconds: float
+    retries: int
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+
+class UploadError(Exception):
+    """An upload that stopped part way; the error that stopped it is ``__cause__``.
+
+    ``stage`` is where it failed ("reading", "embedding" or "upload") and
+    ``stats`` counts the batches that were stored before.
+    """
+
+    def __init__(self, stage: str, stats: UploadStats, error: BaseException):
+        super().__init__(f"{stage} failed after {stats.batches} stored batch(es) ({stats.chunks} chunks): {error}")
+        self.stage = stage
+        self.stats = stats
+
+
+def embed_batch(embedding: Embeddings, texts: List[str]) -> np.ndarray:
+    if hasattr(embedding, "embed_array"):
+        return embedding.embed_array(texts)
+    return np.asarray(embedding.embed_documents(texts), dtype=np.float32)
+
+
+def _batches(documents: Iterable[Document], ids: Optional[Iterable[str]], batch_size: int):
+    ids = iter(ids) if ids is not None else None
+    batch: List[Document] = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) == batch_size:
+            yield batch, [next(ids) for _ in batch] if ids else None
+            batch = []
+    if batch:
+        yield batch, [next(ids) for _ in batch] if ids else None
+
+
+def upload_documents(
+    store: VectorStore,
+    documents: Iterable[Document],
+    embedding: Embeddings,
+    ids: Optional[Sequence[str]] = None,
+    batch_size: int = 50,
+    embed_workers: int = 1,
+    upload_workers: int = 2,
+    queue_batches: int = 4,
+    retries: int = 3,
+    backoff: float = 0.5,
+    progress: Optional[Callable[[str], None]] = print,
+) -> UploadStats:
+    """Embed and store ``documents`` under ``ids`` in batches, both stages running concurrently.
+
+    ``documents`` may be a generator: it is consumed on a feeder thread, one
+    batch at a time. Without ``ids``, documents keep their own ``id``.
+    ``queue_batches`` bounds the batches waiting in front of each stage. An
+    upload is attempted ``retries`` + 1 times, sleeping ``backoff``, then
+    twice as long, and so on between attempts; if a batch still fails, the
+    pipeline stops and ``UploadError`` is raised from the error.
+    """
+    total = -(-len(documents) // batch_size) if hasattr(documents, "__len__") else None
+    direct = hasattr(store, "add_vectors")
+    precomputed = None if direct else getattr(store, "embeddings", None)
+    if not direct and not isinstance(precomputed, PrecomputedEmbeddings):
+        raise TypeError("The store must have add_vectors() or be created with PrecomputedEmbeddings.")
+
+    todo: "queue.Queue" = queue.Queue(maxsize=max(1, queue_batches))
+    embedded: "queue.Queue" = queue.Queue(maxsize=max(1, queue_batches))
+    stop = threading.Event()
+    # (stage, error) of the failures, first one first
+    errors: List[Tuple[str, BaseException]] = []
+    lock = threading.Lock()
+    totals = {"embed": 0.0, "upload": 0.0, "retries": 0, "chunks": 0, "batches": 0}
+    started = time.perf_counter()
+
+    def fail(stage: str, error: BaseException):
+        with lock:
+            errors.append((stage, error))
+        stop.set()
+
+    def put(target: "queue.Queue", item) -> bool:
+        # Blocks while the next stage is behind, but gives up once the pipeline is stopped
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(source: "queue.Queue"):
+        # The next item, or _DONE once the pipeline is stopped and nothing is left
+        while True:
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                if stop.is_set():
+                    return _DONE
+
+    def feeder():
+        try:
+            for number, (batch_documents, batch_ids) in enumerate(_batches(documents, ids, batch_size), 1):
+                if batch_ids is None and any(document.id for document in batch_documents):
+                    batch_ids = [document.id for document in batch_documents]
+                if not put(todo, (number, batch_documents, batch_ids)):
+                    return
+        except BaseException as e:
+            fail("reading", e)
+        finally:
+            for _ in range(embed_workers):
+                put(todo, _DONE)
+
+    def embed_worker():
+        while True:
+            batch = get(todo)
+            if batch is _DONE:
+                return
+            number, batch_documents, batch_ids = batch
+            start = time.perf_counter()
+            try:
+                vectors = embed_batch(embedding, [document.page_content for document in batch_documents])
+            except BaseException as e:
+                fail("embedding", e)
+                return
+            with lock:
+                totals["embed"] += time.perf_counter() - start
+            if not put(embedded, (number, batch_documents, batch_ids, vectors)):
+                return
+
+    def store_batch(batch_documents: List[Document], batch_ids: Optional[List[str]], vectors: np.ndarray):
+        if direct:
+            store.add_vectors(vectors, [document.page_content for document in batch_documents],
+                              [document.metadata for document in batch_documents], ids=batch_ids)
+            return
+        texts = [document.page_content for document in batch_documents]
+        precomputed.register(texts, vectors)
+        try:
+            store.add_documents(batch_documents, ids=batch_ids)
+        finally:
+            precomputed.release(texts)
+
+    def upload_worker():
+        while True:
+            item = get(embedded)
+            if item is _DONE:
+                return
+            number, batch_documents, batch_ids, vectors = item
+            start = time.perf_counter()
+            for attempt in range(retries + 1):
+                try:
+                    store_batch(batch_documents, batch_ids, vectors)
+                    break
+                except Exception as e:
+                    if attempt == retries or stop.is_set():
+                        fail("upload", e)
+                        return
+                    with lock:
+                        totals["retries"] += 1
+                    if progress:
+                        progress(f"  ⚠️  Batch {number} failed ({e}), retrying in {backoff * 2 ** attempt:.1f}s")
+                    time.sleep(backoff * 2 ** attempt)
+            with lock:
+                totals["upload"] += time.perf_counter() - start
+                totals["chunks"] += len(batch_documents)
+                totals["batches"] += 1
+                done, chunks = totals["batches"], totals["chunks"]
+            if progress:
+                rate = chunks / (time.perf_counter() - started)
+                of_total = f"/{total}" if total is not None else ""
+                progress(f"  📦 Stored batch {done}{of_total} ({chunks} chunks, {rate:.0f} chunks/s)")
+
+    feeders = [threading.Thread(target=feeder, daemon=True)]
+    embedders = [threading.Thread(target=embed_worker, daemon=True) for _ in range(embed_workers)]
+    uploaders = [threading.Thread(target=upload_worker, daemon=True) for _ in range(upload_workers)]
+    for thread in feeders + embedders + uploaders:
+        thread.start()
+    for thread in feeders + embedders:
+        thread.join()
+    for _ in uploaders:
+        put(embedded, _DONE)
+    for thread in uploaders:
+        thread.join()
+
+    stats = UploadStats(
+        chunks=totals["chunks"],
+        batches=totals["batches"],
+        seconds=time.perf_counter() - started,
+        embed_seconds=totals["embed"],
+        upload_seconds=totals["upload"],
+        retries=totals["retries"],
+    )
+    if errors:
+        stage, error = errors[0]
+        raise UploadError(stage, stats, error) from error
+    return stats
+
+
+def stage_summary(stats: UploadStats) -> Dict[str, str]:
+    """Rows for ``print_summary``: throughput and where the time went."""
+    return {
+        "Chunks stored": f"{stats.chunks} in {stats.batches} batches",
+        "Wall time": f"{stats.seconds:.1f}s ({stats.chunks_per_second:.0f} chunks/s)",
+        "Embedding time": f"{stats.embed_seconds:.1f}s",
+        "Upload time": f"{stats.upload_seconds:.1f}s",
+        "Retries": str(stats.retries),
+    }
+
@@ -0,0 +1,230 @@
+"""
+End-to-end ingestion run of the Graph RAG system.
+
+``run_ingestion`` chains the stages that ``graph_rag_interactive.py`` walks
+through cell by cell and ``python -m graph_rag ingest`` runs in one go:
+
+1. stream the markdown files, checked against the ingestion manifest, and
+   split the new and changed ones into chunks (``ChunkStream``);
+2. embed and upload the chunks to the configured vector store, then delete
+   the chunks of changed and removed files;
+3. record the stored chunks in the manifest and save the link graph.
+
+Nothing runs when the module is imported.
+"""
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+from .config import (BATCH_SIZE, CHUNK_OVERLAP, CHUNK_SIZE, COLLECTION_NAME, DATA_DIRECTORY, EMBED_WORKERS,
+                     GRAPH_DECAY, GRAPH_HOPS, INGESTION_WORKERS, IVF_LISTS, IVF_PROBES, LINK_GRAPH_PATH,
+                     LOCAL_STORE_DIRECTORY, LOCAL_STORE_INDEX, MANIFEST_PATH, PAGERANK_WEIGHT,
+                     UPLOAD_BACKOFF_SECONDS, UPLOAD_QUEUE_BATCHES, UPLOAD_RETRIES, UPLOAD_WORKERS,
+                     VECTOR_STORE_BACKEND)
+from .embeddings import get_embedding_model
+from .ingestion import iter_markdown_files
+from .link_graph import LinkGraph, graph_search
+from .manifest import IngestManifest, manifest_path
+from .pipeline import ChunkStream, make_splitter
+from .stores import open_astradb_store, open_local_store
+from .upload import PrecomputedEmbeddings, UploadError, stage_summary, upload_documents
+
+
+def print_summary(title: str, data: Any, max_items: int = 5):
+    """Print a nice summary of data."""
+    print(f"\n{'='*50}")
+    print(f"📊 {title}")
+    print(f"{'='*50}")
+
+    if isinstance(data, list):
+        print(f"Total items: {len(data)}")
+        if data and max_items > 0:
+            print(f"\nFirst {min(max_items, len(data))} items:")
+            for i, item in enumerate(data[:max_items]):
+                if isinstance(item, dict):
+                    print(f"  {i+1}. {item.get('title', item.get('doc_id', str(item)))}")
+                else:
+                    print(f"  {i+1}. {item}")
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            print(f"{key}: {value}")
+    else:
+        print(str(data))
+
+
+def run_upload(vector_store, documents: Iterable[Document], embedding_model, ids: Optional[List[str]] = None):
+    """Embed and upload documents with the configured pipeline, then print where the time went."""
+    stats = upload_documents(
+        vector_store, documents, embedding_model, ids,
+        batch_size=BATCH_SIZE,
+        embed_workers=EMBED_WORKERS,
+        upload_workers=UPLOAD_WORKERS,
+        queue_batches=UPLOAD_QUEUE_BATCHES,
+        retries=UPLOAD_RETRIES,
+        backoff=UPLOAD_BACKOFF_SECONDS,
+    )
+    print_summary("Upload Pipeline", stage_summary(stats))
+    return stats
+
+
+def store_documents_in_astradb(
+    chunks: ChunkStream,
+    collection_name: str = COLLECTION_NAME,
+) -> Optional[VectorStore]:
+    """Store the streamed chunks in AstraDB with vector embeddings using FLOAT ARRAYS.
+
+    Chunks are stored under their chunk ids; chunks of changed or deleted
+    files are removed once the stream is done and the new chunks were
+    added, so the collection is never missing a document. Returns None if
+    the collection cannot be reached or the upload fails part way.
+    """
+    embedding_model = get_embedding_model()
+
+    try:
+        print("🔧 Configuring AstraDB with float array vector support...")
+
+        # The store is handed the vectors of the embed stage
+        vector_store = open_astradb_store(PrecomputedEmbeddings(embedding_model), collection_name)
+    except Exception as e:
+        print(f"❌ Error connecting to AstraDB: {e}")
+        print("This is expected if AstraDB credentials are not configured.")
+        return None
+
+    print(f"✅ Connected to AstraDB collection: {collection_name}")
+
+    # Embed and add documents in batches, uploading while the next batches are read and embedded
+    print("Adding documents to AstraDB...")
+    try:
+        stats = run_upload(vector_store, chunks, embedding_model)
+    except UploadError as e:
+        print(f"❌ Upload to AstraDB stopped: {e}")
+        # Not recorded in the manifest: the next run stores these files again under the same ids
+        print(f"   {e.stats.batches} batch(es) were stored before the failure; no stale chunks were deleted.")
+        return None
+
+    print(f"✅ Successfully stored {stats.chunks} documents in AstraDB")
+
+    delete_ids = chunks.plan.stale_chunk_ids
+    if delete_ids:
+        vector_store.delete(list(delete_ids))
+        print(f"🧹 Deleted {len(delete_ids)} stale chunks")
+    return vector_store
+
+
+def store_documents_locally(chunks: ChunkStream, directory: str = LOCAL_STORE_DIRECTORY) -> Optional[VectorStore]:
+    """Store the streamed chunks in the in-process vector store saved under ``directory``.
+
+    Returns None if the upload fails part way: the store is not saved, so
+    ``directory`` keeps the last complete ingestion.
+    """
+    embedding_model = get_embedding_model()
+    vector_store = open_local_store(embedding_model, directory)
+    print(f"✅ Opened local vector store: {directory} ({len(vector_store)} chunks)")
+
+    try:
+        stats = run_upload(vector_store, chunks, embedding_model)
+    except UploadError as e:
+        print(f"❌ Upload to the local vector store stopped: {e}")
+        print(f"   {e.stats.batches} batch(es) were added in memory; nothing was saved or recorded in the manifest.")
+        return None
+    delete_ids = chunks.plan.stale_chunk_ids
+    vector_store.delete(list(delete_ids))
+    print(f"✅ Stored {stats.chunks} chunks, deleted {len(delete_ids)} stale chunks")
+
+    if LOCAL_STORE_INDEX == "ivf":
+        vector_store.build_index(IVF_LISTS)
+        print(f"🗂️  Built IVF index ({vector_store.n_lists} lists, {IVF_PROBES} probed per query)")
+    else:
+        vector_store.drop_index()
+    vector_store.save()
+    return vector_store
+
+
+def load_manifest(backend: str = VECTOR_STORE_BACKEND, collection_name: str = COLLECTION_NAME) -> IngestManifest:
+    """The ingestion manifest of ``backend``'s collection ``collection_name`` (empty if never ingested)."""
+    return IngestManifest.load(manifest_path(MANIFEST_PATH, f"{backend}:{collection_name}"))
+
+
+def open_chunk_stream(manifest: IngestManifest, data_dir: str = DATA_DIRECTORY,
+                      backend: str = VECTOR_STORE_BACKEND, collection_name: str = COLLECTION_NAME) -> ChunkStream:
+    """The chunks of the files that changed since ``manifest`` was recorded; nothing is read yet."""
+    # The manifest describes one backend's collection (see load_manifest): one recorded
+    # for another collection is reset and everything is ingested again
+    plan_builder = manifest.plan_builder(f"{backend}:{collection_name}", CHUNK_SIZE, CHUNK_OVERLAP)
+    return ChunkStream(
+        # Unreadable files keep their chunks instead of being taken for deleted ones
+        iter_markdown_files(data_dir, workers=INGESTION_WORKERS, on_error=plan_builder.fail),
+        plan_builder,
+        make_splitter(CHUNK_SIZE, CHUNK_OVERLAP),
+    )
+
+
+def store_chunks(chunk_stream: ChunkStream, backend: str = VECTOR_STORE_BACKEND,
+                 collection_name: str = COLLECTION_NAME) -> Optional[VectorStore]:
+    """Embed and store the stream in the ``backend`` store; the collection is updated in place."""
+    print(f"🚀 Starting {backend} storage...")
+    print(f"📅 Using collection name: {collection_name}")
+    if backend == "local":
+        return store_documents_locally(chunk_stream)
+    return store_documents_in_astradb(chunk_stream, collection_name)
+
+
+def record_ingestion(manifest: IngestManifest, chunk_stream: ChunkStream):
+    """Remember what is stored now, so the next run only embeds what changed."""
+    plan = chunk_stream.plan
+    print_summary("Incremental Ingestion Plan", plan.summary())
+    print_summary("Document Processing Results", {
+        "Files read": chunk_stream.files,
+        "Characters split": chunk_stream.characters,
+        "Chunks stored": chunk_stream.chunk_count,
+        "Links found": sum(len(doc['links']) for doc in chunk_stream.links),
+        "Unresolved links": sum(len(doc['dangling_links']) for doc in chunk_stream.links),
+    })
+    manifest.record(plan, chunk_stream.chunk_ids)
+    manifest.save()
+    print(f"📝 Manifest saved to {manifest.path}")
+
+
+def save_link_graph(chunk_stream: ChunkStream, path: str = LINK_GRAPH_PATH) -> LinkGraph:
+    """The link graph of every file the stream read, saved to ``path``."""
+    # Built from the links of all files read by the stream (not only the changed ones):
+    # it is cheap and links of unchanged files may now resolve
+    link_graph = LinkGraph.from_documents(chunk_stream.links)
+    link_graph.save(path)
+    print_summary("Link Graph", {
+        "Documents": len(link_graph),
+        "Links": link_graph.edge_count,
+        "Unresolved links": link_graph.dangling_links,
+        "Most central": link_graph.node_ids[int(link_graph.pagerank.argmax())] if len(link_graph) else "-",
+    })
+    return link_graph
+
+
+class IngestionRun(NamedTuple):
+    # None if the store could not be reached or the upload failed
+    vector_store: Optional[VectorStore]
+    chunk_stream: ChunkStream
+    # None unless the stream was consumed to the end
+    link_graph: Optional[LinkGraph]
+
+
+def run_ingestion(data_dir: str = DATA_DIRECTORY, backend: str = VECTOR_STORE_BACKEND,
+                  collection_name: str = COLLECTION_NAME) -> IngestionRun:
+    """Stream, store and record ``data_dir``, then build the link graph; only changed files are embedded."""
+    manifest = load_manifest(backend, collection_name)
+    chunk_stream = open_chunk_stream(manifest, data_dir, backend, collection_name)
+    vector_store = store_chunks(chunk_stream, backend, collection_name)
+    if vector_store is not None:
+        record_ingestion(manifest, chunk_stream)
+    link_graph = save_link_graph(chunk_stream) if chunk_stream.completed else None
+    return IngestionRun(vector_store, chunk_stream, link_graph)
+
+
+def show_graph_search(vector_store: VectorStore, link_graph: LinkGraph, query: str, k: int = 5):
+    """Vector search expanded along document links, one line per document."""
+    print(f"\n🔎 {query}")
+    for hit in graph_search(vector_store, link_graph, query, k=k, hops=GRAPH_HOPS,
+                            decay=GRAPH_DECAY, pagerank_weight=PAGERANK_WEIGHT):
+        via = f"{len(hit.chunks)} matching chunk(s)" if hit.hops == 0 else f"{hit.hops} link(s) away"
+        print(f"  {hit.score:.3f}  {hit.doc_id}  ({via})")